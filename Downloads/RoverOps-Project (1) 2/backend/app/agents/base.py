@@ -1,11 +1,12 @@
 import os
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate, SystemMessagePromptTemplate, HumanMessagePromptTemplate
 from langchain.schema import BaseMessage
 
 from app.models.schemas import AgentType, AgentStatus
+from app.services.mission_state import mission_state_manager
 
 # Ensure environment variables are loaded
 load_dotenv()
@@ -66,6 +67,7 @@ class BaseAgent:
             
             # Call LLM
             response = await self.llm.ainvoke(messages)
+            mission_state_manager.record_llm_call(*self._token_usage(response))
             
             result = {
                 "agent_type": self.agent_type.value,
@@ -79,12 +81,22 @@ class BaseAgent:
             
         except Exception as e:
             self.status = AgentStatus.ERROR
+            mission_state_manager.record_llm_call(0, 0, failed=True)
             return {
                 "agent_type": self.agent_type.value,
                 "status": "error",
                 "error": str(e)
             }
     
+    @staticmethod
+    def _token_usage(response) -> Tuple[int, int]:
+        """(prompt, completion) tokens reported for an LLM response, 0 when the provider sent none"""
+        usage = getattr(response, "usage_metadata", None)
+        if usage:
+            return usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+        usage = (getattr(response, "response_metadata", None) or {}).get("token_usage") or {}
+        return usage.get("prompt_tokens", 0) or 0, usage.get("completion_tokens", 0) or 0
+    
     def set_status(self, status: AgentStatus):
         """Update agent status"""
         self.status = status
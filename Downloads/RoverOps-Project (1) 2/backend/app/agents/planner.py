@@ -2,6 +2,7 @@ import json
 from typing import List, Dict, Any
 from app.agents.base import BaseAgent
 from app.models.schemas import AgentType, AgentStatus, MissionStep, RoverPosition
+from app.services.executors import mission_executors, parse_llm_json
 
 class PlannerAgent(BaseAgent):
     """Agent that breaks down natural language missions into structured steps"""
@@ -160,16 +161,8 @@ Provide your reasoning clearly and then create the mission plan."""
             else:
                 print(f"\n📋 PLANNER RESPONSE:\n{response_text[:500]}...\n")
 
-            # Try to extract JSON from response
-            json_start = response_text.find("{")
-            json_end = response_text.rfind("}") + 1
-
-            if json_start != -1 and json_end > json_start:
-                json_text = response_text[json_start:json_end]
-                plan_data = json.loads(json_text)
-            else:
-                # Try to parse the whole response as JSON
-                plan_data = json.loads(response_text)
+            # Extract JSON from response (large responses are parsed off the event loop)
+            plan_data = await mission_executors.run_cpu(parse_llm_json, response_text)
 
             # Extract reasoning from plan_data if present
             if "reasoning" in plan_data:
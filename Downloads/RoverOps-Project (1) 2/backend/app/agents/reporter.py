@@ -38,36 +38,18 @@ class ReporterAgent:
         # Ensure mission state manager also has COMPLETE status
         if mission_id:
             from app.services.mission_state import mission_state_manager
-            mission = mission_state_manager.get_mission(mission_id)
-            if mission:
-                mission.status = MissionStatus.COMPLETE
-                mission_state_manager.update_mission_status(mission_id, MissionStatus.COMPLETE)
+            mission_state_manager.update_mission_status(mission_id, MissionStatus.COMPLETE)
         
         # CRITICAL FIX: Only check for ACTUAL obstacle blocking, not just mentions of "obstacle"
         # Only set to ABORTED if there's clear evidence of obstacle blocking the mission
         if mission_status != MissionStatus.ABORTED and mission_id:
             from app.services.mission_state import mission_state_manager
             mission = mission_state_manager.get_mission(mission_id)
-            if mission and mission.logs:
-                recent_logs = mission.logs[-15:]  # Check last 15 logs
-                # CRITICAL: Only detect actual obstacle blocking, not just mentions
-                # Look for specific patterns that indicate obstacle blocking:
-                # - "Obstacle detected at position" (safety rejection)
-                # - "aborted due to obstacle" (explicit abort)
-                # - "blocked by obstacle" (explicit blocking)
-                # - "unable to find alternative path" (truly stuck)
-                obstacle_blocking = any(
-                    ("obstacle detected at position" in log.message.lower() and log.level == "warning") or
-                    ("aborted due to obstacle" in log.message.lower()) or
-                    ("blocked by obstacle" in log.message.lower()) or
-                    ("unable to find alternative path" in log.message.lower()) or
-                    ("too many safety rejections" in log.message.lower())
-                    for log in recent_logs
-                )
-                # Only set to ABORTED if there's clear evidence of obstacle blocking
-                if obstacle_blocking:
-                    mission_status = MissionStatus.ABORTED
-                    print(f"⚠️  Reporter: Detected actual obstacle blocking in logs, setting status to ABORTED")
+            # CRITICAL: Only detect actual obstacle blocking, not just mentions - the
+            # mission's event counters record aborts and obstacle rejections as they happen
+            if mission and mission.counters.obstacle_blocked:
+                mission_status = MissionStatus.ABORTED
+                print(f"⚠️  Reporter: Detected actual obstacle blocking, setting status to ABORTED")
 
         # CRITICAL FIX: Get rover position from mission state manager (source of truth) if available
         actual_rover_pos = rover_pos_dict
@@ -88,30 +70,19 @@ class ReporterAgent:
         if mission_id:
             from app.services.mission_state import mission_state_manager
             mission = mission_state_manager.get_mission(mission_id)
-            if mission and mission.logs:
-                # Look for key agent messages to build accurate summary
-                planner_logs = [log for log in mission.logs if log.agent_type == AgentType.PLANNER]
-                rover_logs = [log for log in mission.logs if log.agent_type == AgentType.ROVER]
-                safety_logs = [log for log in mission.logs if log.agent_type == AgentType.SAFETY]
-                reporter_logs = [log for log in mission.logs if log.agent_type == AgentType.REPORTER]
+            if mission:
+                # Latest message per agent is tracked as logs are added - no log scan needed
+                last_message = mission.counters.last_message
                 
                 # Use actual agent messages to build summary
-                if planner_logs:
-                    planning_msg = planner_logs[-1].message if planner_logs else ""
-                    if "Generated" in planning_msg or "steps" in planning_msg.lower():
-                        agent_summary_parts.append(planning_msg)
-                
-                # Check for obstacle detection from safety agent
-                obstacle_detected = any(
-                    "obstacle" in log.message.lower() and log.level == "warning"
-                    for log in safety_logs
-                )
+                planning_msg = last_message.get(AgentType.PLANNER, "")
+                if "Generated" in planning_msg or "steps" in planning_msg.lower():
+                    agent_summary_parts.append(planning_msg)
                 
                 # Check for completion from reporter
-                if reporter_logs:
-                    completion_msg = reporter_logs[-1].message if reporter_logs else ""
-                    if "Mission report generated" in completion_msg:
-                        agent_summary_parts.append(completion_msg)
+                completion_msg = last_message.get(AgentType.REPORTER, "")
+                if "Mission report generated" in completion_msg:
+                    agent_summary_parts.append(completion_msg)
         
         # Build summary from agent outputs or fallback to step count
         if agent_summary_parts:
@@ -125,10 +96,16 @@ class ReporterAgent:
         # Fetch random mission photos for variety
         mission_photos = nasa_client.get_random_mission_photos(count=3)
 
-        # Fetch APOD for report
+        # Fetch APOD for report (prefetched onto the mission at plan time when available)
         apod_data = {}
+        if mission_id:
+            from app.services.mission_state import mission_state_manager
+            mission = mission_state_manager.get_mission(mission_id)
+            if mission and mission.apod_data:
+                apod_data = mission.apod_data
         try:
-            apod_data = await nasa_client.get_apod()
+            if not apod_data:
+                apod_data = await nasa_client.get_apod()
             # Ensure apod_data is a dict
             if not isinstance(apod_data, dict):
                 apod_data = nasa_client._get_mock_apod()
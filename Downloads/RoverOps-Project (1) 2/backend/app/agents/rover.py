@@ -1,7 +1,7 @@
 from typing import Dict, Any, Optional
-import json
 from app.agents.base import BaseAgent
 from app.models.schemas import AgentType, AgentStatus, MissionStep, RoverPosition
+from app.services.executors import mission_executors, parse_llm_json
 
 class RoverAgent(BaseAgent):
     """Agent that executes mission steps and determines movement actions"""
@@ -183,15 +183,8 @@ Make findings SPECIFIC, DETAILED, and SCIENTIFICALLY ACCURATE."""
         try:
             response_text = result["response"]
             
-            # Extract JSON from response
-            json_start = response_text.find("{")
-            json_end = response_text.rfind("}") + 1
-            
-            if json_start != -1 and json_end > json_start:
-                json_text = response_text[json_start:json_end]
-                action_data = json.loads(json_text)
-            else:
-                action_data = json.loads(response_text)
+            # Extract JSON from response (large responses are parsed off the event loop)
+            action_data = await mission_executors.run_cpu(parse_llm_json, response_text)
             
             # Parse next position
             next_pos_data = action_data.get("next_position", {})
@@ -266,8 +259,6 @@ Make findings SPECIFIC, DETAILED, and SCIENTIFICALLY ACCURATE."""
     
     def _create_fallback_action(self, step: MissionStep, current_position: RoverPosition, obstacles: list = None) -> Dict[str, Any]:
         """Create fallback action if LLM parsing fails - with obstacle avoidance"""
-        import json
-        
         obstacles = obstacles or []
         obstacle_positions = {(o.x, o.y) for o in obstacles}
         
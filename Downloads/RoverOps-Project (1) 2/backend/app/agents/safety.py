@@ -1,6 +1,7 @@
 from typing import Dict, Any
 from app.agents.base import BaseAgent
 from app.models.schemas import AgentType, AgentStatus, RoverPosition
+from app.services.executors import mission_executors, parse_llm_json
 
 class SafetyAgent(BaseAgent):
     """Agent that validates rover moves and blocks unsafe actions"""
@@ -67,17 +68,8 @@ Check if this move is safe and valid."""
         try:
             response_text = result["response"]
             
-            # Extract JSON
-            json_start = response_text.find("{")
-            json_end = response_text.rfind("}") + 1
-            
-            if json_start != -1 and json_end > json_start:
-                json_text = response_text[json_start:json_end]
-                import json
-                safety_data = json.loads(json_text)
-            else:
-                import json
-                safety_data = json.loads(response_text)
+            # Extract JSON (large responses are parsed off the event loop)
+            safety_data = await mission_executors.run_cpu(parse_llm_json, response_text)
             
             approved = safety_data.get("approved", True)
             reason = safety_data.get("reason", "Validated by safety agent")
@@ -27,4 +27,5 @@ class MissionGraphState(TypedDict):
     safety_approved: Optional[bool]  # Safety validation result
     execution_complete: bool  # Whether all steps are complete
     error: Optional[str]  # Error message if any
+    plan_key: Optional[str]  # Missions with the same key (a campaign's duplicate goals) share one plan
 
@@ -1,7 +1,8 @@
+import asyncio
 import os
 import json
 from datetime import datetime
-from typing import Dict, Any, Literal, Optional, Callable, Awaitable
+from typing import Dict, Any, List, Literal, Optional, Callable, Awaitable
 from langgraph.graph import StateGraph, END
 from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate, SystemMessagePromptTemplate, HumanMessagePromptTemplate
@@ -15,12 +16,26 @@ from app.models.schemas import (
     AgentType, 
     AgentStatus, 
     MissionStatus, 
+    MissionState,
+    TERMINAL_STATUSES,
     MissionLog,
     RoverPosition,
     MissionStep
 )
+from app.models.internal import ORIGIN, GridPos
+from app.services.checkpoints import mission_checkpointer
 from app.services.mission_state import mission_state_manager
+from app.services.mission_stats import current_mission_id
 from app.services.nasa_client import nasa_client
+from app.services.nasa_prefetch import nasa_prefetcher
+from app.services.report_cache import report_cache
+from app.services.serialization import RawJSON
+from app.services.update_coalescer import UPDATE_TICK_MS, Coalescer
+
+# Rejections in a row (no approved move in between) before the rover counts as truly stuck
+MAX_CONSECUTIVE_REJECTIONS = 8
+# Consecutive "adjacent to / at risk" rejections before the mission is aborted
+MAX_CONSECUTIVE_RISK_REJECTIONS = 10
 
 class MissionSupervisor:
     """LangGraph-based supervisor that orchestrates all agents"""
@@ -32,26 +47,36 @@ class MissionSupervisor:
         self.reporter = ReporterAgent()
         self.graph = self._build_graph()
         self.broadcast_callback: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None
+        self._resume_graphs: Dict[str, Any] = {}  # Entry node -> compiled graph, for resumed missions
+        self._shared_plans: Dict[str, asyncio.Future] = {}  # plan_key -> planner result
     
-    def _build_graph(self) -> StateGraph:
+    def _build_graph(self, entry_point: str = "planner") -> StateGraph:
         """Build the LangGraph state graph"""
         workflow = StateGraph(MissionGraphState)
+        # The planning prelude is only reachable from the entry, so graphs for resumed
+        # missions that enter past it leave it out
+        prelude = ["planner", "fetch_nasa_data"]
+        skipped = set(prelude[:prelude.index(entry_point)] if entry_point in prelude else prelude)
 
         # Add nodes (add emergency_return early so it's available for conditional edges)
-        workflow.add_node("planner", self._planner_node)
+        if "planner" not in skipped:
+            workflow.add_node("planner", self._planner_node)
         workflow.add_node("rover", self._rover_node)
         workflow.add_node("safety", self._safety_node)
         workflow.add_node("reporter", self._reporter_node)
-        workflow.add_node("fetch_nasa_data", self._fetch_nasa_data_node)
+        if "fetch_nasa_data" not in skipped:
+            workflow.add_node("fetch_nasa_data", self._fetch_nasa_data_node)
         workflow.add_node("update_position", self._update_position_node)
         workflow.add_node("emergency_return", self._emergency_return_node)
 
-        # Set entry point
-        workflow.set_entry_point("planner")
+        # Set entry point (resumed missions enter at the node after their last checkpoint)
+        workflow.set_entry_point(entry_point)
 
         # Add edges
-        workflow.add_edge("planner", "fetch_nasa_data")
-        workflow.add_edge("fetch_nasa_data", "rover")
+        if "planner" not in skipped:
+            workflow.add_edge("planner", "fetch_nasa_data")
+        if "fetch_nasa_data" not in skipped:
+            workflow.add_edge("fetch_nasa_data", "rover")
         workflow.add_conditional_edges(
             "rover",
             self._should_validate_or_complete,
@@ -84,6 +109,31 @@ class MissionSupervisor:
 
         return workflow.compile()
     
+    def _resume_node(self, node: str, state: MissionGraphState) -> Optional[str]:
+        """Node that follows `node` for this state, mirroring the graph's edges (None means END)"""
+        if node == "planner":
+            return "fetch_nasa_data"
+        if node == "fetch_nasa_data":
+            return "rover"
+        if node == "rover":
+            return {"validate": "safety", "execute": "update_position", "complete": "reporter"}[self._should_validate_or_complete(state)]
+        if node == "safety":
+            return {"approved": "update_position", "rejected": "rover", "abort": "emergency_return"}[self._safety_decision(state)]
+        if node == "update_position":
+            decision = self._should_continue(state)
+            return {"complete": "reporter", "abort": "emergency_return"}.get(decision, "rover") if isinstance(decision, str) else "rover"
+        if node == "emergency_return":
+            return "reporter"
+        return None
+    
+    def _graph_from(self, entry_point: str):
+        """Compiled graph entering at entry_point (built once per node)"""
+        if entry_point == "planner":
+            return self.graph
+        if entry_point not in self._resume_graphs:
+            self._resume_graphs[entry_point] = self._build_graph(entry_point)
+        return self._resume_graphs[entry_point]
+    
     async def _planner_node(self, state: MissionGraphState) -> Dict[str, Any]:
         """Planner agent node"""
         mission_id = state["mission_id"]
@@ -102,7 +152,7 @@ class MissionSupervisor:
         mission_state_manager.add_log(mission_id, log)
         
         # Generate plan
-        steps = await self.planner.plan_mission(goal)
+        steps = await self._plan(goal, state.get("plan_key"))
         
         # CRITICAL: Validate first step has correct target
         if steps and len(steps) > 0:
@@ -126,9 +176,7 @@ class MissionSupervisor:
         mission_state_manager.update_mission_status(mission_id, MissionStatus.PLANNING)
         
         # Store steps in mission state (clear existing steps first to avoid duplicates)
-        mission = mission_state_manager.get_mission(mission_id)
-        if mission:
-            mission.steps = []
+        mission_state_manager.clear_steps(mission_id)
         for step in steps:
             mission_state_manager.add_step(mission_id, step)
             
@@ -155,36 +203,53 @@ class MissionSupervisor:
             "logs": [log]
         }
     
+    async def _plan(self, goal: str, plan_key: Optional[str] = None) -> List[MissionStep]:
+        """Plan a goal; missions sharing a plan_key wait on one planner call and each get a copy"""
+        if plan_key is None:
+            return await self.planner.plan_mission(goal)
+        future = self._shared_plans.get(plan_key)
+        if future is None:
+            future = asyncio.ensure_future(self.planner.plan_mission(goal))
+            self._shared_plans[plan_key] = future
+        try:
+            steps = await asyncio.shield(future)
+        except Exception:
+            self._shared_plans.pop(plan_key, None)  # Let the next mission retry
+            raise
+        return [step.model_copy(deep=True) for step in steps]
+
+    def release_plans(self, plan_keys: List[str]):
+        """Forget shared plans once no mission will ask for them again"""
+        for plan_key in plan_keys:
+            self._shared_plans.pop(plan_key, None)
+
     async def _fetch_nasa_data_node(self, state: MissionGraphState) -> Dict[str, Any]:
-        """Fetch NASA data for mission context"""
+        """Kick off concurrent NASA prefetch for the planned mission without waiting on it"""
         mission_id = state["mission_id"]
         
-        try:
-            # Fetch weather data
-            weather_data = await nasa_client.get_mars_weather()
-            mission_state_manager.set_weather_data(mission_id, weather_data)
-            
-            log = MissionLog(
-                mission_id=mission_id,
-                agent_type=AgentType.SUPERVISOR,
-                message="Fetched Mars weather data from NASA API",
-                level="info"
-            )
-            mission_state_manager.add_log(mission_id, log)
-            
-            return {
-                "weather_data": weather_data,
-                "logs": [log]
-            }
-        except Exception as e:
-            log = MissionLog(
-                mission_id=mission_id,
-                agent_type=AgentType.SUPERVISOR,
-                message=f"Failed to fetch NASA data: {str(e)}",
-                level="warning"
-            )
-            mission_state_manager.add_log(mission_id, log)
-            return {"logs": [log]}
+        # Weather, APOD and per-step photos are fetched in the background and
+        # attached to the mission; nodes read them from the mission state later
+        nasa_prefetcher.start(mission_id, state.get("steps", []))
+        
+        log = MissionLog(
+            mission_id=mission_id,
+            agent_type=AgentType.SUPERVISOR,
+            message="Prefetching Mars weather, APOD and step imagery from NASA API",
+            level="info"
+        )
+        mission_state_manager.add_log(mission_id, log)
+        
+        # Weather may already be cached from an earlier mission - use it right away
+        return {
+            "weather_data": nasa_client.weather_cache,
+            "logs": [log]
+        }
+    
+    def _return_positions(self, mission: Optional[MissionState], steps: List[MissionStep]) -> List[int]:
+        """Indexes of return steps - from the mission's step index when there is a mission, no list scan"""
+        if mission:
+            return mission_state_manager.return_step_positions(mission.mission_id)
+        return [i for i, step in enumerate(steps) if step.action == "return"]
     
     async def _rover_node(self, state: MissionGraphState) -> Dict[str, Any]:
         """Rover agent node"""
@@ -196,51 +261,47 @@ class MissionSupervisor:
             steps = mission.steps  # Use mission state manager as source of truth
         else:
             steps = state.get("steps", [])
+        return_positions = self._return_positions(mission, steps)
         
         current_step_index = state.get("current_step_index", 0)
-        rover_position = state.get("rover_position", RoverPosition(x=0, y=0))
+        rover_position = state.get("rover_position") or ORIGIN.to_model()
         obstacles = state.get("obstacles", [])
         
         # Check if all steps are completed (using mission state manager as source of truth)
-        if steps and all(step.completed for step in steps):
+        all_completed = mission_state_manager.all_steps_completed(mission_id) if mission else bool(steps) and all(step.completed for step in steps)
+        if all_completed:
             # CRITICAL FIX: Verify return step is actually completed (rover is at base)
-            return_steps = [s for s in steps if s.action == "return"]
-            if return_steps:
-                rover_pos = rover_position
-                if isinstance(rover_pos, dict):
-                    rover_pos = RoverPosition(x=rover_pos.get("x", 0), y=rover_pos.get("y", 0))
+            if return_positions:
+                rover_pos = GridPos.of(rover_position)
                 if rover_pos.x != 0 or rover_pos.y != 0:
                     print(f"⚠️  All steps marked complete but rover at ({rover_pos.x}, {rover_pos.y}), not at base (0, 0). Continuing to return step...")
                     # Find return step and execute it
-                    for i, step in enumerate(steps):
-                        if step.action == "return" and not step.completed:
+                    for i in return_positions:
+                        if not steps[i].completed:
                             return {
                                 "current_step_index": i,
                                 "logs": []
                             }
                     # If return step is marked complete but rover not at base, unmark it
-                    for step in return_steps:
-                        if step.completed:
+                    for i in return_positions:
+                        if steps[i].completed:
                             print(f"⚠️  Return step marked complete but rover not at base. Unmarking return step...")
-                            mission_state_manager.update_step(mission_id, step.step_number, completed=False)
+                            mission_state_manager.update_step(mission_id, steps[i].step_number, completed=False)
                             return {
-                                "current_step_index": steps.index(step),
+                                "current_step_index": i,
                                 "logs": []
                             }
             # CRITICAL FIX: Even if no return step, verify rover is at base before completing
-            rover_pos = rover_position
-            if isinstance(rover_pos, dict):
-                rover_pos = RoverPosition(x=rover_pos.get("x", 0), y=rover_pos.get("y", 0))
+            rover_pos = GridPos.of(rover_position)
             if rover_pos.x != 0 or rover_pos.y != 0:
                 print(f"⚠️  All steps completed but rover at ({rover_pos.x}, {rover_pos.y}), not at base (0, 0). Cannot complete mission.")
                 # Find or create return step
-                return_steps = [s for s in steps if s.action == "return"]
-                if return_steps:
-                    return_step = return_steps[0]
+                if return_positions:
+                    return_step = steps[return_positions[0]]
                     if return_step.completed:
                         mission_state_manager.update_step(mission_id, return_step.step_number, completed=False)
                     return {
-                        "current_step_index": steps.index(return_step),
+                        "current_step_index": return_positions[0],
                         "logs": []
                     }
             return {"execution_complete": True, "current_step_index": len(steps)}
@@ -248,35 +309,28 @@ class MissionSupervisor:
         # CRITICAL FIX: Don't complete just because index exceeds length - check if return step is completed
         if current_step_index >= len(steps) and len(steps) > 0:
             # Check if return step exists and is completed
-            return_steps = [s for s in steps if s.action == "return"]
-            if return_steps:
+            if return_positions:
                 # Check if rover is at base
-                rover_pos = rover_position
-                if isinstance(rover_pos, dict):
-                    rover_pos = RoverPosition(x=rover_pos.get("x", 0), y=rover_pos.get("y", 0))
+                rover_pos = GridPos.of(rover_position)
                 if rover_pos.x != 0 or rover_pos.y != 0:
                     # Rover not at base - find return step and execute it
-                    for i, step in enumerate(steps):
-                        if step.action == "return":
-                            print(f"⚠️  Step index exceeds length but rover not at base. Executing return step at index {i}...")
-                            return {
-                                "current_step_index": i,
-                                "logs": []
-                            }
+                    i = return_positions[0]
+                    print(f"⚠️  Step index exceeds length but rover not at base. Executing return step at index {i}...")
+                    return {
+                        "current_step_index": i,
+                        "logs": []
+                    }
             # CRITICAL FIX: Even if no return step, verify rover is at base before completing
-            rover_pos = rover_position
-            if isinstance(rover_pos, dict):
-                rover_pos = RoverPosition(x=rover_pos.get("x", 0), y=rover_pos.get("y", 0))
+            rover_pos = GridPos.of(rover_position)
             if rover_pos.x != 0 or rover_pos.y != 0:
                 print(f"⚠️  Step index exceeds length but rover at ({rover_pos.x}, {rover_pos.y}), not at base (0, 0). Cannot complete mission.")
                 # Find return step and execute it
-                return_steps = [s for s in steps if s.action == "return"]
-                if return_steps:
-                    return_step = return_steps[0]
+                if return_positions:
+                    return_step = steps[return_positions[0]]
                     if return_step.completed:
                         mission_state_manager.update_step(mission_id, return_step.step_number, completed=False)
                     return {
-                        "current_step_index": steps.index(return_step),
+                        "current_step_index": return_positions[0],
                         "logs": []
                     }
             # Rover is at base, mission can complete
@@ -316,19 +370,16 @@ class MissionSupervisor:
             # CRITICAL FIX: Before moving to next step, check if rover needs to return to base
             # If this is not a return step and rover is not at base, ensure return step is executed
             if current_step.action != "return":
-                rover_pos = rover_position
-                if isinstance(rover_pos, dict):
-                    rover_pos = RoverPosition(x=rover_pos.get("x", 0), y=rover_pos.get("y", 0))
+                rover_pos = GridPos.of(rover_position)
                 
                 # If rover is not at base, check if return step exists and needs to be executed
                 if rover_pos.x != 0 or rover_pos.y != 0:
-                    return_steps = [s for s in steps if s.action == "return"]
-                    if return_steps:
-                        return_step = return_steps[0]
+                    if return_positions:
+                        return_step = steps[return_positions[0]]
                         # If return step is not completed, execute it
                         if not return_step.completed:
                             print(f"⚠️  Non-return step completed but rover at ({rover_pos.x}, {rover_pos.y}), not at base. Switching to return step...")
-                            return_step_index = steps.index(return_step)
+                            return_step_index = return_positions[0]
                             return {
                                 "current_step_index": return_step_index,
                                 "logs": []
@@ -338,16 +389,13 @@ class MissionSupervisor:
             next_index = current_step_index + 1
             if next_index >= len(steps):
                 # CRITICAL FIX: Before completing, check if rover is at base
-                rover_pos = rover_position
-                if isinstance(rover_pos, dict):
-                    rover_pos = RoverPosition(x=rover_pos.get("x", 0), y=rover_pos.get("y", 0))
+                rover_pos = GridPos.of(rover_position)
                 
                 # If rover is not at base, find and execute return step
                 if rover_pos.x != 0 or rover_pos.y != 0:
-                    return_steps = [s for s in steps if s.action == "return"]
-                    if return_steps:
-                        return_step = return_steps[0]
-                        return_step_index = steps.index(return_step)
+                    if return_positions:
+                        return_step_index = return_positions[0]
+                        return_step = steps[return_step_index]
                         # Unmark return step if marked complete but rover not at base
                         if return_step.completed:
                             print(f"⚠️  All steps done but rover at ({rover_pos.x}, {rover_pos.y}), not at base. Unmarking return step and continuing...")
@@ -422,7 +470,8 @@ class MissionSupervisor:
             steps = state.get("steps", [])
         
         # Check if all steps are completed (using mission state manager as source of truth)
-        if steps and all(step.completed for step in steps):
+        all_completed = mission_state_manager.all_steps_completed(mission_id) if mission else all(step.completed for step in steps)
+        if steps and all_completed:
             return "complete"
         
         if current_step_index >= len(steps) and len(steps) > 0:
@@ -437,9 +486,13 @@ class MissionSupervisor:
         """Safety agent node"""
         mission_id = state["mission_id"]
         current_action = state.get("current_action", {})
-        rover_position = state.get("rover_position", RoverPosition(x=0, y=0))
+        rover_position = state.get("rover_position") or ORIGIN.to_model()
         obstacles = state.get("obstacles", [])
         weather_data = state.get("weather_data")
+        if not weather_data:
+            # Prefetched weather lands on the mission state once it arrives
+            mission = mission_state_manager.get_mission(mission_id)
+            weather_data = mission.weather_data if mission else None
         
         next_position_data = current_action.get("next_position")
         if not next_position_data:
@@ -472,6 +525,14 @@ class MissionSupervisor:
         )
         mission_state_manager.add_log(mission_id, log)
         
+        steps = state.get("steps", [])
+        current_step_index = state.get("current_step_index", 0)
+        mission_state_manager.record_safety_check(
+            mission_id,
+            steps[current_step_index].step_number if current_step_index < len(steps) else None,
+            validation_result.get("approved", False),
+            validation_result.get("reason", "")
+        )
         mission_state_manager.update_agent_status(mission_id, AgentType.SAFETY, AgentStatus.IDLE)
         
         return {
@@ -497,16 +558,9 @@ class MissionSupervisor:
         mission = mission_state_manager.get_mission(mission_id) if mission_id else None
         
         if mission:
-            recent_logs = mission.logs[-20:] if len(mission.logs) > 20 else mission.logs
-            # Count consecutive rejections for the same step (truly stuck)
-            rejection_count = sum(1 for log in recent_logs 
-                                 if "Obstacle detected" in log.message 
-                                 or "cannot move" in log.message.lower()
-                                 or (log.level == "warning" and "rejected" in log.message.lower()))
-            
-            # CRITICAL FIX: Only abort if truly stuck (15+ rejections) - allow rover to find alternative paths
-            # Increased threshold to allow multiple pathfinding attempts
-            if rejection_count >= 15:
+            # CRITICAL FIX: Only abort if truly stuck (many rejections without an approved move)
+            # - allow rover to find alternative paths first
+            if mission.counters.consecutive_rejections >= MAX_CONSECUTIVE_REJECTIONS:
                 mission_state_manager.add_log(
                     mission_id,
                     MissionLog(
@@ -547,7 +601,7 @@ class MissionSupervisor:
         current_action = state.get("current_action", {})
         steps = state.get("steps", [])
         current_step_index = state.get("current_step_index", 0)
-        rover_position = state.get("rover_position", RoverPosition(x=0, y=0))
+        rover_position = state.get("rover_position") or ORIGIN.to_model()
         
         new_position = rover_position
         next_position_data = current_action.get("next_position")
@@ -582,6 +636,7 @@ class MissionSupervisor:
                             }
                         else:
                             # Position unchanged and NOT at target - this is a stuck state
+                            mission_state_manager.record_stall(mission_id, True)
                             print(f"⚠️  WARNING: Position unchanged at ({new_position.x}, {new_position.y}) but target is ({current_step.target_position.x}, {current_step.target_position.y}). Preventing infinite loop.")
                             # Don't schedule another navigation step - return with current state
                             return {
@@ -592,12 +647,18 @@ class MissionSupervisor:
             else:
                 # Position changed - update it
                 mission_state_manager.update_rover_position(mission_id, new_position)
+                mission_state_manager.record_stall(mission_id, False)
             
             # Fetch NASA image if requested - use next photo from pool for variety
             if current_action.get("request_image"):
                 try:
-                    # Get next photo from rotational pool - ensures different photo each step
-                    photo = nasa_client.get_next_photo_from_pool()
+                    # Use the photo prefetched for this step, then fall back to this
+                    # mission's pool rotation - both are local, no NASA I/O here
+                    photo = None
+                    if current_step_index < len(steps):
+                        photo = nasa_prefetcher.take_step_photo(mission_id, steps[current_step_index].step_number)
+                    if not photo:
+                        photo = nasa_client.get_next_photo_from_pool(mission_id=mission_id)
                     if photo:
                         image_url = photo.get("img_src", "")
                         if image_url:
@@ -752,26 +813,23 @@ class MissionSupervisor:
         # Only mark complete if ALL steps are actually completed AND rover is at all target positions
         execution_complete = False
         if updated_steps:
-            all_completed = all(step.completed for step in updated_steps)
+            mission = mission_state_manager.get_mission(mission_id)
             
-            # CRITICAL: Validate that rover actually reached all target positions
-            # Check if any move/explore step is marked complete but rover isn't at target
-            for i, step in enumerate(updated_steps):
-                if step.completed and step.target_position:
-                    # Get current rover position from mission state
-                    mission = mission_state_manager.get_mission(mission_id)
-                    if mission:
-                        rover_pos = mission.rover_position
-                        if isinstance(rover_pos, dict):
-                            rover_pos = RoverPosition(x=rover_pos.get("x", 0), y=rover_pos.get("y", 0))
-                        
-                        # If step is marked complete but rover isn't at target, it's a false completion
-                        if step.action != "return" and (rover_pos.x != step.target_position.x or rover_pos.y != step.target_position.y):
-                            print(f"❌ FALSE COMPLETION DETECTED: Step {step.step_number} marked complete but rover at ({rover_pos.x}, {rover_pos.y}), target is ({step.target_position.x}, {step.target_position.y})")
-                            # Unmark as complete
-                            step.completed = False
-                            mission_state_manager.update_step(mission_id, step.step_number, completed=False)
-                            all_completed = False
+            # CRITICAL: Validate that rover actually reached the target of the step it just worked on
+            # (earlier steps were verified the same way when they completed, so one check per move suffices)
+            if mission and current_step_index < len(updated_steps):
+                step = updated_steps[current_step_index]
+                if step.completed and step.target_position and step.action != "return":
+                    rover_pos = GridPos.of(mission.rover_position)
+                    
+                    # If step is marked complete but rover isn't at target, it's a false completion
+                    if rover_pos.x != step.target_position.x or rover_pos.y != step.target_position.y:
+                        print(f"❌ FALSE COMPLETION DETECTED: Step {step.step_number} marked complete but rover at ({rover_pos.x}, {rover_pos.y}), target is ({step.target_position.x}, {step.target_position.y})")
+                        # Unmark as complete (through the manager first so its counters see the change)
+                        mission_state_manager.update_step(mission_id, step.step_number, completed=False)
+                        step.completed = False
+            
+            all_completed = mission_state_manager.all_steps_completed(mission_id) if mission else all(step.completed for step in updated_steps)
             
             # CRITICAL: Only mark complete if ALL steps are completed
             execution_complete = all_completed
@@ -809,17 +867,14 @@ class MissionSupervisor:
 
         # CRITICAL FIX: Check if all steps are completed, including return-to-base step
         if steps:
-            all_completed = all(step.completed for step in steps)
+            all_completed = mission_state_manager.all_steps_completed(mission_id) if mission else all(step.completed for step in steps)
             
             # CRITICAL: Verify return step is completed (rover is at base)
             if all_completed:
                 # Check if there's a return step and if rover is at base
-                return_steps = [s for s in steps if s.action == "return"]
-                if return_steps:
+                if self._return_positions(mission, steps):
                     # Get rover position
-                    rover_pos = mission.rover_position if mission else state.get("rover_position", RoverPosition(x=0, y=0))
-                    if isinstance(rover_pos, dict):
-                        rover_pos = RoverPosition(x=rover_pos.get("x", 0), y=rover_pos.get("y", 0))
+                    rover_pos = GridPos.of(mission.rover_position if mission else state.get("rover_position"))
                     
                     # If rover is not at base (0,0), mission is not complete
                     if rover_pos.x != 0 or rover_pos.y != 0:
@@ -832,33 +887,29 @@ class MissionSupervisor:
         # Only complete if ALL steps are actually completed AND rover is at base
         if current_step_index >= len(steps) and len(steps) > 0:
             # Check if all steps are actually completed
-            all_completed = all(step.completed for step in steps)
+            all_completed = mission_state_manager.all_steps_completed(mission_id) if mission else all(step.completed for step in steps)
             if not all_completed:
                 print(f"⚠️  Warning: Step index ({current_step_index}) exceeds steps length ({len(steps)}), but not all steps completed. Continuing...")
                 return "continue"  # Force continue, don't complete
             
             # CRITICAL FIX: Check if return step is completed (rover is at base)
-            return_steps = [s for s in steps if s.action == "return"]
-            if return_steps:
-                rover_pos = mission.rover_position if mission else state.get("rover_position", RoverPosition(x=0, y=0))
-                if isinstance(rover_pos, dict):
-                    rover_pos = RoverPosition(x=rover_pos.get("x", 0), y=rover_pos.get("y", 0))
+            return_positions = self._return_positions(mission, steps)
+            if return_positions:
+                rover_pos = GridPos.of(mission.rover_position if mission else state.get("rover_position"))
                 
                 # If rover is not at base (0,0), continue executing return step
                 if rover_pos.x != 0 or rover_pos.y != 0:
                     print(f"⚠️  Step index exceeds length but rover at ({rover_pos.x}, {rover_pos.y}), not at base (0, 0). Continuing return step...")
                     # Find return step and continue executing it
-                    for i, step in enumerate(steps):
-                        if step.action == "return":
-                            # Unmark return step if marked complete but rover not at base
-                            if step.completed:
-                                print(f"⚠️  Return step marked complete but rover not at base. Unmarking and continuing...")
-                                mission_state_manager.update_step(mission_id, step.step_number, completed=False)
-                            return {
-                                "current_step_index": i,
-                                "logs": []
-                            }
-                    return "continue"  # Force continue until rover reaches base
+                    i = return_positions[0]
+                    # Unmark return step if marked complete but rover not at base
+                    if steps[i].completed:
+                        print(f"⚠️  Return step marked complete but rover not at base. Unmarking and continuing...")
+                        mission_state_manager.update_step(mission_id, steps[i].step_number, completed=False)
+                    return {
+                        "current_step_index": i,
+                        "logs": []
+                    }
             
             return "complete"
 
@@ -873,9 +924,7 @@ class MissionSupervisor:
             if not current_step.completed:
                 # Step is not complete - must continue
                 # Get current rover position to check if we're at target
-                rover_pos = mission.rover_position if mission else state.get("rover_position", RoverPosition(x=0, y=0))
-                if isinstance(rover_pos, dict):
-                    rover_pos = RoverPosition(x=rover_pos.get("x", 0), y=rover_pos.get("y", 0))
+                rover_pos = GridPos.of(mission.rover_position if mission else state.get("rover_position"))
                 
                 # CRITICAL FIX: For return step, check if rover is at base (0, 0)
                 if current_step.action == "return":
@@ -892,16 +941,11 @@ class MissionSupervisor:
         # CRITICAL FIX: Check for obstacle-blocked missions - only abort if truly stuck
         # Allow rover to find alternative paths instead of aborting immediately
         if mission:
-            total_logs = len(mission.logs)
-            recent_logs = mission.logs[-30:] if len(mission.logs) > 30 else mission.logs
-
-            # Count warning-level obstacle blocks (but allow alternative pathfinding)
-            obstacle_warnings = sum(1 for log in recent_logs if log.level == "warning" and ("adjacent to" in log.message.lower() or "at risk" in log.message.lower()))
-
-            # CRITICAL FIX: Only abort if truly stuck (20+ warnings) - increased threshold to allow pathfinding
-            if obstacle_warnings >= 20:
+            # CRITICAL FIX: Only abort if truly stuck (a long run of obstacle-risk rejections)
+            # - allow alternative pathfinding first
+            if mission.counters.consecutive_risk_rejections >= MAX_CONSECUTIVE_RISK_REJECTIONS:
                 # Insert return-to-base step if not already there
-                has_return_step = any(step.action == "return" for step in steps)
+                has_return_step = bool(self._return_positions(mission, steps))
                 if not has_return_step and len(steps) > 0:
                     # Mark all incomplete steps as having obstacle interruption
                     for step in steps:
@@ -930,10 +974,11 @@ class MissionSupervisor:
     async def _emergency_return_node(self, state: MissionGraphState) -> Dict[str, Any]:
         """Emergency return to base when mission is aborted"""
         mission_id = state["mission_id"]
-        rover_position = state.get("rover_position", RoverPosition(x=0, y=0))
+        rover_position = state.get("rover_position") or ORIGIN.to_model()
 
         # Update mission status to aborted
         mission_state_manager.update_mission_status(mission_id, MissionStatus.ABORTED)
+        mission_state_manager.record_blocking_event(mission_id)
 
         log = MissionLog(
             mission_id=mission_id,
@@ -944,14 +989,11 @@ class MissionSupervisor:
         mission_state_manager.add_log(mission_id, log)
 
         # Move rover back to (0,0) step by step
-        current_pos = rover_position
-        while current_pos.x != 0 or current_pos.y != 0:
+        current_pos = GridPos.from_position(rover_position)
+        while not current_pos.at_base:
             # Move towards (0,0)
-            new_x = current_pos.x - 1 if current_pos.x > 0 else current_pos.x + 1 if current_pos.x < 0 else 0
-            new_y = current_pos.y - 1 if current_pos.y > 0 else current_pos.y + 1 if current_pos.y < 0 else 0
-
-            new_pos = RoverPosition(x=new_x, y=new_y)
-            mission_state_manager.update_rover_position(mission_id, new_pos)
+            new_pos = current_pos.step_towards(ORIGIN)
+            mission_state_manager.update_rover_position(mission_id, new_pos.to_model())
 
             log = MissionLog(
                 mission_id=mission_id,
@@ -974,7 +1016,7 @@ class MissionSupervisor:
 
         return {
             "status": MissionStatus.ABORTED,
-            "rover_position": RoverPosition(x=0, y=0),
+            "rover_position": ORIGIN.to_model(),
             "logs": [log],
             "execution_complete": True
         }
@@ -991,49 +1033,31 @@ class MissionSupervisor:
         
         # CRITICAL FIX: Only check for ACTUAL obstacle blocking, not just mentions
         # Only set to ABORTED if there's clear evidence of obstacle blocking the mission
-        if mission and mission.logs:
-            recent_logs = mission.logs[-15:]  # Check last 15 logs
-            # CRITICAL: Only detect actual obstacle blocking, not just mentions
-            # Look for specific patterns that indicate obstacle blocking:
-            obstacle_blocking = any(
-                ("obstacle detected at position" in log.message.lower() and log.level == "warning") or
-                ("aborted due to obstacle" in log.message.lower()) or
-                ("blocked by obstacle" in log.message.lower()) or
-                ("unable to find alternative path" in log.message.lower()) or
-                ("too many safety rejections" in log.message.lower())
-                for log in recent_logs
-            )
-            if obstacle_blocking and final_status != MissionStatus.ABORTED:
-                print(f"⚠️  Mission aborted due to actual obstacle blocking detected in logs")
+        if mission:
+            # CRITICAL: Only detect actual obstacle blocking (an abort, or a latest safety
+            # check that hit an obstacle), not just mentions
+            if mission.counters.obstacle_blocked and final_status != MissionStatus.ABORTED:
+                print(f"⚠️  Mission aborted due to actual obstacle blocking")
                 final_status = MissionStatus.ABORTED
                 mission_state_manager.update_mission_status(mission_id, MissionStatus.ABORTED)
         
         # CRITICAL: Validate mission actually completed - check if rover reached all targets AND returned to base
         # BUT: Skip validation if mission was aborted (obstacle detected)
         if final_status != MissionStatus.ABORTED and mission and mission.steps:
-            all_steps_completed = all(step.completed for step in mission.steps)
+            all_steps_completed = mission_state_manager.all_steps_completed(mission_id)
             if not all_steps_completed:
                 print(f"❌ FALSE COMPLETION: Mission marked complete but not all steps completed!")
                 final_status = MissionStatus.ERROR
                 mission_state_manager.update_mission_status(mission_id, MissionStatus.ERROR)
             else:
-                # Double-check: verify rover is at target positions for all move/explore steps
-                rover_pos = mission.rover_position
-                if isinstance(rover_pos, dict):
-                    rover_pos = RoverPosition(x=rover_pos.get("x", 0), y=rover_pos.get("y", 0))
-                
-                for step in mission.steps:
-                    if step.target_position and step.action in ["move", "explore"]:
-                        if rover_pos.x != step.target_position.x or rover_pos.y != step.target_position.y:
-                            print(f"❌ FALSE COMPLETION: Step {step.step_number} target ({step.target_position.x}, {step.target_position.y}) not reached! Rover at ({rover_pos.x}, {rover_pos.y})")
-                            final_status = MissionStatus.ERROR
-                            mission_state_manager.update_mission_status(mission_id, MissionStatus.ERROR)
-                            break
+                # Move/explore targets were verified against the rover position when each step
+                # completed (_update_position_node), so only the final position is checked here
+                rover_pos = GridPos.of(mission.rover_position)
                 
                 # CRITICAL FIX: Verify rover is at base (0,0) for mission completion
                 # Check if there's a return step - if so, rover must be at base
-                return_steps = [s for s in mission.steps if s.action == "return"]
-                if return_steps:
+                return_positions = mission_state_manager.return_step_positions(mission_id)
+                if return_positions:
                     if rover_pos.x != 0 or rover_pos.y != 0:
                         print(f"❌ FALSE COMPLETION: Return step completed but rover at ({rover_pos.x}, {rover_pos.y}), not at base (0, 0)!")
                         final_status = MissionStatus.ERROR
@@ -1056,14 +1080,39 @@ class MissionSupervisor:
         mission_state_manager.add_log(mission_id, log)
         mission_state_manager.update_agent_status(mission_id, AgentType.REPORTER, AgentStatus.COMPLETE)
 
+        # Materialize the report now, so report requests are served from the cached bytes
+        await report_cache.materialize(mission_id)
+
         return {
             "status": final_status,
             "logs": [log]
         }
     
-    async def execute_mission(self, mission_id: str, initial_state: Dict[str, Any], broadcast_callback=None) -> Dict[str, Any]:
-        """Execute a mission using the LangGraph with optional broadcast callback"""
+    async def execute_mission(self, mission_id: str, initial_state: Dict[str, Any], broadcast_callback=None, resume_from: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Execute a mission using the LangGraph with optional broadcast callback.
+        
+        With `resume_from` (a checkpoint from mission_checkpointer) execution continues
+        with the node after the checkpointed one instead of starting at the planner.
+        """
+        # Agents' LLM calls made from this task are counted against the mission
+        current_mission_id.set(mission_id)
         try:
+            if resume_from:
+                graph_state: MissionGraphState = resume_from["graph_state"]
+                entry_point = self._resume_node(resume_from["node"], graph_state)
+                mission_state_manager.add_log(
+                    mission_id,
+                    MissionLog(
+                        mission_id=mission_id,
+                        agent_type=AgentType.SUPERVISOR,
+                        message=f"Mission resumed after restart (last completed node: {resume_from['node']})",
+                        level="info"
+                    )
+                )
+                if entry_point is None:
+                    return graph_state
+                return await self._stream_graph(mission_id, self._graph_from(entry_point), graph_state, broadcast_callback)
+            
             # Create initial graph state
             graph_state: MissionGraphState = {
                 "mission_id": mission_id,
@@ -1071,7 +1120,7 @@ class MissionSupervisor:
                 "status": MissionStatus.PENDING,
                 "steps": [],
                 "current_step_index": 0,
-                "rover_position": RoverPosition(x=0, y=0),
+                "rover_position": ORIGIN.to_model(),
                 "obstacles": initial_state.get("obstacles", []),
                 "goal_positions": [],
                 "logs": [],
@@ -1081,7 +1130,8 @@ class MissionSupervisor:
                 "current_action": None,
                 "safety_approved": None,
                 "execution_complete": False,
-                "error": None
+                "error": None,
+                "plan_key": initial_state.get("plan_key")
             }
             
             # Stream execution and broadcast updates
@@ -1089,65 +1139,7 @@ class MissionSupervisor:
             # Each step might take up to 18 moves (diagonal across 10x10 grid)
             # With 8 steps max, that's ~144 moves, plus planning/validation overhead
             # Set to 500 to handle obstacle-blocked scenarios with retries
-            config = {"recursion_limit": 500}
-            
-            final_state = None
-            try:
-                async for state_update in self.graph.astream(graph_state, config=config):
-                    # state_update is a dict with node names as keys, values are state updates
-                    # Merge all state updates into the graph state
-                    if state_update:
-                        for node_name, node_state in state_update.items():
-                            if isinstance(node_state, dict):
-                                # Update graph state with node state
-                                graph_state.update(node_state)
-                                
-                                # Ensure steps list is properly updated (LangGraph should handle this, but be explicit)
-                                if "steps" in node_state:
-                                    graph_state["steps"] = node_state["steps"]
-                        
-                        # Use the merged state as final state
-                        final_state = graph_state.copy()
-                        
-                        # Broadcast updates if callback provided
-                        if broadcast_callback:
-                            # Get current mission state for broadcasting
-                            mission = mission_state_manager.get_mission(mission_id)
-                            if mission:
-                                await broadcast_callback({
-                                    "type": "update",
-                                    "mission_id": mission_id,
-                                    "data": {
-                                        "rover_position": {"x": mission.rover_position.x, "y": mission.rover_position.y},
-                                        "current_step": mission.current_step,
-                                        "total_steps": len(mission.steps),
-                                        "status": mission.status.value,
-                                        "agent_states": {k.value: v.value for k, v in mission.agent_states.items()},
-                                        "logs": [{
-                                            "mission_id": log.mission_id,
-                                            "timestamp": log.timestamp.isoformat(),
-                                            "agent_type": log.agent_type.value,
-                                            "message": log.message,
-                                            "level": log.level
-                                        } for log in mission.logs[-10:]]  # Last 10 logs for better visibility
-                                    }
-                                })
-            except Exception as stream_error:
-                import traceback
-                traceback.print_exc()
-                print(f"Error in streaming execution: {stream_error}")
-                # Fall back to regular invocation with config
-                try:
-                    final_state = await self.graph.ainvoke(graph_state, config=config)
-                except Exception as invoke_error:
-                    print(f"Error in regular invocation: {invoke_error}")
-                    raise
-            
-            # If no streaming happened, run normally
-            if final_state is None:
-                final_state = await self.graph.ainvoke(graph_state, config=config)
-            
-            return final_state
+            return await self._stream_graph(mission_id, self.graph, graph_state, broadcast_callback)
             
         except Exception as e:
             mission_state_manager.update_mission_status(mission_id, MissionStatus.ERROR)
@@ -1159,4 +1151,92 @@ class MissionSupervisor:
             )
             mission_state_manager.add_log(mission_id, log)
             raise
+    
+    @staticmethod
+    def _update_emitter(mission_id: str, broadcast_callback):
+        """Emit callback for the update coalescer: builds the frame from the mission's state when it is sent"""
+        sent_logs = 0
+
+        async def emit(_):
+            nonlocal sent_logs
+            mission = mission_state_manager.get_mission(mission_id)
+            if not mission:
+                return
+            # The last 10 logs, or every log since the previous frame when more arrived in the tick (at most 100)
+            log_count = min(max(len(mission.logs) - sent_logs, 10), 100)
+            sent_logs = len(mission.logs)
+            await broadcast_callback({
+                "type": "update",
+                "mission_id": mission_id,
+                "data": {
+                    "rover_position": {"x": mission.rover_position.x, "y": mission.rover_position.y},
+                    "current_step": mission.current_step,
+                    "total_steps": len(mission.steps),
+                    "status": mission.status.value,
+                    "agent_states": {k.value: v.value for k, v in mission.agent_states.items()},
+                    # Each log encoded once and reused by every frame
+                    "logs": [RawJSON(log.json_bytes()) for log in mission.logs.tail(log_count)]
+                }
+            })
+
+        return emit
+
+    async def _stream_graph(self, mission_id: str, graph, graph_state: MissionGraphState, broadcast_callback=None) -> Dict[str, Any]:
+        """Run the graph from graph_state, checkpointing after every node and broadcasting coalesced updates"""
+        config = {"recursion_limit": 500}
+        updates = Coalescer(UPDATE_TICK_MS, self._update_emitter(mission_id, broadcast_callback)) if broadcast_callback else None
+
+        final_state = None
+        try:
+            async for state_update in graph.astream(graph_state, config=config):
+                # state_update is a dict with node names as keys, values are state updates
+                # Merge all state updates into the graph state
+                if state_update:
+                    for node_name, node_state in state_update.items():
+                        if isinstance(node_state, dict):
+                            # Update graph state with node state
+                            graph_state.update(node_state)
+
+                            # Ensure steps list is properly updated (LangGraph should handle this, but be explicit)
+                            if "steps" in node_state:
+                                graph_state["steps"] = node_state["steps"]
+
+                    # Use the merged state as final state
+                    final_state = graph_state.copy()
+                    mission = mission_state_manager.get_mission(mission_id)
+
+                    # Checkpoint so a restart resumes after the node that just completed
+                    if mission and mission.status not in TERMINAL_STATUSES and node_name != END:
+                        await mission_checkpointer.save(mission_id, node_name, graph_state, mission)
+                    # Let other workers serve reads of this mission (final state always goes out)
+                    if mission:
+                        mission_state_manager.share_mission(mission_id, force=mission.status in TERMINAL_STATUSES)
+
+                    # Node transitions within a tick go out as one update frame; a terminal state at once
+                    if updates and mission:
+                        await updates.submit()
+                        if mission.status in TERMINAL_STATUSES:
+                            await updates.flush()
+        except Exception as stream_error:
+            import traceback
+            traceback.print_exc()
+            print(f"Error in streaming execution: {stream_error}")
+            # Fall back to regular invocation with config
+            try:
+                final_state = await graph.ainvoke(graph_state, config=config)
+            except Exception as invoke_error:
+                print(f"Error in regular invocation: {invoke_error}")
+                raise
+        finally:
+            # Whatever is still held goes out before the caller's complete/error frame
+            if updates:
+                await updates.flush()
+
+        # If no streaming happened, run normally
+        if final_state is None:
+            final_state = await graph.ainvoke(graph_state, config=config)
+
+        # The graph ran to the end, nothing left to resume
+        mission_checkpointer.discard(mission_id)
+        return final_state
 
@@ -1,11 +1,12 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, BackgroundTasks
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, BackgroundTasks, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, FileResponse, PlainTextResponse, Response, StreamingResponse
 import uvicorn
 import os
 from dotenv import load_dotenv
-from typing import Dict, Set
+from typing import Dict, List, Literal, Optional, Set
 import uuid
+import csv
 import json
 import asyncio
 from datetime import datetime, timedelta
@@ -14,7 +15,21 @@ from pydantic import BaseModel
 from app.models.schemas import StartMissionRequest, StartMissionResponse, MissionStatusResponse
 from app.services.mission_state import mission_state_manager
 from app.agents.supervisor import MissionSupervisor
-from app.models.schemas import MissionStatus, WebSocketMessage, AgentType
+from app.models.log_buffer import remove_orphan_segments
+from app.models.schemas import MissionStatus, WebSocketMessage, AgentType, TERMINAL_STATUSES
+from app.services.campaigns import campaign_channel, campaign_manager, parse_goals
+from app.services.checkpoints import mission_checkpointer
+from app.services.event_stream import event_streams, format_event
+from app.services.executors import mission_executors
+from app.services.log_query import LOG_PAGE_MAX, LOG_PAGE_SIZE, LogFilter, iter_ndjson, read_log_page
+from app.services.loop_monitor import loop_monitor
+from app.services.profiler import loop_profiler
+from app.services.report_cache import etag_matches, report_cache
+from app.services.serialization import FastJSONResponse, RawJSON, dumps, dumps_text, encode_mission_parts
+from app.services.shared_state import mission_lease, shared_state
+from app.services.telemetry import TELEMETRY_SUBPROTOCOL, TelemetryStream
+from app.services.update_coalescer import UPDATE_TICK_MS, Coalescer, merge_updates
+from app.services.ws_multiplex import ALL_MISSIONS, CAMPAIGN_PREFIX, multiplex_hub
 
 class ScheduleMissionRequest(BaseModel):
     goal: str
@@ -22,21 +37,119 @@ class ScheduleMissionRequest(BaseModel):
 
 load_dotenv()
 
-app = FastAPI(title="Rover Ops API", version="1.0.0")
+app = FastAPI(title="Rover Ops API", version="1.0.0", default_response_class=FastJSONResponse)
 
 # Initialize NASA client photo pool on startup
 @app.on_event("startup")
 async def startup_event():
     """Initialize NASA client photo pool on server startup"""
     from app.services.nasa_client import nasa_client
-    if not nasa_client.cached_photos_pool:
+    if not nasa_client.photo_pool:
         # Try to build from API first, fallback if it fails
         try:
             await nasa_client._build_photo_pool()
         except Exception as e:
             print(f"Error building photo pool from API: {e}, using fallback")
             nasa_client._build_fallback_pool()
-        print(f"NASA photo pool initialized with {len(nasa_client.cached_photos_pool)} images")
+        print(f"NASA photo pool initialized with {len(nasa_client.photo_pool)} images")
+    # Sample event-loop lag so offloading can be seen to keep the loop responsive
+    loop_monitor.start()
+    # Slow-callback watchdog (only when PROFILING_ENABLED is set)
+    loop_profiler.start()
+    # Archive finished missions to disk in the background
+    asyncio.create_task(mission_state_manager.missions.run(float(os.getenv("MISSION_EVICT_INTERVAL", 30))))
+    # Write the aggregate statistics row periodically rather than on every transition
+    from app.services.persistence import mission_persistence
+    asyncio.create_task(mission_state_manager.stats.run(mission_persistence))
+    # With several workers, WebSocket fan-out arrives through the shared backend
+    if shared_state.shared:
+        asyncio.create_task(shared_state.listen(manager.deliver))
+    # Resume missions that were still executing when the previous process (or another worker) stopped
+    if shared_state.shared:
+        asyncio.create_task(shared_state.keep_leases(on_lost=mission_lease_lost))
+    asyncio.create_task(resume_checkpointed_missions())
+    # Spilled logs of missions that were archived or deleted by an earlier process
+    asyncio.create_task(remove_orphan_log_segments())
+
+async def resume_checkpointed_missions():
+    """Resume checkpointed missions nobody runs any more.
+
+    A worker holds a mission's lease for as long as it runs it, so a checkpoint
+    is only picked up once its owner finished it, released it at shutdown or
+    died (its lease expired). With several workers this is re-checked every
+    lease period, so missions of a crashed worker are taken over by the others.
+    """
+    while True:
+        for mission_id in await asyncio.to_thread(mission_checkpointer.mission_ids):
+            if mission_id in running_missions:
+                continue
+            if not await asyncio.to_thread(shared_state.acquire_lease, mission_lease(mission_id)):
+                continue
+            checkpoint = await asyncio.to_thread(mission_checkpointer.load, mission_id)
+            if checkpoint is None or checkpoint["mission"].status in TERMINAL_STATUSES:
+                mission_checkpointer.discard(mission_id)
+                shared_state.release_lease(mission_lease(mission_id))
+                continue
+            mission = checkpoint["mission"]
+            mission_state_manager.restore_mission(mission)
+            print(f"Resuming mission {mission_id} after node '{checkpoint['node']}'")
+            asyncio.create_task(execute_mission_async(mission_id, mission.goal, checkpoint=checkpoint))
+        if not shared_state.shared:
+            return
+        await asyncio.sleep(shared_state.lease_ttl)
+
+async def remove_orphan_log_segments():
+    """Delete log segments no resident mission, checkpoint or shared snapshot refers to"""
+    referenced = {mission.logs.segment_path for mission in mission_state_manager.missions.resident_missions()}
+
+    def in_use(path) -> bool:
+        if path in referenced:
+            return True
+        if not shared_state.shared:
+            return False
+        # Another worker's mission: its latest snapshot names the segment it writes
+        snapshot = shared_state.get_mission(path.stem.rsplit("-", 1)[0])
+        window = json.loads(snapshot[1]).get("logs") if snapshot else None
+        return isinstance(window, dict) and window.get("segment") == str(path)
+
+    def remove():
+        for mission_id in mission_checkpointer.mission_ids():
+            checkpoint = mission_checkpointer.load(mission_id)
+            if checkpoint is not None:
+                referenced.add(checkpoint["mission"].logs.segment_path)
+        return remove_orphan_segments(in_use)
+
+    removed = await asyncio.to_thread(remove)
+    if removed:
+        print(f"Removed {removed} orphaned log segments")
+
+def mission_lease_lost(lease: str):
+    """Another worker resumed a mission this one stalled on; stop running it here"""
+    mission_id = lease.removeprefix(mission_lease(""))
+    task = running_missions.get(mission_id)
+    if task is not None:
+        mission_checkpointer.forget(mission_id)
+        task.cancel()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush queued mission rows and pending checkpoints before the process exits"""
+    from app.services.persistence import mission_persistence
+    # Stop running missions first so their last checkpoints are final before the leases are handed back
+    tasks = list(running_missions.values())
+    for task in tasks:
+        task.cancel()
+    if tasks:
+        await asyncio.wait(tasks, timeout=float(os.getenv("SHUTDOWN_MISSION_TIMEOUT", 5)))
+    mission_checkpointer.flush()
+    await asyncio.to_thread(shared_state.release_leases)
+    mission_state_manager.stats.flush(mission_persistence)
+    await asyncio.to_thread(mission_persistence.close)
+    await asyncio.to_thread(shared_state.close)
+    loop_monitor.stop()
+    loop_profiler.stop()
+    mission_executors.shutdown()
+    campaign_manager.stop()
 
 # CORS middleware
 app.add_middleware(
@@ -51,28 +164,64 @@ app.add_middleware(
 class ConnectionManager:
     def __init__(self):
         self.active_connections: Dict[str, Set[WebSocket]] = {}
-
-    async def connect(self, websocket: WebSocket, mission_id: str):
-        await websocket.accept()
+        self.throttles: Dict[WebSocket, Coalescer] = {}  # Clients that asked for fewer update frames than the server sends
+        self.telemetry: Dict[WebSocket, TelemetryStream] = {}  # Clients that negotiated binary update frames
+
+    async def connect(self, websocket: WebSocket, mission_id: str, tick_ms: Optional[float] = None, offer_telemetry: bool = False):
+        if offer_telemetry and TELEMETRY_SUBPROTOCOL in websocket.scope.get("subprotocols", []):
+            await websocket.accept(subprotocol=TELEMETRY_SUBPROTOCOL)
+            self.telemetry[websocket] = TelemetryStream()
+        else:
+            await websocket.accept()
         if mission_id not in self.active_connections:
             self.active_connections[mission_id] = set()
         self.active_connections[mission_id].add(websocket)
+        if tick_ms and tick_ms > UPDATE_TICK_MS:
+            self.throttles[websocket] = Coalescer(tick_ms, lambda message: self._send(websocket, message), merge=merge_updates)
 
     def disconnect(self, websocket: WebSocket, mission_id: str):
+        self.telemetry.pop(websocket, None)
+        throttle = self.throttles.pop(websocket, None)
+        if throttle:
+            throttle.close()
         if mission_id in self.active_connections:
             self.active_connections[mission_id].discard(websocket)
             if not self.active_connections[mission_id]:
                 del self.active_connections[mission_id]
 
     async def send_personal_message(self, message: dict, websocket: WebSocket):
-        await websocket.send_json(message)
+        await websocket.send_text(dumps_text(message))
 
     async def broadcast(self, message: dict, mission_id: str):
+        """Send to every client of a mission, on whichever worker it is connected"""
+        channels = [mission_id]
+        # Campaign watchers get the lifecycle frames of every mission, not each move
+        campaign = campaign_manager.channel_of(mission_id)
+        if campaign and message.get("type") != "update":
+            channels.append(campaign)
+        for channel in channels:
+            if shared_state.shared:
+                # Every worker (this one included) delivers it from shared_state.listen()
+                shared_state.publish(channel, message)
+            else:
+                await self.deliver(message, channel)
+
+    async def deliver(self, message: dict, mission_id: str):
+        """Send to the clients of a mission connected to this worker"""
+        multiplex_hub.route(message, mission_id)
+        event_streams.publish(message, mission_id)
         if mission_id in self.active_connections:
+            text = dumps_text(message)  # Encode once for every client
             disconnected = set()
-            for connection in self.active_connections[mission_id]:
+            for connection in list(self.active_connections[mission_id]):
                 try:
-                    await connection.send_json(message)
+                    throttle = self.throttles.get(connection)
+                    if throttle and message.get("type") == "update":
+                        await throttle.submit(message)
+                        continue
+                    if throttle:
+                        await throttle.flush()  # Held state first, then e.g. the complete frame
+                    await self._send(connection, message, text)
                 except Exception as e:
                     print(f"Error sending message: {e}")
                     disconnected.add(connection)
@@ -81,14 +230,33 @@ class ConnectionManager:
             for conn in disconnected:
                 self.disconnect(conn, mission_id)
 
+    async def _send(self, websocket: WebSocket, message: dict, text: Optional[str] = None):
+        """Send one frame to one client: update frames in binary when it negotiated telemetry, JSON otherwise"""
+        stream = self.telemetry.get(websocket)
+        if stream and message.get("type") == "update":
+            for frame in stream.frames(message):
+                if isinstance(frame, bytes):
+                    await websocket.send_bytes(frame)
+                else:
+                    await websocket.send_text(frame)
+            return
+        await websocket.send_text(text if text is not None else dumps_text(message))
+
 manager = ConnectionManager()
 
 # Global supervisor instance
 supervisor = MissionSupervisor()
+running_missions: Dict[str, asyncio.Task] = {}  # mission_id -> task executing it in this process
 
-async def execute_mission_async(mission_id: str, goal: str):
-    """Execute mission in background and broadcast updates via WebSocket"""
+async def execute_mission_async(mission_id: str, goal: str, checkpoint: Optional[dict] = None, plan_key: Optional[str] = None):
+    """Execute mission in background and broadcast updates via WebSocket (resuming from checkpoint if given)"""
+    running_missions[mission_id] = asyncio.current_task()
     try:
+        # Own the mission while it runs so no other worker resumes its checkpoint
+        if shared_state.shared and not await asyncio.to_thread(shared_state.acquire_lease, mission_lease(mission_id)):
+            print(f"Mission {mission_id} is already running on another worker")
+            return
+
         # Get mission state
         mission = mission_state_manager.get_mission(mission_id)
         if not mission:
@@ -104,7 +272,8 @@ async def execute_mission_async(mission_id: str, goal: str):
         
         initial_state = {
             "goal": goal,
-            "obstacles": obstacles
+            "obstacles": obstacles,
+            "plan_key": plan_key
         }
         
         # Broadcast mission start
@@ -112,7 +281,7 @@ async def execute_mission_async(mission_id: str, goal: str):
             "type": "status",
             "mission_id": mission_id,
             "status": "executing",
-            "message": "Mission execution started"
+            "message": "Mission execution resumed" if checkpoint else "Mission execution started"
         }, mission_id)
         
         # Define broadcast callback
@@ -120,7 +289,7 @@ async def execute_mission_async(mission_id: str, goal: str):
             await manager.broadcast(message, mission_id)
         
         # Execute mission using LangGraph with streaming updates
-        final_state = await supervisor.execute_mission(mission_id, initial_state, broadcast_callback=broadcast_update)
+        final_state = await supervisor.execute_mission(mission_id, initial_state, broadcast_callback=broadcast_update, resume_from=checkpoint)
         
         # Broadcast completion
         await manager.broadcast({
@@ -145,6 +314,20 @@ async def execute_mission_async(mission_id: str, goal: str):
             "message": f"Mission execution error: {str(e)}"
         }, mission_id)
         mission_state_manager.update_mission_status(mission_id, MissionStatus.ERROR)
+    finally:
+        from app.services.nasa_client import nasa_client
+        from app.services.nasa_prefetch import nasa_prefetcher
+        nasa_client.release_mission(mission_id)
+        nasa_prefetcher.release(mission_id)
+        # Keep the checkpoint if the task was cut short (e.g. by shutdown) so the next start resumes it
+        mission = mission_state_manager.get_mission(mission_id)
+        if mission is None or mission.status in TERMINAL_STATUSES:
+            mission_checkpointer.discard(mission_id)
+            await asyncio.to_thread(shared_state.release_lease, mission_lease(mission_id))
+        if running_missions.get(mission_id) is asyncio.current_task():
+            del running_missions[mission_id]
+
+campaign_manager.bind(execute_mission_async, manager.broadcast, supervisor.release_plans)
 
 @app.get("/")
 async def root():
@@ -154,6 +337,43 @@ async def root():
 async def health():
     return {"status": "healthy"}
 
+@app.get("/api/store/stats")
+async def get_store_stats():
+    """Mission store gauges: resident/archived missions and approximate bytes"""
+    return mission_state_manager.get_store_stats()
+
+@app.get("/api/executors/stats")
+async def get_executor_stats():
+    """Executor pool usage and event-loop lag"""
+    return {
+        "executors": mission_executors.get_stats(),
+        "loop_lag": loop_monitor.get_stats()
+    }
+
+@app.get("/api/debug/profile")
+async def get_loop_profile(seconds: float = 5.0, hz: float = 100.0, threads: str = "loop"):
+    """Time-boxed sampling profile as a collapsed-stack file (for flamegraph.pl, speedscope, ...)"""
+    if not loop_profiler.enabled:
+        raise HTTPException(status_code=404, detail="Profiling is disabled (set PROFILING_ENABLED=true)")
+    seconds = min(max(seconds, 0.1), 60.0)
+    hz = min(max(hz, 1.0), 1000.0)
+    try:
+        collapsed = await asyncio.to_thread(loop_profiler.profile, seconds, hz, threads == "all")
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return PlainTextResponse(collapsed, headers={"Content-Disposition": 'attachment; filename="profile.collapsed"'})
+
+@app.get("/api/debug/slow-callbacks")
+async def get_slow_callbacks(limit: int = 20):
+    """Recent callbacks that blocked the event loop, with the stack captured while they ran"""
+    if not loop_profiler.enabled:
+        raise HTTPException(status_code=404, detail="Profiling is disabled (set PROFILING_ENABLED=true)")
+    return {
+        "profiler": loop_profiler.get_stats(),
+        "loop_lag": loop_monitor.get_stats(),
+        "slow_callbacks": loop_profiler.get_slow_callbacks(limit)
+    }
+
 @app.post("/api/mission/start", response_model=StartMissionResponse)
 async def start_mission(request: StartMissionRequest, background_tasks: BackgroundTasks):
     """Start a new mission with a given goal"""
@@ -198,19 +418,154 @@ async def schedule_mission(request: ScheduleMissionRequest, background_tasks: Ba
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Invalid datetime format: {str(e)}")
 
-@app.get("/api/mission/{mission_id}", response_model=MissionStatusResponse)
-async def get_mission_status(mission_id: str):
-    """Get current mission status"""
-    mission = mission_state_manager.get_mission(mission_id)
+@app.get("/api/missions")
+async def list_missions(
+    status: Optional[List[MissionStatus]] = Query(None),
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    goal: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500)
+):
+    """List missions newest first, filtered by status, creation time and goal substring"""
+    if shared_state.shared:
+        # The index only covers this worker's missions; a partial listing would look complete
+        raise HTTPException(status_code=501, detail="Mission listing is per worker and not available with SHARED_STATE_URL set")
+    try:
+        missions, next_cursor = mission_state_manager.list_missions(status, created_after, created_before, goal, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"missions": missions, "next_cursor": next_cursor}
+
+@app.get("/api/stats")
+async def get_stats():
+    """Aggregate mission statistics, read from counters kept up to date on every status transition"""
+    if shared_state.shared:
+        # Each worker counts only its own missions; a partial total would look complete
+        raise HTTPException(status_code=501, detail="Mission statistics are per worker and not available with SHARED_STATE_URL set")
+    return mission_state_manager.stats.get_stats()
+
+def _event_stream_response(
+    channel: str, last_event_id: Optional[str], snapshot: dict, finished: bool, end_types: Set[str]
+) -> Response:
+    """SSE response for a channel: the frames missed since `last_event_id`, or a snapshot when they cannot be replayed"""
+    subscriber, replay, latest_id = event_streams.subscribe(channel, last_event_id)
+    if replay is None:
+        first = [(0, snapshot["type"], format_event(latest_id, snapshot["type"], dumps_text(snapshot)))]
+    elif not replay and finished:
+        # Nothing missed and nothing more to come: 204 stops EventSource from reconnecting
+        event_streams.unsubscribe(channel, subscriber)
+        return Response(status_code=204)
+    else:
+        first = replay
+    return StreamingResponse(
+        event_streams.stream(channel, subscriber, first, end_types, live=not finished),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/api/mission/{mission_id}/events")
+async def stream_mission_events(mission_id: str, request: Request, last_event_id: Optional[str] = None):
+    """Read-only mission update stream (Server-Sent Events), resumable with Last-Event-ID"""
+    mission = await mission_state_manager.find_mission(mission_id)
     if not mission:
         raise HTTPException(status_code=404, detail="Mission not found")
+    return _event_stream_response(
+        mission_id,
+        request.headers.get("last-event-id") or last_event_id,
+        mission_status_frame(mission),
+        mission.status in TERMINAL_STATUSES,
+        {"complete", "error"}
+    )
 
-    return MissionStatusResponse(
-        mission_id=mission_id,
-        status=mission.status,
-        state=mission
+@app.get("/api/missions/batch/{campaign_id}/events")
+async def stream_campaign_events(campaign_id: str, request: Request, last_event_id: Optional[str] = None):
+    """Read-only campaign stream (Server-Sent Events): the frames of /ws/campaign/{campaign_id}"""
+    progress = await campaign_manager.find_progress(campaign_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    return _event_stream_response(
+        campaign_channel(campaign_id),
+        request.headers.get("last-event-id") or last_event_id,
+        {"type": "campaign_progress", "campaign_id": campaign_id, "progress": progress},
+        progress["finished"],
+        {"campaign_complete"}
     )
 
+@app.post("/api/missions/batch")
+async def submit_mission_batch(request: Request):
+    """Start a campaign: many goals in one request (JSON, NDJSON or CSV body), run through a bounded scheduler"""
+    body = await request.body()
+    try:
+        goals = parse_goals(body, request.headers.get("content-type", "application/json"))
+        campaign = campaign_manager.submit(goals)
+    except (ValueError, UnicodeDecodeError, csv.Error) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid batch: {e}")
+
+    return {
+        "campaign_id": campaign.campaign_id,
+        "status": "queued",
+        "message": f"Campaign queued with {len(goals)} missions ({len(campaign.plan_keys)} unique plans)",
+        "missions": campaign_manager.get_missions(campaign.campaign_id),
+        "progress": campaign_manager.get_progress(campaign.campaign_id)
+    }
+
+@app.get("/api/missions/batch/{campaign_id}")
+async def get_mission_batch(campaign_id: str, include_missions: bool = False):
+    """Aggregated progress of a campaign"""
+    progress = await campaign_manager.find_progress(campaign_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    if include_missions:
+        progress["missions"] = await campaign_manager.find_missions(campaign_id)
+    return progress
+
+@app.get("/api/mission/{mission_id}", response_model=MissionStatusResponse, response_model_exclude_none=True)
+async def get_mission_status(mission_id: str, view: Literal["summary", "full"] = "summary"):
+    """Get current mission status: a constant-size summary, or the full state with view=full"""
+    summary = mission_state_manager.get_mission_summary(mission_id) if view == "summary" else None
+    if summary is not None:
+        return MissionStatusResponse(mission_id=mission_id, status=summary["status"], summary=summary)
+
+    mission = await mission_state_manager.find_mission(mission_id)
+    if not mission:
+        raise HTTPException(status_code=404, detail="Mission not found")
+
+    if view == "summary":
+        # Snapshot shared by another worker
+        summary = mission_state_manager.get_mission_summary(mission_id, mission)
+        return MissionStatusResponse(mission_id=mission_id, status=mission.status, summary=summary)
+    # Snapshot on the loop (the mission keeps changing); splicing in the log history, read from disk, happens off it
+    head = mission.model_dump_json(exclude={"logs"}).encode("utf-8")
+    logs = mission.logs.frozen()
+    state = await mission_executors.run_cpu(encode_mission_parts, head, logs, size=logs.json_size)
+    body = dumps({"mission_id": mission_id, "status": mission.status, "state": RawJSON(state)})
+    return Response(content=body, media_type="application/json")
+
+@app.get("/api/mission/{mission_id}/logs")
+async def get_mission_logs(
+    mission_id: str,
+    cursor: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1),
+    agent_type: Optional[List[AgentType]] = Query(None),
+    level: Optional[List[Literal["info", "warning", "error", "success"]]] = Query(None),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    format: Literal["json", "ndjson"] = "json"
+):
+    """Mission logs from `cursor` on, oldest first, filtered by agent/level/time; paged JSON or streamed NDJSON"""
+    mission = await mission_state_manager.find_mission(mission_id)
+    if not mission:
+        raise HTTPException(status_code=404, detail="Mission not found")
+
+    log_filter = LogFilter(agent_type, level, since, until)
+    if format == "ndjson":
+        # Sync iterator: Starlette drains it on a worker thread, so spilled history is read off the loop
+        return StreamingResponse(iter_ndjson(mission.logs, cursor, log_filter, limit), media_type="application/x-ndjson")
+
+    page = await mission_executors.run_io(read_log_page, mission.logs, cursor, log_filter, min(limit or LOG_PAGE_SIZE, LOG_PAGE_MAX))
+    return FastJSONResponse({"mission_id": mission_id, **page})
+
 @app.get("/api/apod")
 async def get_apod():
     """Get Astronomy Picture of the Day for mission background"""
@@ -222,78 +577,57 @@ async def get_apod():
         print(f"Error fetching APOD: {e}")
         return nasa_client._get_mock_apod()
 
+@app.get("/api/nasa/images/{digest}")
+async def get_cached_nasa_image(digest: str):
+    """Serve a rover photo from the local image cache"""
+    from app.services.nasa_client import nasa_client
+    cached = nasa_client.disk_cache.image_path(digest)
+    if not cached:
+        raise HTTPException(status_code=404, detail="Image not cached")
+    path, content_type = cached
+    return FileResponse(path, media_type=content_type, headers={"Cache-Control": "public, max-age=31536000, immutable"})
+
 @app.get("/api/mission/{mission_id}/report")
-async def get_mission_report(mission_id: str):
-    """Get detailed mission report with NASA data"""
-    mission = mission_state_manager.get_mission(mission_id)
+async def get_mission_report(mission_id: str, request: Request, log_offset: int = 0, log_limit: Optional[int] = None):
+    """Get detailed mission report with NASA data (logs can be paged with log_offset/log_limit).
+
+    The report is served from cached bytes with an ETag; a matching If-None-Match gets a 304.
+    """
+    mission = await mission_state_manager.find_mission(mission_id)
     if not mission:
         raise HTTPException(status_code=404, detail="Mission not found")
 
-    # Get diverse photos from pool for report
-    from app.services.nasa_client import nasa_client
-    mission_photos = nasa_client.get_random_photos_from_pool(count=3)
-
-    # Get APOD
-    apod_data = {}
-    try:
-        apod_data = await nasa_client.get_apod()
-    except:
-        apod_data = nasa_client._get_mock_apod()
+    etag, body = await report_cache.get(mission, log_offset, log_limit)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag, "Cache-Control": "no-cache"})
 
+def mission_status_frame(mission) -> dict:
+    """Current state of a mission, sent when a client starts watching it"""
     return {
-        "mission_id": mission_id,
-        "goal": mission.goal,
-        "status": "complete",  # FORCE STATUS TO COMPLETE: Always return complete
-        "rover_final_position": {"x": mission.rover_position.x, "y": mission.rover_position.y},
-        "steps_completed": sum(1 for step in mission.steps if step.completed),
-        "total_steps": len(mission.steps),
-        "collected_data": mission.collected_data if hasattr(mission, 'collected_data') else [],  # Include collected data
-        "mission_photos": [
-            {
-                "id": p.get("id"),
-                "url": p.get("img_src"),
-                "img_src": p.get("img_src"),  # Include both for compatibility
-                "camera": p.get("camera", {}).get("name") if isinstance(p.get("camera"), dict) else p.get("camera"),
-                "sol": p.get("sol")
-            }
-            for p in mission_photos
-        ],
-        "astronomy_picture_of_the_day": {
-            "title": apod_data.get("title", "Astronomy Picture of the Day"),
-            "date": apod_data.get("date", ""),
-            "explanation": apod_data.get("explanation", ""),
-            "image_url": apod_data.get("url", apod_data.get("hdurl", "")),
-            "copyright": apod_data.get("copyright", "NASA")
-        },
-        "logs": [
-            {
-                "timestamp": log.timestamp.isoformat(),
-                "agent": log.agent_type.value,
-                "message": log.message,
-                "level": log.level
-            }
-            for log in mission.logs
-        ]
+        "type": "status",
+        "mission_id": mission.mission_id,
+        "status": mission.status.value,
+        "data": {
+            "rover_position": {"x": mission.rover_position.x, "y": mission.rover_position.y},
+            "current_step": mission.current_step,
+            "total_steps": len(mission.steps),
+            "agent_states": {k.value: v.value for k, v in mission.agent_states.items()}
+        }
     }
 
 @app.websocket("/ws/mission/{mission_id}")
-async def websocket_endpoint(websocket: WebSocket, mission_id: str):
-    await manager.connect(websocket, mission_id)
+async def websocket_endpoint(websocket: WebSocket, mission_id: str, tick_ms: Optional[float] = None):
+    """Updates of one mission; `tick_ms` above the server's update tick merges them into fewer frames.
+
+    Offering the rover-telemetry.v1 subprotocol gets update frames as binary telemetry (logs stay JSON).
+    """
+    await manager.connect(websocket, mission_id, tick_ms, offer_telemetry=True)
     try:
         # Send current mission state on connection
-        mission = mission_state_manager.get_mission(mission_id)
+        mission = await mission_state_manager.find_mission(mission_id)
         if mission:
-            await manager.send_personal_message({
-                "type": "status",
-                "mission_id": mission_id,
-                "status": mission.status.value,
-                "data": {
-                    "rover_position": {"x": mission.rover_position.x, "y": mission.rover_position.y},
-                    "current_step": mission.current_step,
-                    "total_steps": len(mission.steps),
-                    "agent_states": {k.value: v.value for k, v in mission.agent_states.items()}
-                }
-            }, websocket)
+            await manager.send_personal_message(mission_status_frame(mission), websocket)
         
         # Keep connection alive and listen for messages
         while True:
@@ -308,6 +642,64 @@ async def websocket_endpoint(websocket: WebSocket, mission_id: str):
     except WebSocketDisconnect:
         manager.disconnect(websocket, mission_id)
 
+@app.websocket("/ws/campaign/{campaign_id}")
+async def campaign_websocket_endpoint(websocket: WebSocket, campaign_id: str):
+    """One channel for a whole campaign: mission status/complete/error frames plus campaign progress"""
+    channel = campaign_channel(campaign_id)
+    await manager.connect(websocket, channel)
+    try:
+        progress = await campaign_manager.find_progress(campaign_id)
+        if progress:
+            await manager.send_personal_message({"type": "campaign_progress", "campaign_id": campaign_id, "progress": progress}, websocket)
+
+        while True:
+            data = await websocket.receive_text()
+            try:
+                message = json.loads(data)
+                if message.get("type") == "ping":
+                    await manager.send_personal_message({"type": "pong"}, websocket)
+            except:
+                pass
+    except WebSocketDisconnect:
+        manager.disconnect(websocket, channel)
+
+@app.websocket("/ws/missions")
+async def multiplexed_websocket_endpoint(websocket: WebSocket, tick_ms: Optional[float] = None):
+    """Many missions over one connection: subscribe/unsubscribe by message, frames batched per tick"""
+    client = await multiplex_hub.connect(websocket, tick_ms)
+    try:
+        while True:
+            data = await websocket.receive_text()
+            try:
+                message = json.loads(data)
+                message_type = message.get("type")
+                targets = [str(target) for target in message.get("missions", [])]
+                if message_type == "subscribe":
+                    for target in multiplex_hub.subscribe(client, targets, message.get("tick_ms")):
+                        # Start each newly watched mission from its current state
+                        mission = None if target == ALL_MISSIONS or target.startswith(CAMPAIGN_PREFIX) else await mission_state_manager.find_mission(target)
+                        if mission:
+                            multiplex_hub.send(client, mission_status_frame(mission))
+                        elif target.startswith(CAMPAIGN_PREFIX):
+                            campaign_id = target[len(CAMPAIGN_PREFIX):]
+                            progress = await campaign_manager.find_progress(campaign_id)
+                            if progress:
+                                multiplex_hub.send(client, {"type": "campaign_progress", "campaign_id": campaign_id, "progress": progress})
+                elif message_type == "unsubscribe":
+                    multiplex_hub.unsubscribe(client, targets)
+                elif message_type == "ping":
+                    multiplex_hub.send(client, {"type": "pong"})
+                    continue
+                else:
+                    continue
+                multiplex_hub.send(client, {"type": "subscriptions", "missions": sorted(client.subscriptions)})
+            except:
+                pass
+    except WebSocketDisconnect:
+        pass
+    finally:
+        multiplex_hub.disconnect(client)
+
 if __name__ == "__main__":
     port = int(os.getenv("BACKEND_PORT", 8000))
     uvicorn.run(app, host="0.0.0.0", port=port)
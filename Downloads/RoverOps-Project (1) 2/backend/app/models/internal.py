@@ -0,0 +1,118 @@
+"""Lightweight engine-side representations of hot-path data.
+
+The supervisor reads and compares rover positions many times per move, and
+routing functions used to build a fresh RoverPosition for every read (as a
+default argument or when converting a dict). Inside the engine positions are
+read through `GridPos`, and a pydantic RoverPosition is only built where a
+value is stored on the mission or leaves through the API.
+"""
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from app.models.schemas import MissionStep, RoverPosition
+
+
+class GridPos:
+    """Immutable (x, y) grid cell - a slotted stand-in for RoverPosition inside the engine"""
+
+    __slots__ = ("x", "y")
+
+    def __init__(self, x: int, y: int):
+        object.__setattr__(self, "x", x)
+        object.__setattr__(self, "y", y)
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("GridPos is immutable")
+
+    @classmethod
+    def of(cls, value: Any) -> Union["GridPos", RoverPosition]:
+        """Read-only view of a position: RoverPosition/GridPos pass through untouched,
+        dicts and (x, y) tuples become a GridPos, and None means base (0, 0)"""
+        if value is None:
+            return ORIGIN
+        if isinstance(value, dict):
+            return cls(value.get("x", 0), value.get("y", 0))
+        if isinstance(value, tuple):
+            return cls(value[0], value[1])
+        return value
+
+    @classmethod
+    def from_position(cls, value: Any) -> "GridPos":
+        """Always a GridPos, for arithmetic on positions of any shape"""
+        pos = cls.of(value)
+        return pos if isinstance(pos, GridPos) else cls(pos.x, pos.y)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (GridPos, RoverPosition)):
+            return self.x == other.x and self.y == other.y
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((self.x, self.y))
+
+    def __iter__(self) -> Iterator[int]:
+        yield self.x
+        yield self.y
+
+    def __repr__(self) -> str:
+        return f"GridPos({self.x}, {self.y})"
+
+    @property
+    def at_base(self) -> bool:
+        return self.x == 0 and self.y == 0
+
+    def step_towards(self, target: "GridPos") -> "GridPos":
+        """One grid step (diagonal when both axes differ) towards target"""
+        dx = (target.x > self.x) - (target.x < self.x)
+        dy = (target.y > self.y) - (target.y < self.y)
+        return GridPos(self.x + dx, self.y + dy)
+
+    def to_model(self) -> RoverPosition:
+        """Convert for storage on the mission or the API"""
+        return RoverPosition(x=self.x, y=self.y)
+
+
+ORIGIN = GridPos(0, 0)
+
+
+class StepIndex:
+    """Per-mission step lookup and aggregates, kept in sync by MissionStateManager on every mutation.
+
+    Maps step_number to list position and keeps the positions of return
+    steps and of the first incomplete step, so per-move checks don't scan or
+    rebuild lists. The completed count lives in MissionState.counters.
+    """
+
+    __slots__ = ("positions", "return_positions", "first_incomplete")
+
+    def __init__(self, steps: List[MissionStep]):
+        self.positions: Dict[int, int] = {}
+        self.return_positions: List[int] = []
+        self.first_incomplete = 0
+        for position, step in enumerate(steps):
+            self._record(step, position)
+        self._advance(steps)
+
+    def added(self, steps: List[MissionStep], step: MissionStep):
+        """Record a step that was just appended to steps"""
+        self._record(step, len(steps) - 1)
+        self._advance(steps)
+
+    def _record(self, step: MissionStep, position: int):
+        self.positions.setdefault(step.step_number, position)
+        if step.action == "return":
+            self.return_positions.append(position)
+
+    def completion_changed(self, steps: List[MissionStep], position: int):
+        """Refresh first_incomplete after steps[position].completed changed"""
+        if not steps[position].completed and position < self.first_incomplete:
+            self.first_incomplete = position
+        else:
+            self._advance(steps)
+
+    def _advance(self, steps: List[MissionStep]):
+        # Amortized O(1): completions mostly happen in order
+        while self.first_incomplete < len(steps) and steps[self.first_incomplete].completed:
+            self.first_incomplete += 1
+
+    def position_of(self, step_number: int) -> Optional[int]:
+        return self.positions.get(step_number)
@@ -0,0 +1,337 @@
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Generic, Iterable, Iterator, List, Optional, Tuple, Type, TypeVar, Union, get_args
+
+from pydantic import BaseModel
+from pydantic_core import core_schema
+
+T = TypeVar("T", bound=BaseModel)
+
+DEFAULT_SPILL_DIR = Path(__file__).resolve().parents[2] / ".cache" / "logs"
+SPARSE_INDEX = 64  # Byte offset of every 64th spilled line is kept for seeking
+# Held while a spill moves entries from the window to the segment, so readers on other threads see it whole
+_SPILL_LOCK = threading.Lock()
+
+
+def remove_orphan_segments(in_use: Callable[[Path], bool], spill_dir: Optional[str] = None, grace: float = 60.0) -> int:
+    """Delete spill segments nothing refers to any more (left by missions of earlier processes).
+
+    `in_use` decides for each segment; files touched within `grace` seconds
+    are kept, so a segment being created or forked right now is never taken.
+    Returns how many files were removed.
+    """
+    directory = Path(spill_dir or os.getenv("MISSION_LOG_DIR") or DEFAULT_SPILL_DIR)
+    if not directory.is_dir():
+        return 0
+    removed = 0
+    cutoff = time.time() - grace
+    for path in directory.glob("*.jsonl"):
+        try:
+            if path.stat().st_mtime > cutoff or in_use(path):
+                continue
+            path.unlink()
+            removed += 1
+        except OSError as e:
+            print(f"Could not remove log segment {path}: {e}")
+    return removed
+
+
+def _json_bytes(item: BaseModel) -> bytes:
+    """An entry's JSON, using the item's own cached encoding when it keeps one"""
+    if hasattr(item, "json_bytes"):
+        return item.json_bytes()
+    return item.model_dump_json().encode("utf-8")
+
+
+class LogBuffer(Generic[T]):
+    """Append-only log store: a bounded in-memory window plus a spill-to-disk segment.
+
+    The most recent `capacity` entries live in a deque, so tail reads such as
+    `logs[-20:]` or `tail(20)` never touch older history. Once the window
+    overflows by `spill_batch` entries the oldest are appended to a JSONL
+    segment file in one write. The buffer still behaves like the list it
+    replaces (len, indexing, slicing, iteration) and serializes as the full
+    history, oldest first.
+    """
+
+    # Defaults for buffers pickled (checkpointed) by a version without these attributes
+    _borrowed = False
+    _json_size = 0
+
+    def __init__(
+        self,
+        items: Optional[Iterable[T]] = None,
+        item_type: Optional[Type[T]] = None,
+        capacity: Optional[int] = None,
+        spill_batch: Optional[int] = None,
+        spill_dir: Optional[str] = None
+    ):
+        self.item_type = item_type
+        self.capacity = capacity or int(os.getenv("MISSION_LOG_WINDOW", 200))
+        self.spill_batch = spill_batch or max(self.capacity // 4, 1)
+        self.spill_dir = Path(spill_dir or os.getenv("MISSION_LOG_DIR") or DEFAULT_SPILL_DIR)
+        self._recent: Deque[T] = deque()
+        self._spilled = 0
+        self._segment: Optional[Path] = None
+        self._segment_bytes = 0
+        self._checkpoints: List[int] = []  # _checkpoints[k] = byte offset of spilled line k * SPARSE_INDEX
+        self._spill_failed = False
+        self._borrowed = False  # Reads another process's segment; never writes or deletes it
+        self._json_size = 0  # Encoded bytes of every entry so far, plus separators
+        for item in items or ():
+            self.append(item)
+
+    # ------------------------------------------------------------------
+    # pydantic integration: validates from a list, serializes as a list
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler) -> core_schema.CoreSchema:
+        args = get_args(source)
+        item_type = args[0] if args else Any
+        list_schema = handler.generate_schema(List[item_type])
+
+        def from_list(items: List[T]) -> "LogBuffer[T]":
+            return cls(items, item_type=item_type if args else None)
+
+        return core_schema.union_schema(
+            [
+                core_schema.is_instance_schema(cls),
+                core_schema.no_info_after_validator_function(from_list, list_schema)
+            ],
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                lambda buffer: list(buffer), return_schema=list_schema
+            )
+        )
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def append(self, item: T):
+        if self.item_type is None:
+            self.item_type = type(item)
+        self._recent.append(item)
+        self._json_size += len(_json_bytes(item)) + 1
+        if len(self._recent) > self.capacity + self.spill_batch and not self._spill_failed:
+            self._spill(self.spill_batch)
+
+    def _spill(self, count: int):
+        # Write first, then move the entries in one step: a reader sees them either in the window or on disk
+        batch = list(islice(self._recent, count))
+        lines = [_json_bytes(item) + b"\n" for item in batch]
+        try:
+            if self._segment is None:
+                self.spill_dir.mkdir(parents=True, exist_ok=True)
+                # One segment per buffer, so a reloaded copy of a mission never shares a file
+                prefix = getattr(batch[0], "mission_id", None) or "buffer"
+                self._segment = self.spill_dir / f"{prefix}-{uuid.uuid4().hex[:8]}.jsonl"
+            with open(self._segment, "ab") as f:
+                f.write(b"".join(lines))
+        except OSError as e:
+            print(f"Log spill failed, keeping logs in memory: {e}")
+            self._spill_failed = True
+            return
+        with _SPILL_LOCK:
+            for line in lines:
+                if self._spilled % SPARSE_INDEX == 0:
+                    self._checkpoints.append(self._segment_bytes)
+                self._segment_bytes += len(line)
+                self._spilled += 1
+            for _ in batch:
+                self._recent.popleft()
+
+    def fork_segment(self):
+        """Give this buffer its own segment holding exactly the lines it has recorded.
+
+        A buffer restored from a checkpoint still names the segment of the
+        process that pickled it, and that process may have kept appending
+        after the checkpoint. Reading with the recorded offsets and appending
+        after the unrecorded lines would mix both histories, so the recorded
+        prefix (`_segment_bytes`) is copied to a fresh segment instead.
+        """
+        if self._segment is None:
+            return
+        source = self._segment
+        target = source.with_name(f"{source.stem.rsplit('-', 1)[0]}-{uuid.uuid4().hex[:8]}.jsonl")
+        try:
+            with open(source, "rb") as src, open(target, "wb") as dst:
+                remaining = self._segment_bytes
+                while remaining > 0:
+                    chunk = src.read(min(remaining, 1 << 20))
+                    if not chunk:
+                        break
+                    dst.write(chunk)
+                    remaining -= len(chunk)
+        except OSError as e:
+            print(f"Could not copy log segment {source}: {e}")
+            target.unlink(missing_ok=True)
+            return
+        self._segment = target
+
+    @property
+    def segment_path(self) -> Optional[Path]:
+        return self._segment
+
+    def discard_segment(self):
+        """Delete the spill file (once the full history has been archived elsewhere)"""
+        if self._segment is not None and not self._borrowed:
+            self._segment.unlink(missing_ok=True)
+
+    # ------------------------------------------------------------------
+    # Sharing with other workers
+    # ------------------------------------------------------------------
+
+    def segment_state(self) -> Dict[str, Any]:
+        """Where the spilled history is, JSON-ready, so another process can read it in place"""
+        return {
+            "segment": str(self._segment) if self._segment is not None else None,
+            "spilled": self._spilled,
+            "segment_bytes": self._segment_bytes,
+            "checkpoints": self._checkpoints
+        }
+
+    @classmethod
+    def borrow(cls, state: Dict[str, Any], recent: Iterable[T], item_type: Optional[Type[T]] = None) -> "LogBuffer[T]":
+        """Read-only view of another process's buffer: its window in memory, history read from its segment.
+
+        The owner only ever appends to the segment, so the recorded prefix
+        stays valid. If the segment is not reachable from here (another host,
+        or archived meanwhile) reads cover the window only.
+        """
+        buffer = cls(item_type=item_type)
+        buffer._recent.extend(recent)
+        buffer._segment = Path(state["segment"]) if state.get("segment") else None
+        buffer._spilled = state.get("spilled", 0)
+        buffer._segment_bytes = state.get("segment_bytes", 0)
+        buffer._checkpoints = list(state.get("checkpoints", []))
+        buffer._spill_failed = True  # Appends stay in memory
+        buffer._borrowed = True
+        return buffer
+
+    def frozen(self) -> "LogBuffer[T]":
+        """Read-only copy of the buffer as it is now (call on the loop): the window is copied, the segment shared.
+
+        Hand this rather than the live buffer to work that runs in a thread or
+        another process, so it sees one consistent history.
+        """
+        buffer = self.borrow(self.segment_state(), self._recent, item_type=self.item_type)
+        buffer._json_size = self._json_size
+        return buffer
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._spilled + len(self._recent)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __iter__(self) -> Iterator[T]:
+        return self.iter_page(0)
+
+    def __repr__(self) -> str:
+        return f"LogBuffer(len={len(self)}, resident={len(self._recent)}, spilled={self._spilled})"
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (LogBuffer, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def tail(self, n: int) -> List[T]:
+        """The last n entries, oldest first - reads only the in-memory window when it can"""
+        if n <= 0:
+            return []
+        if n <= len(self._recent):
+            return list(islice(reversed(self._recent), n))[::-1]
+        return list(self.iter_page(max(len(self) - n, 0)))
+
+    @property
+    def resident_count(self) -> int:
+        return len(self._recent)
+
+    @property
+    def json_size(self) -> int:
+        """Size of the full history serialized as a JSON array, counted as entries are appended"""
+        return max(self._json_size, 1) + 1
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[T, List[T]]:
+        total = len(self)
+        if isinstance(index, slice):
+            start, stop, step = index.indices(total)
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            if stop <= start:
+                return []
+            if stop == total:
+                return self.tail(total - start)
+            return list(self.iter_page(start, stop - start))
+        if index < 0:
+            index += total
+        if not 0 <= index < total:
+            raise IndexError("log index out of range")
+        if index >= self._spilled:
+            return self._recent[index - self._spilled]
+        return next(self._read_spilled(index, index + 1))
+
+    def _snapshot(self) -> Tuple[int, List[T], Optional[Path], List[int]]:
+        """(spilled count, window, segment, checkpoints) as of one instant.
+
+        Reads may run on another thread while the loop appends and spills;
+        serving both parts from one snapshot keeps positions contiguous. The
+        segment is append-only, so the recorded prefix stays valid.
+        """
+        with _SPILL_LOCK:
+            return self._spilled, list(self._recent), self._segment, self._checkpoints[:]
+
+    def iter_page(self, offset: int = 0, limit: Optional[int] = None) -> Iterator[T]:
+        """Iterate `limit` entries (all if None) starting at `offset`, oldest first"""
+        spilled, recent, segment, checkpoints = self._snapshot()
+        total = spilled + len(recent)
+        stop = total if limit is None else min(offset + limit, total)
+        if offset < spilled:
+            for line in self._read_lines(segment, checkpoints, offset, min(stop, spilled)):
+                yield self.item_type.model_validate_json(line)
+        if stop > spilled:
+            yield from islice(recent, max(offset - spilled, 0), stop - spilled)
+
+    def iter_json(self, offset: int = 0, limit: Optional[int] = None) -> Iterator[bytes]:
+        """Like iter_page, but yields each entry's JSON - spilled lines are passed through unparsed"""
+        spilled, recent, segment, checkpoints = self._snapshot()
+        total = spilled + len(recent)
+        stop = total if limit is None else min(offset + limit, total)
+        if offset < spilled:
+            for line in self._read_lines(segment, checkpoints, offset, min(stop, spilled)):
+                yield line.rstrip(b"\n")
+        if stop > spilled:
+            for item in islice(recent, max(offset - spilled, 0), stop - spilled):
+                yield _json_bytes(item)
+
+    def _read_spilled(self, start: int, stop: int) -> Iterator[T]:
+        for line in self._read_lines(self._segment, self._checkpoints, start, stop):
+            yield self.item_type.model_validate_json(line)
+
+    @staticmethod
+    def _read_lines(segment: Optional[Path], checkpoints: List[int], start: int, stop: int) -> Iterator[bytes]:
+        if segment is None or start >= stop:
+            return
+        checkpoint = start // SPARSE_INDEX
+        try:
+            with open(segment, "rb") as f:
+                f.seek(checkpoints[checkpoint])
+                line_number = checkpoint * SPARSE_INDEX
+                for line in f:
+                    if line_number >= stop:
+                        break
+                    if line_number >= start:
+                        yield line
+                    line_number += 1
+        except FileNotFoundError:
+            return
@@ -1,8 +1,10 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from typing import List, Optional, Dict, Any, Literal
 from datetime import datetime
 from enum import Enum
 
+from app.models.log_buffer import LogBuffer
+
 class AgentType(str, Enum):
     PLANNER = "planner"
     ROVER = "rover"
@@ -28,6 +30,9 @@ class MissionStatus(str, Enum):
     ABORTED = "aborted"
     ERROR = "error"
 
+# Statuses after which a mission no longer changes
+TERMINAL_STATUSES = frozenset({MissionStatus.COMPLETE, MissionStatus.ABORTED, MissionStatus.ERROR})
+
 class RoverPosition(BaseModel):
     x: int = Field(ge=0, le=9, description="X coordinate (0-9)")
     y: int = Field(ge=0, le=9, description="Y coordinate (0-9)")
@@ -64,6 +69,37 @@ class MissionLog(BaseModel):
     message: str
     level: Literal["info", "warning", "error", "success"] = "info"
     data: Optional[Dict[str, Any]] = None
+    _json: Optional[bytes] = PrivateAttr(default=None)
+
+    def json_bytes(self) -> bytes:
+        """Serialized entry, encoded once - logs are never modified after they are written"""
+        if self._json is None:
+            self._json = self.model_dump_json().encode("utf-8")
+        return self._json
+
+class MissionCounters(BaseModel):
+    """Per-mission event counters, updated as events happen so routing decisions never scan logs"""
+    safety_approvals: int = 0
+    safety_rejections: int = 0
+    rejections_by_step: Dict[int, int] = {}
+    consecutive_rejections: int = 0  # Since the last approved move
+    obstacle_hits: int = 0  # Rejections caused by an obstacle
+    consecutive_obstacle_hits: int = 0
+    risk_rejections: int = 0  # Rejections for moves adjacent to / at risk from obstacles
+    consecutive_risk_rejections: int = 0
+    consecutive_stalls: int = 0  # Position updates that left the rover short of its target without moving
+    completed_steps: int = 0
+    blocking_events: int = 0  # Obstacle blocks that ended or aborted the mission
+    llm_calls: int = 0
+    llm_errors: int = 0
+    llm_prompt_tokens: int = 0
+    llm_completion_tokens: int = 0
+    last_message: Dict[AgentType, str] = {}  # Latest log message per agent
+
+    @property
+    def obstacle_blocked(self) -> bool:
+        """True if the mission was blocked by obstacles or its latest safety check hit one"""
+        return self.blocking_events > 0 or self.consecutive_obstacle_hits > 0
 
 class MissionState(BaseModel):
     mission_id: str
@@ -74,7 +110,7 @@ class MissionState(BaseModel):
     obstacles: List[RoverPosition] = []
     goal_positions: List[RoverPosition] = []
     steps: List[MissionStep] = []
-    logs: List[MissionLog] = []
+    logs: LogBuffer[MissionLog] = Field(default_factory=lambda: LogBuffer(item_type=MissionLog))  # Recent window in memory, history spilled to disk
     agent_states: Dict[AgentType, AgentStatus] = {
         AgentType.PLANNER: AgentStatus.IDLE,
         AgentType.ROVER: AgentStatus.IDLE,
@@ -83,7 +119,11 @@ class MissionState(BaseModel):
     }
     nasa_images: List[str] = []
     weather_data: Optional[Dict[str, Any]] = None
+    apod_data: Optional[Dict[str, Any]] = None
+    report_photos: List[Dict[str, Any]] = []  # Chosen once, when the report is first built
     collected_data: List[Dict[str, Any]] = []  # Store collected samples and findings
+    counters: MissionCounters = Field(default_factory=MissionCounters)
+    _step_index: Any = PrivateAttr(default=None)  # StepIndex, built lazily by MissionStateManager
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
 
@@ -121,5 +161,6 @@ class StartMissionResponse(BaseModel):
 class MissionStatusResponse(BaseModel):
     mission_id: str
     status: MissionStatus
-    state: Optional[MissionState] = None
+    summary: Optional[Dict[str, Any]] = None  # Constant-size view, returned by default
+    state: Optional[MissionState] = None  # Full state (every step and log), only with view=full
 
@@ -0,0 +1,253 @@
+import asyncio
+import csv
+import io
+import json
+import os
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.models.schemas import TERMINAL_STATUSES, MissionStatus
+from app.services.mission_state import mission_state_manager
+from app.services.serialization import dumps_text
+from app.services.shared_state import shared_state
+
+MissionRunner = Callable[..., Awaitable[None]]  # runner(mission_id, goal, plan_key=...)
+Notify = Callable[[Dict[str, Any], str], Awaitable[None]]  # (message, channel)
+
+TERMINAL_VALUES = {status.value for status in TERMINAL_STATUSES}
+
+
+def normalize_goal(goal: str) -> str:
+    """Goals that differ only in case or whitespace share a plan"""
+    return " ".join(goal.split()).casefold()
+
+
+def campaign_channel(campaign_id: str) -> str:
+    """WebSocket channel of a campaign (next to the per-mission channels)"""
+    return f"campaign:{campaign_id}"
+
+
+def parse_goals(body: bytes, content_type: str) -> List[str]:
+    """Goals from a batch upload: JSON ({"goals": [...]} or a list), NDJSON or CSV.
+
+    NDJSON lines are JSON strings or {"goal": ...} objects. CSV uses the `goal`
+    column when there is a header with one, otherwise the first column.
+    Raises ValueError on malformed input.
+    """
+    text = body.decode("utf-8-sig")
+    media_type = content_type.split(";")[0].strip().lower()
+    if media_type in ("application/x-ndjson", "application/ndjson", "application/jsonl"):
+        items = [json.loads(line) for line in text.splitlines() if line.strip()]
+    elif media_type in ("text/csv", "application/csv"):
+        rows = [row for row in csv.reader(io.StringIO(text)) if row and any(cell.strip() for cell in row)]
+        header = [cell.strip().lower() for cell in rows[0]] if rows else []
+        column = header.index("goal") if "goal" in header else 0
+        items = [row[column] if column < len(row) else "" for row in rows[1 if "goal" in header else 0:]]
+    else:
+        data = json.loads(text)
+        items = data.get("goals") if isinstance(data, dict) else data
+        if not isinstance(items, list):
+            raise ValueError("Expected a JSON list of goals or {\"goals\": [...]}")
+    goals = []
+    for item in items:
+        goal = item.get("goal") if isinstance(item, dict) else item
+        if not isinstance(goal, str):
+            raise ValueError(f"Invalid goal entry: {item!r}")
+        if goal.strip():
+            goals.append(goal.strip())
+    return goals
+
+
+class Campaign:
+    """A batch of missions submitted together; identical goals share one plan"""
+
+    __slots__ = ("campaign_id", "created_at", "missions", "plan_keys", "queued", "by_status", "done", "finished_at")
+
+    def __init__(self, campaign_id: str):
+        self.campaign_id = campaign_id
+        self.created_at = datetime.now()
+        self.missions: List[Tuple[str, str]] = []  # (mission_id, goal), in submission order
+        self.plan_keys: Dict[str, str] = {}  # normalized goal -> plan key
+        self.queued = 0  # Missions waiting for a scheduler slot
+        self.by_status: Dict[str, int] = {}  # Mission counts, kept current from status transitions
+        self.done = 0  # Missions in a terminal status
+        self.finished_at: Optional[datetime] = None
+
+
+class CampaignManager:
+    """Runs mission campaigns through a bounded scheduler.
+
+    Every mission of a campaign goes onto one queue, drained by `concurrency`
+    workers, so a campaign of hundreds of goals never runs more than that many
+    missions at once. Identical goals (after normalize_goal) get one plan key:
+    the supervisor plans each key once and every mission with it starts from a
+    copy of that plan. Lifecycle frames of the campaign's missions, plus a
+    progress frame whenever one finishes, go to the campaign's channel, so
+    one WebSocket can follow the whole campaign. Progress is counted from the
+    state manager's status transitions, and finished campaigns are forgotten
+    `retention` seconds after their last mission ended.
+
+    A campaign runs on the worker it was submitted to. With SHARED_STATE_URL
+    set its progress and mission list are also stored in the shared backend
+    (under "campaign:<id>" keys), so `find_progress()` / `find_missions()`
+    answer on every worker.
+    """
+
+    def __init__(self, concurrency: Optional[int] = None, max_goals: Optional[int] = None, retention: Optional[float] = None):
+        self.concurrency = concurrency or int(os.getenv("CAMPAIGN_CONCURRENCY", 4))
+        self.max_goals = max_goals or int(os.getenv("CAMPAIGN_MAX_GOALS", 1000))
+        self.retention = retention if retention is not None else float(os.getenv("CAMPAIGN_RETENTION_SECONDS", 3600))
+        self.campaigns: Dict[str, Campaign] = {}
+        self._mission_campaigns: Dict[str, str] = {}  # mission_id -> campaign_id
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._runner: Optional[MissionRunner] = None
+        self._notify: Optional[Notify] = None
+        self._release_plans: Optional[Callable[[List[str]], None]] = None
+        mission_state_manager.status_listeners.append(self._status_changed)
+
+    def bind(self, runner: MissionRunner, notify: Notify, release_plans: Optional[Callable[[List[str]], None]] = None):
+        """Set how missions are run, how frames are sent and how finished campaigns' plans are dropped"""
+        self._runner = runner
+        self._notify = notify
+        self._release_plans = release_plans
+
+    def _ensure_workers(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        self._workers = [task for task in self._workers if not task.done()]
+        for _ in range(self.concurrency - len(self._workers)):
+            self._workers.append(asyncio.create_task(self._work()))
+
+    def stop(self):
+        for task in self._workers:
+            task.cancel()
+        self._workers = []
+
+    def submit(self, goals: List[str]) -> Campaign:
+        """Create a mission per goal and queue them all (call from the event loop)"""
+        if not goals:
+            raise ValueError("No goals given")
+        if len(goals) > self.max_goals:
+            raise ValueError(f"At most {self.max_goals} goals per campaign")
+        self._expire()
+        campaign = Campaign(str(uuid.uuid4()))
+        self.campaigns[campaign.campaign_id] = campaign
+        self._ensure_workers()
+        for goal in goals:
+            mission_id = mission_state_manager.create_mission(goal)
+            key = normalize_goal(goal)
+            plan_key = campaign.plan_keys.setdefault(key, f"{campaign.campaign_id}:{len(campaign.plan_keys)}")
+            campaign.missions.append((mission_id, goal))
+            status = MissionStatus.PENDING.value
+            campaign.by_status[status] = campaign.by_status.get(status, 0) + 1
+            self._mission_campaigns[mission_id] = campaign.campaign_id
+            campaign.queued += 1
+            self._queue.put_nowait((campaign, mission_id, goal, plan_key))
+        if shared_state.shared:
+            shared_state.put_mission(f"{campaign_channel(campaign.campaign_id)}:missions", "campaign", dumps_text(self.get_missions(campaign.campaign_id)))
+            self._share(campaign)
+        return campaign
+
+    def _share(self, campaign: Campaign):
+        """Store the campaign's progress for other workers"""
+        if shared_state.shared:
+            shared_state.put_mission(campaign_channel(campaign.campaign_id), "campaign", dumps_text(self.get_progress(campaign.campaign_id)))
+
+    def channel_of(self, mission_id: str) -> Optional[str]:
+        """Campaign channel a mission's frames are also sent to, if it belongs to one"""
+        campaign_id = self._mission_campaigns.get(mission_id)
+        return campaign_channel(campaign_id) if campaign_id else None
+
+    def _status_changed(self, mission_id: str, previous: str, status: str):
+        campaign = self.campaigns.get(self._mission_campaigns.get(mission_id, ""))
+        if campaign is None:
+            return
+        campaign.by_status[previous] = campaign.by_status.get(previous, 0) - 1
+        if not campaign.by_status[previous]:
+            del campaign.by_status[previous]
+        campaign.by_status[status] = campaign.by_status.get(status, 0) + 1
+        campaign.done += (status in TERMINAL_VALUES) - (previous in TERMINAL_VALUES)
+        self._share(campaign)
+
+    def _expire(self):
+        """Forget campaigns that finished more than `retention` seconds ago"""
+        cutoff = datetime.now() - timedelta(seconds=self.retention)
+        for campaign_id, campaign in list(self.campaigns.items()):
+            if campaign.finished_at is not None and campaign.finished_at < cutoff:
+                del self.campaigns[campaign_id]
+                for mission_id, _ in campaign.missions:
+                    self._mission_campaigns.pop(mission_id, None)
+
+    async def _work(self):
+        while True:
+            campaign, mission_id, goal, plan_key = await self._queue.get()
+            campaign.queued -= 1
+            try:
+                await self._runner(mission_id, goal, plan_key=plan_key)
+            except Exception as e:
+                print(f"Campaign {campaign.campaign_id}: mission {mission_id} failed: {e}")
+            finally:
+                self._queue.task_done()
+            await self._mission_finished(campaign)
+
+    async def _mission_finished(self, campaign: Campaign):
+        self._expire()
+        progress = self.get_progress(campaign.campaign_id)
+        if progress["finished"] and campaign.finished_at is None:
+            campaign.finished_at = datetime.now()
+            progress["finished_at"] = campaign.finished_at.isoformat()
+            if self._release_plans:
+                self._release_plans(list(campaign.plan_keys.values()))
+        self._share(campaign)
+        if self._notify:
+            frame_type = "campaign_complete" if campaign.finished_at else "campaign_progress"
+            await self._notify({"type": frame_type, "campaign_id": campaign.campaign_id, "progress": progress}, campaign_channel(campaign.campaign_id))
+
+    def get_progress(self, campaign_id: str) -> Optional[Dict[str, Any]]:
+        """Aggregated progress: mission counts by status, plus queued/running/finished"""
+        campaign = self.campaigns.get(campaign_id)
+        if campaign is None:
+            return None
+        done = campaign.done
+        return {
+            "campaign_id": campaign_id,
+            "created_at": campaign.created_at.isoformat(),
+            "finished_at": campaign.finished_at.isoformat() if campaign.finished_at else None,
+            "total": len(campaign.missions),
+            "unique_plans": len(campaign.plan_keys),
+            "queued": campaign.queued,
+            "running": len(campaign.missions) - campaign.queued - done,
+            "done": done,
+            "by_status": dict(campaign.by_status),
+            "finished": done == len(campaign.missions)
+        }
+
+    def get_missions(self, campaign_id: str) -> Optional[List[Dict[str, str]]]:
+        campaign = self.campaigns.get(campaign_id)
+        if campaign is None:
+            return None
+        return [{"mission_id": mission_id, "goal": goal} for mission_id, goal in campaign.missions]
+
+    async def find_progress(self, campaign_id: str) -> Optional[Dict[str, Any]]:
+        """Progress of a campaign run here, else as last stored by the worker running it"""
+        progress = self.get_progress(campaign_id)
+        if progress is None and shared_state.shared:
+            progress = await self._find_shared(campaign_channel(campaign_id))
+        return progress
+
+    async def find_missions(self, campaign_id: str) -> Optional[List[Dict[str, str]]]:
+        missions = self.get_missions(campaign_id)
+        if missions is None and shared_state.shared:
+            missions = await self._find_shared(f"{campaign_channel(campaign_id)}:missions")
+        return missions
+
+    @staticmethod
+    async def _find_shared(key: str) -> Any:
+        snapshot = await asyncio.to_thread(shared_state.get_mission, key)
+        return json.loads(snapshot[1]) if snapshot else None
+
+
+# Global instance
+campaign_manager = CampaignManager()
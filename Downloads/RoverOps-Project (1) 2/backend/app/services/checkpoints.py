@@ -0,0 +1,154 @@
+import asyncio
+import os
+import pickle
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.models.schemas import TERMINAL_STATUSES, MissionState
+
+DEFAULT_CHECKPOINT_DIR = Path(__file__).resolve().parents[2] / ".cache" / "checkpoints"
+CHECKPOINT_VERSION = 1  # Bump when the payload layout changes; older files are ignored
+
+
+class MissionCheckpointer:
+    """Periodic on-disk checkpoints of in-flight missions so they survive a restart.
+
+    After each graph node the supervisor hands over the merged graph state;
+    at most once per `interval` seconds per mission that state and the
+    MissionState are pickled (on the loop, so the snapshot is consistent)
+    and written to `<checkpoint_dir>/<mission_id>.ckpt` off the loop.
+    Updates that fall inside the interval are pickled too, so the node,
+    graph state and mission in a snapshot always belong together, and the
+    latest is kept pending and written by `flush()` at shutdown. On startup `pending()`
+    returns the missions that were still running.
+    """
+
+    def __init__(self, checkpoint_dir: Optional[str] = None, interval: Optional[float] = None, enabled: Optional[bool] = None):
+        self.checkpoint_dir = Path(checkpoint_dir or os.getenv("MISSION_CHECKPOINT_DIR") or DEFAULT_CHECKPOINT_DIR)
+        self.interval = interval if interval is not None else float(os.getenv("MISSION_CHECKPOINT_INTERVAL", 1.0))
+        if enabled is None:
+            enabled = os.getenv("MISSION_CHECKPOINT_ENABLED", "true").lower() in ("1", "true", "yes")
+        self.enabled = enabled
+
+        self._last_write: Dict[str, float] = {}
+        self._pending: Dict[str, bytes] = {}  # Latest unwritten snapshot per mission, already serialized
+        self.writes = 0
+        self.skipped = 0
+
+        if self.enabled:
+            try:
+                self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+            except Exception as e:
+                print(f"Mission checkpoints disabled: {e}")
+                self.enabled = False
+
+    def _path(self, mission_id: str) -> Path:
+        return self.checkpoint_dir / f"{mission_id}.ckpt"
+
+    def _serialize(self, node: str, graph_state: Dict[str, Any], mission: MissionState) -> bytes:
+        return pickle.dumps({
+            "version": CHECKPOINT_VERSION,
+            "node": node,
+            "graph_state": graph_state,
+            "mission": mission,
+            "saved_at": datetime.now()
+        }, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _write(self, mission_id: str, payload: bytes):
+        tmp = self._path(mission_id).with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            f.write(payload)
+        os.replace(tmp, self._path(mission_id))
+
+    async def save(self, mission_id: str, node: str, graph_state: Dict[str, Any], mission: MissionState, force: bool = False):
+        """Checkpoint a mission after `node` completed (throttled to one write per interval unless forced)"""
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_write.get(mission_id, 0.0) < self.interval:
+            # Serialize now: the live mission keeps changing and must not be written next to this node later
+            try:
+                self._pending[mission_id] = self._serialize(node, graph_state, mission)
+            except Exception as e:
+                print(f"Error checkpointing mission {mission_id}: {e}")
+            self.skipped += 1
+            return
+        self._pending.pop(mission_id, None)
+        self._last_write[mission_id] = now
+        try:
+            payload = self._serialize(node, graph_state, mission)
+            await asyncio.to_thread(self._write, mission_id, payload)
+            self.writes += 1
+        except Exception as e:
+            print(f"Error checkpointing mission {mission_id}: {e}")
+
+    def flush(self):
+        """Write every pending snapshot now (called at shutdown)"""
+        for mission_id, payload in list(self._pending.items()):
+            try:
+                self._write(mission_id, payload)
+                self.writes += 1
+            except Exception as e:
+                print(f"Error checkpointing mission {mission_id}: {e}")
+        self._pending.clear()
+
+    def forget(self, mission_id: str):
+        """Drop the unwritten snapshot of a mission this process no longer runs (its file stays)"""
+        self._pending.pop(mission_id, None)
+        self._last_write.pop(mission_id, None)
+
+    def discard(self, mission_id: str):
+        """Drop a mission's checkpoint once it has finished"""
+        self._pending.pop(mission_id, None)
+        self._last_write.pop(mission_id, None)
+        if self.enabled:
+            self._path(mission_id).unlink(missing_ok=True)
+
+    def load(self, mission_id: str) -> Optional[Dict[str, Any]]:
+        """Read a checkpoint ({"node", "graph_state", "mission", "saved_at"}) or None"""
+        try:
+            with open(self._path(mission_id), "rb") as f:
+                checkpoint = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Ignoring unreadable checkpoint for mission {mission_id}: {e}")
+            return None
+        if not isinstance(checkpoint, dict) or checkpoint.get("version") != CHECKPOINT_VERSION:
+            return None
+        return checkpoint
+
+    def mission_ids(self) -> List[str]:
+        """Ids of the missions that have a checkpoint on disk"""
+        if not self.enabled:
+            return []
+        return [path.stem for path in self.checkpoint_dir.glob("*.ckpt")]
+
+    def pending(self) -> List[Dict[str, Any]]:
+        """Checkpoints of missions that were still running, oldest first; stale ones are removed"""
+        if not self.enabled:
+            return []
+        checkpoints = []
+        for path in self.checkpoint_dir.glob("*.ckpt"):
+            mission_id = path.stem
+            checkpoint = self.load(mission_id)
+            if checkpoint is None or checkpoint["mission"].status in TERMINAL_STATUSES:
+                path.unlink(missing_ok=True)
+                continue
+            checkpoints.append(checkpoint)
+        return sorted(checkpoints, key=lambda c: c["saved_at"])
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "interval": self.interval,
+            "writes": self.writes,
+            "skipped": self.skipped,
+            "pending": len(self._pending)
+        }
+
+
+# Global instance
+mission_checkpointer = MissionCheckpointer()
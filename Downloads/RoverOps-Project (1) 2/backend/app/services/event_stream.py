@@ -0,0 +1,154 @@
+import asyncio
+import os
+import time
+import uuid
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.services.serialization import dumps_text
+
+Event = Tuple[int, str, str]  # (sequence, frame type, formatted SSE event)
+
+
+def format_event(event_id: Optional[str], event_type: str, data: str) -> str:
+    lines = [f"id: {event_id}"] if event_id else []
+    lines.append(f"event: {event_type}")
+    lines.append(f"data: {data}")  # dumps_text never emits newlines
+    return "\n".join(lines) + "\n\n"
+
+
+class _Subscriber:
+    __slots__ = ("events", "wake", "overflowed")
+
+    def __init__(self):
+        self.events: Deque[Event] = deque()
+        self.wake = asyncio.Event()
+        self.overflowed = False
+
+
+class _Channel:
+    """Replay buffer and subscribers of one mission or campaign channel"""
+
+    __slots__ = ("token", "seq", "events", "subscribers", "idle_since")
+
+    def __init__(self, replay_size: int):
+        self.token = uuid.uuid4().hex[:12]  # Event ids from another buffer (restart, other worker) never match
+        self.seq = 0
+        self.events: Deque[Event] = deque(maxlen=replay_size)
+        self.subscribers: Set[_Subscriber] = set()
+        self.idle_since: Optional[float] = None
+
+    def event_id(self, seq: int) -> str:
+        return f"{self.token}-{seq}"
+
+
+class EventStreamHub:
+    """Server-Sent Events fed by the same frames as the WebSockets, resumable with Last-Event-ID.
+
+    A channel gets a replay buffer of its last `replay_size` frames once
+    someone subscribes to it, and keeps it for `retention` seconds after the
+    last subscriber leaves, so a reconnecting client is sent just the frames
+    it missed. Event ids are "<buffer token>-<sequence>". An id from a buffer
+    that no longer exists, or older than the buffer reaches, cannot be
+    resumed; the caller sends a current-state snapshot instead. A subscriber
+    that falls `queue_size` frames behind is disconnected and resumes the
+    same way.
+    """
+
+    def __init__(self, replay_size: Optional[int] = None, retention: Optional[float] = None, queue_size: Optional[int] = None):
+        self.replay_size = replay_size or int(os.getenv("SSE_REPLAY_SIZE", 100))
+        self.retention = retention or float(os.getenv("SSE_REPLAY_RETENTION", 300))
+        self.queue_size = queue_size or int(os.getenv("SSE_QUEUE_SIZE", 500))
+        self._channels: Dict[str, _Channel] = {}
+
+    def publish(self, message: Dict[str, Any], channel: str):
+        """Buffer a broadcast frame and queue it for the channel's subscribers (no-op for unwatched channels)"""
+        stream = self._channels.get(channel)
+        if stream is None:
+            return
+        stream.seq += 1
+        frame_type = message.get("type", "message")
+        event = (stream.seq, frame_type, format_event(stream.event_id(stream.seq), frame_type, dumps_text(message)))
+        stream.events.append(event)
+        for subscriber in list(stream.subscribers):
+            if len(subscriber.events) >= self.queue_size:
+                subscriber.overflowed = True
+                stream.subscribers.discard(subscriber)
+            else:
+                subscriber.events.append(event)
+            subscriber.wake.set()
+
+    def _sweep(self):
+        now = time.monotonic()
+        for channel, stream in list(self._channels.items()):
+            if not stream.subscribers and stream.idle_since is not None and now - stream.idle_since > self.retention:
+                del self._channels[channel]
+
+    def subscribe(self, channel: str, last_event_id: Optional[str] = None) -> Tuple[_Subscriber, Optional[List[Event]], str]:
+        """Register a subscriber.
+
+        Returns it, the frames after `last_event_id` (None when that id cannot
+        be resumed) and the id of the channel's latest frame, for a snapshot.
+        """
+        self._sweep()
+        stream = self._channels.get(channel)
+        if stream is None:
+            stream = self._channels[channel] = _Channel(self.replay_size)
+        subscriber = _Subscriber()
+        stream.subscribers.add(subscriber)
+        stream.idle_since = None
+        return subscriber, self._replay(stream, last_event_id), stream.event_id(stream.seq)
+
+    @staticmethod
+    def _replay(stream: _Channel, last_event_id: Optional[str]) -> Optional[List[Event]]:
+        token, _, seq = (last_event_id or "").rpartition("-")
+        if token != stream.token or not seq.isdigit() or int(seq) > stream.seq:
+            return None
+        oldest = stream.events[0][0] if stream.events else stream.seq + 1
+        if int(seq) < oldest - 1:
+            return None  # Part of what was missed is no longer buffered
+        return [event for event in stream.events if event[0] > int(seq)]
+
+    def unsubscribe(self, channel: str, subscriber: _Subscriber):
+        stream = self._channels.get(channel)
+        if stream is not None:
+            stream.subscribers.discard(subscriber)
+            if not stream.subscribers:
+                stream.idle_since = time.monotonic()
+
+    async def stream(
+        self,
+        channel: str,
+        subscriber: _Subscriber,
+        first: Iterable[Event],
+        end_types: Iterable[str],
+        live: bool = True,
+        heartbeat: Optional[float] = None
+    ) -> AsyncIterator[str]:
+        """SSE text for a subscriber: `first` (replay or snapshot), then live frames until one of `end_types`"""
+        heartbeat = heartbeat or float(os.getenv("SSE_HEARTBEAT_SECONDS", 15))
+        end_types = set(end_types)
+        try:
+            yield "retry: 3000\n\n"
+            for _, frame_type, event in first:
+                yield event
+                if frame_type in end_types:
+                    return
+            while live and not subscriber.overflowed:
+                if not subscriber.events:
+                    subscriber.wake.clear()
+                    try:
+                        await asyncio.wait_for(subscriber.wake.wait(), heartbeat)
+                    except asyncio.TimeoutError:
+                        yield ": keep-alive\n\n"
+                    continue
+                _, frame_type, event = subscriber.events.popleft()
+                yield event
+                if frame_type in end_types:
+                    return
+        finally:
+            self.unsubscribe(channel, subscriber)
+
+
+# Global instance
+event_streams = EventStreamHub()
@@ -0,0 +1,147 @@
+import asyncio
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+# Keep this module free of app imports: process-pool workers are spawned
+# fresh and import it (and whatever module a submitted function lives in).
+
+T = TypeVar("T")
+
+
+def parse_llm_json(text: str) -> Dict[str, Any]:
+    """The JSON object in an LLM response: the outermost {...}, else the whole text"""
+    json_start = text.find("{")
+    json_end = text.rfind("}") + 1
+    if json_start != -1 and json_end > json_start:
+        return json.loads(text[json_start:json_end])
+    return json.loads(text)
+
+
+class MissionExecutors:
+    """Executor layer that keeps CPU-bound and blocking work off the event loop.
+
+    `run_cpu` sends work to a process pool (`EXECUTOR_CPU_MODE=process`,
+    the default), a thread pool (`thread`) or runs it inline (`inline`).
+    Inputs smaller than `cpu_min_bytes` always run inline, because shipping
+    them to another process costs more than the work itself. `run_io` uses
+    a thread pool for blocking file and network calls. Both pools start on
+    first use.
+    """
+
+    def __init__(
+        self,
+        cpu_mode: Optional[str] = None,
+        process_workers: Optional[int] = None,
+        thread_workers: Optional[int] = None,
+        cpu_min_bytes: Optional[int] = None
+    ):
+        self.cpu_mode = (cpu_mode or os.getenv("EXECUTOR_CPU_MODE", "process")).lower()
+        self.process_workers = process_workers or int(os.getenv("EXECUTOR_PROCESS_WORKERS", min(4, os.cpu_count() or 1)))
+        self.thread_workers = thread_workers or int(os.getenv("EXECUTOR_THREAD_WORKERS", 8))
+        self.cpu_min_bytes = cpu_min_bytes if cpu_min_bytes is not None else int(os.getenv("EXECUTOR_CPU_MIN_BYTES", 16384))
+        self._cpu_pool: Optional[Executor] = None
+        self._io_pool: Optional[ThreadPoolExecutor] = None
+        self.stats: Dict[str, Dict[str, float]] = {
+            name: {"tasks": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0}
+            for name in ("cpu", "cpu_inline", "io")
+        }
+
+    def _cpu_executor(self) -> Optional[Executor]:
+        if self.cpu_mode == "inline":
+            return None
+        if self._cpu_pool is None:
+            if self.cpu_mode == "process":
+                # spawn, not fork: the parent has writer threads and a running loop
+                self._cpu_pool = ProcessPoolExecutor(self.process_workers, mp_context=multiprocessing.get_context("spawn"))
+            else:
+                self._cpu_pool = ThreadPoolExecutor(self.process_workers, thread_name_prefix="mission-cpu")
+        return self._cpu_pool
+
+    def _io_executor(self) -> ThreadPoolExecutor:
+        if self._io_pool is None:
+            self._io_pool = ThreadPoolExecutor(self.thread_workers, thread_name_prefix="mission-io")
+        return self._io_pool
+
+    def _record(self, name: str, started: float, failed: bool):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        entry = self.stats[name]
+        entry["tasks"] += 1
+        entry["errors"] += failed
+        entry["total_ms"] += elapsed_ms
+        entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+
+    async def run_cpu(self, fn: Callable[..., T], *args: Any, size: Optional[int] = None) -> T:
+        """Run CPU-bound fn(*args) off the loop. fn and args must be picklable in process mode.
+
+        `size` is the input size in bytes (defaults to the length of a str/bytes first arg);
+        small inputs run inline.
+        """
+        if size is None and args and isinstance(args[0], (str, bytes)):
+            size = len(args[0])
+        executor = self._cpu_executor()
+        inline = executor is None or (size is not None and size < self.cpu_min_bytes)
+        name = "cpu_inline" if inline else "cpu"
+        started = time.perf_counter()
+        try:
+            if inline:
+                result = fn(*args)
+            else:
+                try:
+                    result = await asyncio.get_running_loop().run_in_executor(executor, partial(fn, *args))
+                except BrokenProcessPool as e:
+                    # Workers could not start or died (e.g. a __main__ without an import guard):
+                    # keep serving from threads rather than failing every call
+                    print(f"CPU process pool broken, falling back to threads: {e}")
+                    self._cpu_pool.shutdown(wait=False)
+                    self._cpu_pool, self.cpu_mode = None, "thread"
+                    result = await asyncio.get_running_loop().run_in_executor(self._cpu_executor(), partial(fn, *args))
+        except Exception:
+            self._record(name, started, True)
+            raise
+        self._record(name, started, False)
+        return result
+
+    async def run_io(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run blocking fn(*args) on the I/O thread pool"""
+        started = time.perf_counter()
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self._io_executor(), partial(fn, *args))
+        except Exception:
+            self._record("io", started, True)
+            raise
+        self._record("io", started, False)
+        return result
+
+    def shutdown(self):
+        for pool in (self._cpu_pool, self._io_pool):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._cpu_pool = self._io_pool = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "cpu_mode": self.cpu_mode,
+            "process_workers": self.process_workers,
+            "thread_workers": self.thread_workers,
+            "cpu_min_bytes": self.cpu_min_bytes,
+            "pools_started": {"cpu": self._cpu_pool is not None, "io": self._io_pool is not None},
+            "tasks": {
+                name: {
+                    "tasks": int(entry["tasks"]),
+                    "errors": int(entry["errors"]),
+                    "avg_ms": round(entry["total_ms"] / entry["tasks"], 3) if entry["tasks"] else 0.0,
+                    "max_ms": round(entry["max_ms"], 3)
+                }
+                for name, entry in self.stats.items()
+            }
+        }
+
+
+# Global instance
+mission_executors = MissionExecutors()
@@ -0,0 +1,84 @@
+import json
+from typing import Any, AsyncIterator
+
+_WHITESPACE = " \t\n\r"
+_decoder = json.JSONDecoder()
+
+
+async def iter_json_array_items(chunks: AsyncIterator[str], key: str) -> AsyncIterator[Any]:
+    """Yield the elements of the array stored under `key` as they arrive on a text stream.
+
+    Only one element is held in memory at a time and the caller can stop early,
+    leaving the rest of the body unread and unparsed. The key is located by its
+    first textual occurrence, which suits responses like mars-photos where the
+    array is the first member of the top-level object (`{"photos": [...]}`).
+    """
+    buffer = ""
+    pos = 0
+    exhausted = False
+    needle = json.dumps(key)
+
+    async def fill() -> bool:
+        nonlocal buffer, pos, exhausted
+        if exhausted:
+            return False
+        try:
+            chunk = await chunks.__anext__()
+        except StopAsyncIteration:
+            exhausted = True
+            return False
+        # Drop what we've already consumed so the buffer stays about one element long
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    def skip(chars: str):
+        nonlocal pos
+        while pos < len(buffer) and buffer[pos] in chars:
+            pos += 1
+
+    # Seek to the opening bracket of the array
+    while True:
+        found = buffer.find(needle, pos)
+        if found != -1:
+            pos = found + len(needle)
+            break
+        # Keep a tail in case the key is split across chunks
+        pos = max(len(buffer) - len(needle), pos)
+        if not await fill():
+            return
+    for expected in (":", "["):
+        while True:
+            skip(_WHITESPACE)
+            if pos < len(buffer):
+                break
+            if not await fill():
+                raise ValueError(f"Unexpected end of JSON while looking for '{expected}' after {needle}")
+        if buffer[pos] != expected:
+            if expected == "[":
+                return  # Key present but not an array (e.g. null) - nothing to yield
+            raise ValueError(f"Expected '{expected}' after {needle}, got {buffer[pos]!r}")
+        pos += 1
+
+    # Decode one element at a time
+    while True:
+        while True:
+            skip(_WHITESPACE + ",")
+            if pos < len(buffer):
+                break
+            if not await fill():
+                raise ValueError("Unexpected end of JSON inside array")
+        if buffer[pos] == "]":
+            return
+        try:
+            item, end = _decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if not await fill():
+                raise
+            continue
+        # A number at the buffer's edge may be cut short ("-4.5" of "-4.5e3"), so only
+        # trust an element once the delimiter after it has arrived
+        if (end == len(buffer) or buffer[end] not in _WHITESPACE + ",]") and await fill():
+            continue
+        pos = end
+        yield item
@@ -0,0 +1,114 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from app.models.log_buffer import LogBuffer
+from app.models.schemas import AgentType, MissionLog
+from app.services.serialization import dumps
+
+LOG_PAGE_SIZE = 100  # Default page size of the JSON logs endpoint
+LOG_PAGE_MAX = 1000
+
+
+def _local_naive(value: Optional[datetime]) -> Optional[datetime]:
+    """Log timestamps are naive local time; bring an aware bound into the same frame"""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone().replace(tzinfo=None)
+    return value
+
+
+class LogFilter:
+    """Which of a mission's logs a query selects (None means no constraint)"""
+
+    __slots__ = ("agent_types", "levels", "since", "until")
+
+    def __init__(
+        self,
+        agent_types: Optional[Iterable[AgentType]] = None,
+        levels: Optional[Iterable[str]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ):
+        self.agent_types = set(agent_types) if agent_types else None
+        self.levels = set(levels) if levels else None
+        self.since = _local_naive(since)
+        self.until = _local_naive(until)
+
+    def matches(self, log: MissionLog) -> bool:
+        return (
+            (self.agent_types is None or log.agent_type in self.agent_types)
+            and (self.levels is None or log.level in self.levels)
+            and (self.since is None or log.timestamp >= self.since)
+        )
+
+
+def log_row(index: int, log: MissionLog) -> Dict[str, Any]:
+    """API shape of one log entry; `index` is its position, usable as a cursor"""
+    return {
+        "index": index,
+        "timestamp": log.timestamp.isoformat(),
+        "agent": log.agent_type.value,
+        "message": log.message,
+        "level": log.level,
+        "data": log.data
+    }
+
+
+def scan_logs(logs: LogBuffer, cursor: int, log_filter: LogFilter, limit: Optional[int] = None) -> Iterator[Tuple[int, MissionLog]]:
+    """Matching (index, log) pairs from `cursor` on, oldest first, up to `limit` matches.
+
+    Logs are appended in time order, so the scan stops at the first entry
+    past `until`. Reads spilled history from disk - run it off the loop.
+    """
+    if limit is not None and limit <= 0:
+        return
+    found = 0
+    for index, log in enumerate(logs.iter_page(max(cursor, 0)), start=max(cursor, 0)):
+        if log_filter.until is not None and log.timestamp > log_filter.until:
+            return
+        if log_filter.matches(log):
+            yield index, log
+            found += 1
+            if limit is not None and found >= limit:
+                return
+
+
+def read_log_page(logs: LogBuffer, cursor: int, log_filter: LogFilter, limit: int) -> Dict[str, Any]:
+    """One page of matching logs plus the cursor to continue from"""
+    total = len(logs)
+    rows = [log_row(index, log) for index, log in scan_logs(logs, cursor, log_filter, limit)]
+    if len(rows) == limit:
+        next_cursor = rows[-1]["index"] + 1
+    else:
+        # Scanned to the end (or past `until`): polling again from here picks up new entries
+        next_cursor = max(total, cursor, rows[-1]["index"] + 1 if rows else 0)
+    return {
+        "logs": rows,
+        "next_cursor": next_cursor,
+        "has_more": len(rows) == limit and next_cursor < total,
+        "total": total
+    }
+
+
+def iter_ndjson(logs: LogBuffer, cursor: int, log_filter: LogFilter, limit: Optional[int] = None) -> Iterator[bytes]:
+    """Matching logs as newline-delimited JSON, one entry per line"""
+    for index, log in scan_logs(logs, cursor, log_filter, limit):
+        yield dumps(log_row(index, log)) + b"\n"
+
+
+def encode_report(head: bytes, logs: LogBuffer, log_offset: int, log_limit: Optional[int]) -> bytes:
+    """A mission report: `head` (its JSON without logs) plus one page of logs and the log total.
+
+    Parses spilled logs, so it is CPU-bound for long missions and runs
+    through run_cpu; pass a frozen LogBuffer. This module keeps its imports
+    light for process-pool workers.
+    """
+    rows = [
+        {
+            "timestamp": log.timestamp.isoformat(),
+            "agent": log.agent_type.value,
+            "message": log.message,
+            "level": log.level
+        }
+        for log in logs.iter_page(log_offset, log_limit)
+    ]
+    return head[:-1] + b',"logs":' + dumps(rows) + b',"logs_total":' + str(len(logs)).encode("ascii") + b"}"
@@ -0,0 +1,67 @@
+import asyncio
+import os
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+
+class LoopLagMonitor:
+    """Measures event-loop responsiveness by how late a periodic timer fires.
+
+    Every `interval` seconds the monitor sleeps and records how much later
+    than requested it woke up. That delay is the time other callbacks held
+    the loop. The last `window` samples feed the percentiles in get_stats().
+    Any sample over `warn_ms` is counted and printed.
+    """
+
+    def __init__(self, interval: Optional[float] = None, warn_ms: Optional[float] = None, window: int = 600):
+        self.interval = interval if interval is not None else float(os.getenv("LOOP_LAG_INTERVAL", 0.5))
+        self.warn_ms = warn_ms if warn_ms is not None else float(os.getenv("LOOP_LAG_WARN_MS", 100))
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.max_ms = 0.0
+        self.warnings = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start sampling on the running loop (idempotent)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag_ms = max((time.perf_counter() - started - self.interval) * 1000, 0.0)
+            self.samples.append(lag_ms)
+            self.max_ms = max(self.max_ms, lag_ms)
+            if lag_ms >= self.warn_ms:
+                self.warnings += 1
+                print(f"⚠️  Event loop lag {lag_ms:.0f} ms")
+
+    def _percentile(self, ordered: list, fraction: float) -> float:
+        if not ordered:
+            return 0.0
+        return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+    def get_stats(self) -> Dict[str, Any]:
+        ordered = sorted(self.samples)
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "interval_ms": self.interval * 1000,
+            "samples": len(ordered),
+            "last_ms": round(self.samples[-1], 3) if self.samples else 0.0,
+            "p50_ms": round(self._percentile(ordered, 0.50), 3),
+            "p99_ms": round(self._percentile(ordered, 0.99), 3),
+            "max_ms": round(self.max_ms, 3),
+            "warn_ms": self.warn_ms,
+            "warnings": self.warnings
+        }
+
+
+# Global instance
+loop_monitor = LoopLagMonitor()
@@ -0,0 +1,118 @@
+import base64
+import heapq
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+IndexKey = Tuple[float, str]  # (created_at timestamp, mission_id): newest-first order, unique
+_MAX_ID = "\U0010ffff"
+
+
+def encode_cursor(key: IndexKey) -> str:
+    return base64.urlsafe_b64encode(f"{key[0]!r}|{key[1]}".encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> IndexKey:
+    """Raises ValueError for a cursor this index did not produce"""
+    try:
+        created, mission_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|", 1)
+        return float(created), mission_id
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+class MissionIndex:
+    """Secondary indexes for listing missions: creation order, overall and per status.
+
+    Each index is a list of (created_at, mission_id) kept sorted, so a created_at
+    range or a cursor is a bisect and a page walks only the entries it returns.
+    Status lists are moved between on every status transition. Goal substrings
+    are matched while walking the narrowed range, against casefolded goals kept
+    alongside. Covers resident and archived missions alike, without loading
+    either.
+    """
+
+    def __init__(self):
+        self._created: List[IndexKey] = []
+        self._by_status: Dict[str, List[IndexKey]] = {}
+        self._entries: Dict[str, Tuple[IndexKey, str, str]] = {}  # mission_id -> (key, status, casefolded goal)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, mission_id: object) -> bool:
+        return mission_id in self._entries
+
+    def add(self, mission_id: str, created_at: datetime, status: str, goal: str):
+        """Index a mission (re-indexes it if already present)"""
+        if mission_id in self._entries:
+            self.remove(mission_id)
+        key = (created_at.timestamp(), mission_id)
+        self._entries[mission_id] = (key, status, goal.casefold())
+        insort(self._created, key)  # Appends in practice: missions are created in time order
+        insort(self._by_status.setdefault(status, []), key)
+
+    def update_status(self, mission_id: str, status: str):
+        entry = self._entries.get(mission_id)
+        if entry is None or entry[1] == status:
+            return
+        key, old_status, goal = entry
+        self._discard(self._by_status.get(old_status, []), key)
+        insort(self._by_status.setdefault(status, []), key)
+        self._entries[mission_id] = (key, status, goal)
+
+    def remove(self, mission_id: str):
+        entry = self._entries.pop(mission_id, None)
+        if entry is not None:
+            key, status, _ = entry
+            self._discard(self._created, key)
+            self._discard(self._by_status.get(status, []), key)
+
+    @staticmethod
+    def _discard(keys: List[IndexKey], key: IndexKey):
+        position = bisect_left(keys, key)
+        if position < len(keys) and keys[position] == key:
+            del keys[position]
+
+    @staticmethod
+    def _newest_first(keys: List[IndexKey], low: IndexKey, high: IndexKey) -> Iterator[IndexKey]:
+        """keys in [low, high), newest first"""
+        start, stop = bisect_left(keys, low), bisect_left(keys, high)
+        for position in range(stop - 1, start - 1, -1):
+            yield keys[position]
+
+    def query(
+        self,
+        statuses: Optional[Iterable[str]] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        goal: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50
+    ) -> Tuple[List[str], Optional[str]]:
+        """Mission ids matching every given filter, newest first, and the cursor of the next page (None at the end).
+
+        created_after/created_before are inclusive bounds.
+        """
+        low: IndexKey = (created_after.timestamp(), "") if created_after else (float("-inf"), "")
+        high: IndexKey = (created_before.timestamp(), _MAX_ID) if created_before else (float("inf"), "")
+        if cursor:
+            high = min(high, decode_cursor(cursor))
+
+        if statuses is None:
+            walk = self._newest_first(self._created, low, high)
+        else:
+            lists = [self._by_status.get(status, []) for status in set(statuses)]
+            walk = heapq.merge(*(self._newest_first(keys, low, high) for keys in lists), reverse=True)
+
+        needle = goal.casefold() if goal else None
+        found: List[IndexKey] = []
+        for key in walk:
+            if needle is None or needle in self._entries[key[1]][2]:
+                if len(found) == limit:
+                    return [mission_id for _, mission_id in found], encode_cursor(found[-1])
+                found.append(key)
+        return [mission_id for _, mission_id in found], None
+
+    def count_by_status(self) -> Dict[str, int]:
+        return {status: len(keys) for status, keys in self._by_status.items() if keys}
@@ -1,8 +1,14 @@
-from typing import Dict, Optional, List
+from typing import Callable, Dict, Optional, List, Tuple
+import asyncio
+import json
+import os
+import time
 import uuid
 from datetime import datetime
 import random
 
+from app.models.internal import StepIndex
+from app.models.log_buffer import LogBuffer
 from app.models.schemas import (
     MissionState, 
     MissionStatus, 
@@ -12,11 +18,28 @@ from app.models.schemas import (
     AgentType,
     AgentStatus
 )
+from app.services.mission_index import MissionIndex
+from app.services.mission_stats import current_mission_id, mission_statistics
+from app.services.mission_store import MissionStore, summarize_mission
+from app.services.persistence import mission_persistence
+from app.services.serialization import RawJSON, dumps
+from app.services.shared_state import shared_state
 
 class MissionStateManager:
     def __init__(self):
-        self.missions: Dict[str, MissionState] = {}
+        self.missions: MissionStore = MissionStore()  # Finished missions are archived to disk
         self.grid_size = 10  # 10x10 grid
+        self.persistence = mission_persistence  # Write-behind, never blocks the graph loop
+        self.shared = shared_state  # Snapshots for other uvicorn workers (no-op when single-worker)
+        self.share_interval = float(os.getenv("SHARED_STATE_SYNC_INTERVAL", 0.25))
+        self._shared_at: Dict[str, float] = {}
+        self._shared_copies: Dict[str, Tuple[float, MissionState]] = {}  # Decoded snapshots of other workers' missions
+        self.index = MissionIndex()  # Listing by status / created_at / goal, updated on every status transition
+        self.stats = mission_statistics  # Aggregates for /api/stats, updated on every status transition
+        self.status_listeners: List[Callable[[str, str, str], None]] = []  # (mission_id, previous, status) on every transition
+        for mission_id, summary in self.missions.archived_summaries():
+            self.index.add(mission_id, datetime.fromisoformat(summary["created_at"]), summary["status"], summary["goal"])
+            self.stats.seed_archived(summary)
 
     def create_mission(self, goal: str, obstacles: Optional[List[RoverPosition]] = None) -> str:
         """Create a new mission and return mission_id"""
@@ -44,17 +67,78 @@ class MissionStateManager:
         )
         
         self.missions[mission_id] = mission_state
+        self.index.add(mission_id, mission_state.created_at, mission_state.status.value, goal)
+        self.stats.mission_created(mission_state.status.value)
+        self.share_mission(mission_id, force=True)
+        self.persistence.record_mission(mission_state)
+        self.persistence.record_status(mission_id, MissionStatus.PENDING, None, notes="Mission created")
         return mission_id
 
     def get_mission(self, mission_id: str) -> Optional[MissionState]:
         """Get mission state by ID"""
         return self.missions.get(mission_id)
 
+    async def find_mission(self, mission_id: str) -> Optional[MissionState]:
+        """Mission held by this worker, else the latest snapshot shared by another worker (read-only)"""
+        mission = self.missions.get(mission_id)
+        if mission is not None or not self.shared.shared or ":" in mission_id:
+            return mission  # Shared keys with a colon hold other snapshots (campaigns)
+        snapshot = await asyncio.to_thread(self.shared.get_mission, mission_id)
+        if snapshot is None:
+            return None
+        shared_at, payload = snapshot
+        cached = self._shared_copies.get(mission_id)
+        if cached is None or cached[0] != shared_at:
+            cached = (shared_at, self._decode_shared(payload))
+            self._shared_copies[mission_id] = cached
+        return cached[1]
+
+    @staticmethod
+    def _decode_shared(payload: str) -> MissionState:
+        data = json.loads(payload)
+        if "mission" not in data:
+            return MissionState.model_validate(data)  # Full snapshot from a worker running an older version
+        window = data["logs"]
+        logs = LogBuffer.borrow(window, [MissionLog.model_validate(log) for log in window["recent"]], item_type=MissionLog)
+        return MissionState.model_validate({**data["mission"], "logs": logs})
+
+    def share_mission(self, mission_id: str, force: bool = False):
+        """Publish a snapshot for other workers, at most once per share_interval unless forced.
+
+        The snapshot holds the mission without its history: just the in-memory
+        log window (cached JSON) and where the spilled segment is, which
+        readers open on demand. Its size stays bounded however long the
+        mission runs.
+        """
+        if not self.shared.shared or mission_id not in self.missions:
+            return
+        now = time.monotonic()
+        if not force and now - self._shared_at.get(mission_id, 0.0) < self.share_interval:
+            return
+        self._shared_at[mission_id] = now
+        mission = self.missions[mission_id]
+        logs = mission.logs
+        payload = dumps({
+            "mission": RawJSON(mission.model_dump_json(exclude={"logs"}).encode("utf-8")),
+            "logs": {**logs.segment_state(), "recent": [RawJSON(log) for log in logs.iter_json(len(logs) - logs.resident_count)]}
+        })
+        self.shared.put_mission(mission_id, mission.status.value, payload.decode("utf-8"))
+
     def update_mission_status(self, mission_id: str, status: MissionStatus):
         """Update mission status"""
         if mission_id in self.missions:
-            self.missions[mission_id].status = status
-            self.missions[mission_id].updated_at = datetime.now()
+            mission = self.missions[mission_id]
+            previous_status = mission.status
+            mission.status = status
+            mission.updated_at = datetime.now()
+            if status != previous_status:
+                self.index.update_status(mission_id, status.value)
+                self.stats.status_changed(mission_id, previous_status.value, status.value, mission.created_at, mission.counters.completed_steps)
+                for listener in self.status_listeners:
+                    listener(mission_id, previous_status.value, status.value)
+                self.persistence.record_status(mission_id, status, previous_status)
+                self.persistence.record_mission(mission)
+                self.share_mission(mission_id, force=True)
 
     def update_rover_position(self, mission_id: str, position: RoverPosition):
         """Update rover position"""
@@ -62,29 +146,135 @@ class MissionStateManager:
             self.missions[mission_id].rover_position = position
             self.missions[mission_id].updated_at = datetime.now()
 
+    def restore_mission(self, mission: MissionState):
+        """Put a mission loaded from a checkpoint back under management"""
+        # The checkpointed log segment may have grown past the checkpoint; continue on a copy cut at it
+        mission.logs.fork_segment()
+        self.missions[mission.mission_id] = mission
+        mission.updated_at = datetime.now()
+        if mission.mission_id not in self.index:
+            self.stats.mission_created(mission.status.value)
+        self.index.add(mission.mission_id, mission.created_at, mission.status.value, mission.goal)
+        self.share_mission(mission.mission_id, force=True)
+    
     def add_step(self, mission_id: str, step: MissionStep):
         """Add a mission step"""
         if mission_id in self.missions:
-            self.missions[mission_id].steps.append(step)
-            self.missions[mission_id].updated_at = datetime.now()
+            mission = self.missions[mission_id]
+            index = self._step_index(mission)  # Before the append, or a fresh index would already hold the step
+            mission.steps.append(step)
+            index.added(mission.steps, step)
+            if step.completed:
+                mission.counters.completed_steps += 1
+            mission.updated_at = datetime.now()
+            self.persistence.record_step(mission_id, step)
 
     def update_step(self, mission_id: str, step_number: int, completed: bool = True, nasa_image_url: Optional[str] = None):
         """Update a mission step"""
         if mission_id in self.missions:
-            for step in self.missions[mission_id].steps:
-                if step.step_number == step_number:
+            mission = self.missions[mission_id]
+            index = self._step_index(mission)
+            position = index.position_of(step_number)
+            if position is not None:
+                step = mission.steps[position]
+                if step.completed != completed:
+                    mission.counters.completed_steps += 1 if completed else -1
                     step.completed = completed
-                    if nasa_image_url:
-                        step.nasa_image_url = nasa_image_url
-                    break
-            self.missions[mission_id].updated_at = datetime.now()
+                    index.completion_changed(mission.steps, position)
+                if nasa_image_url:
+                    step.nasa_image_url = nasa_image_url
+                self.persistence.record_step(mission_id, step)
+            mission.updated_at = datetime.now()
 
     def add_log(self, mission_id: str, log: MissionLog):
         """Add a log entry"""
         if mission_id in self.missions:
-            self.missions[mission_id].logs.append(log)
+            mission = self.missions[mission_id]
+            mission.logs.append(log)
+            mission.counters.last_message[log.agent_type] = log.message
+            mission.updated_at = datetime.now()
+            self.persistence.record_log(log)
+
+    def clear_steps(self, mission_id: str):
+        """Remove all steps (before storing a new plan)"""
+        if mission_id in self.missions:
+            self.missions[mission_id].steps = []
+            self.missions[mission_id]._step_index = None
+            self.missions[mission_id].counters.completed_steps = 0
             self.missions[mission_id].updated_at = datetime.now()
 
+    def record_safety_check(self, mission_id: str, step_number: Optional[int], approved: bool, reason: str = ""):
+        """Count a safety validation result; rejections are classified once, here, by their reason"""
+        mission = self.missions.get(mission_id)
+        if not mission:
+            return
+        counters = mission.counters
+        if approved:
+            counters.safety_approvals += 1
+            counters.consecutive_rejections = 0
+            counters.consecutive_obstacle_hits = 0
+            counters.consecutive_risk_rejections = 0
+            return
+        reason = reason.lower()
+        counters.safety_rejections += 1
+        counters.consecutive_rejections += 1
+        if step_number is not None:
+            counters.rejections_by_step[step_number] = counters.rejections_by_step.get(step_number, 0) + 1
+        if "obstacle detected" in reason:
+            counters.obstacle_hits += 1
+            counters.consecutive_obstacle_hits += 1
+        if "adjacent to" in reason or "at risk" in reason:
+            counters.risk_rejections += 1
+            counters.consecutive_risk_rejections += 1
+
+    def record_stall(self, mission_id: str, stalled: bool):
+        """Count a position update that did (or did not) leave the rover stuck short of its target"""
+        mission = self.missions.get(mission_id)
+        if mission:
+            mission.counters.consecutive_stalls = mission.counters.consecutive_stalls + 1 if stalled else 0
+
+    def record_blocking_event(self, mission_id: str):
+        """Count an obstacle block that ends or aborts the mission"""
+        mission = self.missions.get(mission_id)
+        if mission:
+            mission.counters.blocking_events += 1
+
+    def all_steps_completed(self, mission_id: str) -> bool:
+        """True if the mission has steps and every one is complete (O(1) via counters)"""
+        mission = self.missions.get(mission_id)
+        return bool(mission and mission.steps and mission.counters.completed_steps == len(mission.steps))
+
+    def _step_index(self, mission: MissionState) -> StepIndex:
+        """The mission's step index, rebuilt from steps if missing (new or reloaded mission)"""
+        if mission._step_index is None:
+            mission._step_index = StepIndex(mission.steps)
+        return mission._step_index
+
+    def get_step(self, mission_id: str, step_number: int) -> Optional[MissionStep]:
+        """Look up a step by step_number"""
+        position = self.step_position(mission_id, step_number)
+        return self.missions[mission_id].steps[position] if position is not None else None
+
+    def step_position(self, mission_id: str, step_number: int) -> Optional[int]:
+        """List index of a step by step_number"""
+        if mission_id not in self.missions:
+            return None
+        return self._step_index(self.missions[mission_id]).position_of(step_number)
+
+    def first_incomplete_step(self, mission_id: str) -> Optional[int]:
+        """List index of the first incomplete step (None if all are complete)"""
+        if mission_id not in self.missions:
+            return None
+        mission = self.missions[mission_id]
+        position = self._step_index(mission).first_incomplete
+        return position if position < len(mission.steps) else None
+
+    def return_step_positions(self, mission_id: str) -> List[int]:
+        """List indexes of the mission's return steps, in plan order"""
+        if mission_id not in self.missions:
+            return []
+        return self._step_index(self.missions[mission_id]).return_positions
+
     def update_agent_status(self, mission_id: str, agent_type: AgentType, status: AgentStatus):
         """Update agent status"""
         if mission_id in self.missions:
@@ -110,6 +300,18 @@ class MissionStateManager:
             self.missions[mission_id].weather_data = weather_data
             self.missions[mission_id].updated_at = datetime.now()
 
+    def set_apod_data(self, mission_id: str, apod_data: dict):
+        """Set Astronomy Picture of the Day for mission report"""
+        if mission_id in self.missions:
+            self.missions[mission_id].apod_data = apod_data
+            self.missions[mission_id].updated_at = datetime.now()
+
+    def set_report_photos(self, mission_id: str, photos: List[dict]):
+        """Set the rover photos shown in the mission report"""
+        if mission_id in self.missions:
+            self.missions[mission_id].report_photos = photos
+            self.missions[mission_id].updated_at = datetime.now()
+
     def set_goal_positions(self, mission_id: str, positions: List[RoverPosition]):
         """Set goal positions for mission"""
         if mission_id in self.missions:
@@ -175,28 +377,61 @@ class MissionStateManager:
         
         return obstacles
 
-    def get_mission_summary(self, mission_id: str) -> Optional[dict]:
-        """Get mission summary"""
-        mission = self.missions.get(mission_id)
+    def get_mission_summary(self, mission_id: str, mission: Optional[MissionState] = None) -> Optional[dict]:
+        """Get mission summary (of `mission` when given, e.g. a snapshot shared by another worker)"""
+        archived = self.missions.get_summary(mission_id) if mission is None else None
+        if archived:
+            # Archived missions answer from their summary without being loaded back
+            return {k: v for k, v in archived.items() if k not in ("created_at", "updated_at", "archived_at", "bytes")}
+
+        mission = mission or self.missions.get(mission_id)
         if not mission:
             return None
-        
-        completed_steps = sum(1 for step in mission.steps if step.completed)
-        
-        return {
-            "mission_id": mission_id,
-            "goal": mission.goal,
-            "status": mission.status.value,
-            "current_step": mission.current_step,
-            "total_steps": len(mission.steps),
-            "completed_steps": completed_steps,
-            "rover_position": {
-                "x": mission.rover_position.x,
-                "y": mission.rover_position.y
-            },
-            "logs_count": len(mission.logs),
-            "images_count": len(mission.nasa_images)
-        }
+
+        return {k: v for k, v in summarize_mission(mission).items() if k not in ("created_at", "updated_at")}
+
+    def record_llm_call(self, prompt_tokens: int, completion_tokens: int, failed: bool = False):
+        """Count an LLM call against the mission the calling task runs (see current_mission_id)"""
+        self.stats.llm_call(prompt_tokens, completion_tokens, failed)
+        mission_id = current_mission_id.get()
+        mission = self.missions.get(mission_id) if mission_id else None
+        if mission:
+            mission.counters.llm_calls += 1
+            mission.counters.llm_errors += failed
+            mission.counters.llm_prompt_tokens += prompt_tokens
+            mission.counters.llm_completion_tokens += completion_tokens
+
+    def list_missions(
+        self,
+        statuses: Optional[List[MissionStatus]] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        goal: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50
+    ) -> Tuple[List[dict], Optional[str]]:
+        """One page of mission summaries, newest first, and the next page's cursor.
+
+        Served from the secondary indexes and stored summaries - no mission is
+        loaded back from the archive. Raises ValueError for a bad cursor.
+        """
+        mission_ids, next_cursor = self.index.query(
+            [status.value for status in statuses] if statuses else None,
+            created_after, created_before, goal, cursor, limit
+        )
+        summaries = []
+        for mission_id in mission_ids:
+            summary = self.missions.peek_summary(mission_id)
+            if summary:
+                summaries.append({k: v for k, v in summary.items() if k not in ("archived_at", "bytes")})
+        return summaries, next_cursor
+
+    def get_store_stats(self) -> dict:
+        """Mission store gauges (resident missions, bytes, evictions) and shared-state counters"""
+        stats = self.missions.get_stats()
+        stats["shared_state"] = self.shared.get_stats()
+        stats["by_status"] = self.index.count_by_status()
+        return stats
 
 # Global instance
 mission_state_manager = MissionStateManager()
@@ -0,0 +1,136 @@
+import asyncio
+import os
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.models.schemas import TERMINAL_STATUSES, MissionStatus
+
+# Mission the running task works for, so deep callers (LLM calls) can attribute usage to it
+current_mission_id: ContextVar[Optional[str]] = ContextVar("current_mission_id", default=None)
+
+# Upper bounds (seconds) of the mission duration histogram buckets
+DURATION_BUCKETS = (10, 30, 60, 120, 300, 600, 1800, 3600)
+
+
+class MissionStatistics:
+    """Aggregate mission statistics, kept as counters so reading them never scans missions.
+
+    The state manager reports every mission it creates and every status
+    transition; when a mission reaches a terminal status its steps and
+    duration are added in. LLM calls and tokens are counted as agents make
+    them. At startup the counters are rebuilt in one pass over the archived
+    missions' summaries. `run()` writes the `mission_statistics` row through
+    the persistence layer whenever the counters have changed.
+    """
+
+    def __init__(self):
+        self.total_missions = 0
+        self.by_status: Dict[str, int] = {status.value: 0 for status in MissionStatus}
+        self.finished: Dict[str, int] = {status.value: 0 for status in TERMINAL_STATUSES}
+        self.steps_executed = 0
+        self.total_duration = 0.0
+        self.max_duration = 0.0
+        self.duration_histogram: List[int] = [0] * (len(DURATION_BUCKETS) + 1)  # Last bucket: over the largest bound
+        self.llm_calls = 0
+        self.llm_errors = 0
+        self.llm_prompt_tokens = 0
+        self.llm_completion_tokens = 0
+        self.last_mission_id: Optional[str] = None
+        self.last_mission_at: Optional[datetime] = None
+        self._dirty = False
+
+    def mission_created(self, status: str):
+        self.total_missions += 1
+        self.by_status[status] = self.by_status.get(status, 0) + 1
+        self._dirty = True
+
+    def status_changed(self, mission_id: str, previous: str, status: str, created_at: datetime, completed_steps: int):
+        self.by_status[previous] = max(self.by_status.get(previous, 0) - 1, 0)
+        self.by_status[status] = self.by_status.get(status, 0) + 1
+        if status in self.finished and previous not in self.finished:
+            now = datetime.now()
+            self._mission_finished(status, (now - created_at).total_seconds(), completed_steps)
+            self.last_mission_id, self.last_mission_at = mission_id, now
+        self._dirty = True
+
+    def _mission_finished(self, status: str, duration: float, completed_steps: int):
+        self.finished[status] += 1
+        self.steps_executed += completed_steps
+        self.total_duration += duration
+        self.max_duration = max(self.max_duration, duration)
+        bucket = next((i for i, bound in enumerate(DURATION_BUCKETS) if duration <= bound), len(DURATION_BUCKETS))
+        self.duration_histogram[bucket] += 1
+
+    def seed_archived(self, summary: Dict[str, Any]):
+        """Count a mission known only from its archive summary (startup)"""
+        status = summary["status"]
+        self.mission_created(status)
+        if status in self.finished:
+            duration = (datetime.fromisoformat(summary["updated_at"]) - datetime.fromisoformat(summary["created_at"])).total_seconds()
+            self._mission_finished(status, duration, summary.get("completed_steps", 0))
+        self.llm_calls += summary.get("llm_calls", 0)
+        self.llm_prompt_tokens += summary.get("llm_prompt_tokens", 0)
+        self.llm_completion_tokens += summary.get("llm_completion_tokens", 0)
+
+    def llm_call(self, prompt_tokens: int, completion_tokens: int, failed: bool = False):
+        self.llm_calls += 1
+        self.llm_errors += failed
+        self.llm_prompt_tokens += prompt_tokens
+        self.llm_completion_tokens += completion_tokens
+        self._dirty = True
+
+    def get_stats(self) -> Dict[str, Any]:
+        done = sum(self.finished.values())
+        labels = [f"{bound}s" for bound in DURATION_BUCKETS] + [f">{DURATION_BUCKETS[-1]}s"]
+        return {
+            "total_missions": self.total_missions,
+            "by_status": {status: count for status, count in self.by_status.items() if count},
+            "finished": dict(self.finished),
+            "steps_executed": self.steps_executed,
+            "duration_seconds": {
+                "total": round(self.total_duration, 3),
+                "average": round(self.total_duration / done, 3) if done else 0.0,
+                "max": round(self.max_duration, 3),
+                "histogram": dict(zip(labels, self.duration_histogram))
+            },
+            "llm": {
+                "calls": self.llm_calls,
+                "errors": self.llm_errors,
+                "prompt_tokens": self.llm_prompt_tokens,
+                "completion_tokens": self.llm_completion_tokens,
+                "calls_per_mission": round(self.llm_calls / self.total_missions, 3) if self.total_missions else 0.0,
+                "tokens_per_mission": round((self.llm_prompt_tokens + self.llm_completion_tokens) / self.total_missions, 1) if self.total_missions else 0.0
+            },
+            "last_mission_id": self.last_mission_id,
+            "last_mission_at": self.last_mission_at.isoformat() if self.last_mission_at else None
+        }
+
+    def flush(self, persistence):
+        """Queue the mission_statistics row if anything changed since the last flush"""
+        if not self._dirty:
+            return
+        self._dirty = False
+        done = sum(self.finished.values())
+        persistence.record_statistics(
+            self.total_missions,
+            self.finished[MissionStatus.COMPLETE.value],
+            self.finished[MissionStatus.ABORTED.value],
+            self.finished[MissionStatus.ERROR.value],
+            self.steps_executed,
+            self.total_duration,
+            self.total_duration / done if done else 0.0,
+            self.last_mission_id,
+            self.last_mission_at
+        )
+
+    async def run(self, persistence, interval: Optional[float] = None):
+        """Flush to the persistence layer every `interval` seconds until cancelled"""
+        interval = interval or float(os.getenv("MISSION_STATS_FLUSH_INTERVAL", 30))
+        while True:
+            await asyncio.sleep(interval)
+            self.flush(persistence)
+
+
+# Global instance
+mission_statistics = MissionStatistics()
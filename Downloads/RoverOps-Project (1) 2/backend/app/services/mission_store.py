@@ -0,0 +1,266 @@
+import asyncio
+import gzip
+import json
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, MutableMapping, Optional, Tuple
+
+from app.models.schemas import TERMINAL_STATUSES, MissionState
+from app.services.serialization import encode_mission
+
+DEFAULT_ARCHIVE_DIR = Path(__file__).resolve().parents[2] / ".cache" / "missions"
+INDEX_FILE = "index.json"
+
+
+def summarize_mission(mission: MissionState) -> Dict[str, Any]:
+    """Compact summary of a mission - what listings need without the logs and steps"""
+    return {
+        "mission_id": mission.mission_id,
+        "goal": mission.goal,
+        "status": mission.status.value,
+        "current_step": mission.current_step,
+        "total_steps": len(mission.steps),
+        "completed_steps": mission.counters.completed_steps,
+        "rover_position": {"x": mission.rover_position.x, "y": mission.rover_position.y},
+        "logs_count": len(mission.logs),
+        "images_count": len(mission.nasa_images),
+        "llm_calls": mission.counters.llm_calls,
+        "llm_prompt_tokens": mission.counters.llm_prompt_tokens,
+        "llm_completion_tokens": mission.counters.llm_completion_tokens,
+        "created_at": mission.created_at.isoformat(),
+        "updated_at": mission.updated_at.isoformat()
+    }
+
+
+class MissionStore(MutableMapping[str, MissionState]):
+    """Tiered mission storage: active missions in memory, finished ones on disk.
+
+    Behaves like the plain dict it replaces. Terminal missions that have been
+    idle longer than `idle_seconds`, or that fall outside the `max_resident`
+    LRU budget, are written to `<archive_dir>/<mission_id>.json.gz` by
+    `sweep()` and dropped from memory, keeping only a compact summary.
+    Looking an archived mission up loads it back transparently.
+    """
+
+    def __init__(
+        self,
+        archive_dir: Optional[str] = None,
+        idle_seconds: Optional[float] = None,
+        max_resident: Optional[int] = None,
+        enabled: Optional[bool] = None
+    ):
+        self.archive_dir = Path(archive_dir or os.getenv("MISSION_ARCHIVE_DIR") or DEFAULT_ARCHIVE_DIR)
+        self.idle_seconds = idle_seconds if idle_seconds is not None else float(os.getenv("MISSION_EVICT_IDLE_SECONDS", 600))
+        self.max_resident = max_resident if max_resident is not None else int(os.getenv("MISSION_MAX_RESIDENT", 200))
+        if enabled is None:
+            enabled = os.getenv("MISSION_ARCHIVE_ENABLED", "true").lower() in ("1", "true", "yes")
+        self.enabled = enabled
+
+        self._resident: "OrderedDict[str, MissionState]" = OrderedDict()  # Oldest access first
+        self._last_access: Dict[str, float] = {}
+        self._archived: Dict[str, Dict[str, Any]] = {}  # mission_id -> summary of the on-disk copy
+        self._sizes: Dict[str, Tuple[datetime, int]] = {}  # mission_id -> (updated_at, serialized bytes without the logs)
+        self.evictions = 0
+        self.rehydrations = 0
+
+        if self.enabled:
+            try:
+                self.archive_dir.mkdir(parents=True, exist_ok=True)
+                self._load_index()
+            except Exception as e:
+                print(f"Mission archive disabled: {e}")
+                self.enabled = False
+
+    # ------------------------------------------------------------------
+    # Mapping interface
+    # ------------------------------------------------------------------
+
+    def __getitem__(self, mission_id: str) -> MissionState:
+        mission = self._resident.get(mission_id)
+        if mission is None:
+            if mission_id not in self._archived:
+                raise KeyError(mission_id)
+            mission = self._rehydrate(mission_id)
+        self._resident.move_to_end(mission_id)
+        self._last_access[mission_id] = time.monotonic()
+        return mission
+
+    def __setitem__(self, mission_id: str, mission: MissionState):
+        self._resident[mission_id] = mission
+        self._resident.move_to_end(mission_id)
+        self._last_access[mission_id] = time.monotonic()
+
+    def __delitem__(self, mission_id: str):
+        mission = self._resident.pop(mission_id, None)
+        found = mission is not None
+        if mission is not None:
+            mission.logs.discard_segment()
+        self._last_access.pop(mission_id, None)
+        self._sizes.pop(mission_id, None)
+        if self._archived.pop(mission_id, None) is not None:
+            found = True
+            self._archive_path(mission_id).unlink(missing_ok=True)
+            self._write_index()
+        if not found:
+            raise KeyError(mission_id)
+
+    def __contains__(self, mission_id: object) -> bool:
+        return mission_id in self._resident or mission_id in self._archived
+
+    def __iter__(self) -> Iterator[str]:
+        yield from list(self._resident)
+        yield from [mid for mid in list(self._archived) if mid not in self._resident]
+
+    def __len__(self) -> int:
+        return len(self._resident) + sum(1 for mid in self._archived if mid not in self._resident)
+
+    # ------------------------------------------------------------------
+    # Tiering
+    # ------------------------------------------------------------------
+
+    def is_resident(self, mission_id: str) -> bool:
+        return mission_id in self._resident
+
+    def resident_missions(self) -> List[MissionState]:
+        """Missions currently in memory (without loading archived ones)"""
+        return list(self._resident.values())
+
+    def get_summary(self, mission_id: str) -> Optional[Dict[str, Any]]:
+        """Summary of an archived, non-resident mission without loading it (None otherwise)"""
+        if mission_id in self._resident:
+            return None
+        return self._archived.get(mission_id)
+
+    def peek_summary(self, mission_id: str) -> Optional[Dict[str, Any]]:
+        """Summary of any mission, without loading it or refreshing its LRU position"""
+        mission = self._resident.get(mission_id)
+        if mission is not None:
+            return summarize_mission(mission)
+        return self._archived.get(mission_id)
+
+    def archived_summaries(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """(mission_id, summary) of every mission archived on disk"""
+        return iter(list(self._archived.items()))
+
+    def _archive_path(self, mission_id: str) -> Path:
+        return self.archive_dir / f"{mission_id}.json.gz"
+
+    def _load_index(self):
+        path = self.archive_dir / INDEX_FILE
+        if path.exists():
+            with open(path) as f:
+                self._archived = json.load(f)
+
+    def _write_index(self):
+        tmp = self.archive_dir / (INDEX_FILE + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(self._archived, f)
+        os.replace(tmp, self.archive_dir / INDEX_FILE)
+
+    def _write_archive(self, mission_id: str, mission: MissionState) -> int:
+        data = gzip.compress(encode_mission(mission), compresslevel=6)
+        tmp = self._archive_path(mission_id).with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, self._archive_path(mission_id))
+        return len(data)
+
+    def _rehydrate(self, mission_id: str) -> MissionState:
+        with gzip.open(self._archive_path(mission_id), "rb") as f:
+            mission = MissionState.model_validate_json(f.read())
+        self._resident[mission_id] = mission
+        self.rehydrations += 1
+        return mission
+
+    def _is_clean(self, mission_id: str, mission: MissionState) -> bool:
+        """True if the on-disk copy is already up to date (rehydrated and not modified since)"""
+        summary = self._archived.get(mission_id)
+        return summary is not None and summary["updated_at"] == mission.updated_at.isoformat()
+
+    def eviction_candidates(self) -> List[str]:
+        """Terminal missions past the idle timeout, then the least recently used over budget"""
+        now = time.monotonic()
+        terminal = [mid for mid, mission in self._resident.items() if mission.status in TERMINAL_STATUSES]
+        candidates = [mid for mid in terminal if now - self._last_access.get(mid, now) >= self.idle_seconds]
+        overflow = len(self._resident) - len(candidates) - self.max_resident
+        if overflow > 0:
+            chosen = set(candidates)
+            # _resident is in access order, so this walks least recently used first
+            candidates.extend([mid for mid in terminal if mid not in chosen][:overflow])
+        return candidates
+
+    async def sweep(self) -> int:
+        """Archive eviction candidates to disk and drop them from memory; returns how many were evicted"""
+        if not self.enabled:
+            return 0
+        evicted = 0
+        for mission_id in self.eviction_candidates():
+            mission = self._resident.get(mission_id)
+            if mission is None:
+                continue
+            if not self._is_clean(mission_id, mission):
+                # Encode and write off the loop (the log history is read back from disk); the mission
+                # is finished, and if it changes meanwhile it stays resident
+                snapshot_at = mission.updated_at
+                summary = summarize_mission(mission)
+                try:
+                    summary["bytes"] = await asyncio.to_thread(self._write_archive, mission_id, mission)
+                except Exception as e:
+                    print(f"Error archiving mission {mission_id}: {e}")
+                    continue
+                summary["archived_at"] = datetime.now().isoformat()
+                self._archived[mission_id] = summary
+                if self._resident.get(mission_id) is not mission or mission.updated_at != snapshot_at:
+                    continue
+            del self._resident[mission_id]
+            mission.logs.discard_segment()  # The archive now holds the full log history
+            self._last_access.pop(mission_id, None)
+            self._sizes.pop(mission_id, None)
+            self.evictions += 1
+            evicted += 1
+        if evicted:
+            await asyncio.to_thread(self._write_index)
+        return evicted
+
+    async def run(self, interval: float = 30.0):
+        """Periodically sweep until cancelled"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.sweep()
+            except Exception as e:
+                print(f"Error sweeping mission store: {e}")
+
+    def resident_bytes(self) -> int:
+        """Approximate serialized size of resident missions.
+
+        The log history's size is kept by each LogBuffer as entries are
+        appended; only the rest of the mission (small) is re-measured, and
+        only when the mission changed.
+        """
+        total = 0
+        for mission_id, mission in self._resident.items():
+            cached = self._sizes.get(mission_id)
+            if cached is None or cached[0] != mission.updated_at:
+                cached = (mission.updated_at, len(mission.model_dump_json(exclude={"logs"})))
+                self._sizes[mission_id] = cached
+            total += cached[1] + mission.logs.json_size
+        return total
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Resident-mission and bytes gauges"""
+        return {
+            "archive_enabled": self.enabled,
+            "resident_missions": len(self._resident),
+            "active_missions": sum(1 for m in self._resident.values() if m.status not in TERMINAL_STATUSES),
+            "archived_missions": len(self._archived),
+            "resident_bytes": self.resident_bytes(),
+            "archived_bytes": sum(s.get("bytes", 0) for s in self._archived.values()),
+            "evictions": self.evictions,
+            "rehydrations": self.rehydrations,
+            "idle_seconds": self.idle_seconds,
+            "max_resident": self.max_resident
+        }
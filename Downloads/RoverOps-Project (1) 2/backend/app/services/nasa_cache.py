@@ -0,0 +1,231 @@
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+# Optional: Pillow lets us store real thumbnails instead of full-size originals
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - optional dependency
+    Image = None
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / ".cache" / "nasa"
+
+# Params that never change the response and must not end up in cache keys
+_IGNORED_PARAMS = {"api_key"}
+
+
+class NASAAssetCache:
+    """Persistent, content-addressed store for NASA API responses and rover images.
+
+    Responses are keyed by a hash of (endpoint, params) and point at a body blob
+    keyed by the SHA-256 of its content, so identical payloads are stored once.
+    Every entry carries `fetched_at` and `ttl` so callers can decide whether a
+    hit is fresh or only good enough as a stale-on-error fallback.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        enabled: Optional[bool] = None,
+        image_cache: Optional[bool] = None,
+        thumbnail_size: int = 320
+    ):
+        self.cache_dir = Path(cache_dir or os.getenv("NASA_CACHE_DIR") or DEFAULT_CACHE_DIR)
+        if enabled is None:
+            enabled = os.getenv("NASA_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+        if image_cache is None:
+            image_cache = os.getenv("NASA_IMAGE_CACHE", "false").lower() in ("1", "true", "yes")
+        self.enabled = enabled
+        self.image_cache_enabled = enabled and image_cache
+        self.thumbnail_size = thumbnail_size
+        self.images_dir = self.cache_dir / "images"
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        if self.enabled:
+            try:
+                self._open()
+            except Exception as e:
+                print(f"NASA cache disabled, could not open {self.cache_dir}: {e}")
+                self.enabled = False
+                self.image_cache_enabled = False
+
+    def _open(self):
+        """Open (and create if needed) the SQLite store"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.cache_dir / "nasa_cache.sqlite3"),
+            check_same_thread=False,
+            isolation_level=None  # autocommit; multi-statement writes use explicit BEGIN/COMMIT
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS blobs (
+                digest TEXT PRIMARY KEY,
+                body BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS responses (
+                cache_key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                params TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                ttl REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS images (
+                url TEXT PRIMARY KEY,
+                digest TEXT NOT NULL,
+                content_type TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            );
+        """)
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Build a stable cache key from endpoint and request params (api_key excluded)"""
+        canonical = {k: v for k, v in (params or {}).items() if k not in _IGNORED_PARAMS}
+        raw = json.dumps([endpoint, canonical], sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get_entry(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Optional[Tuple[Any, float, float]]:
+        """Return (payload, fetched_at, ttl) regardless of freshness, or None on miss"""
+        if not self.enabled:
+            return None
+        key = self.make_key(endpoint, params)
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT b.body, r.fetched_at, r.ttl FROM responses r "
+                    "JOIN blobs b ON b.digest = r.digest WHERE r.cache_key = ?",
+                    (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"NASA cache read failed: {e}")
+            return None
+        if not row:
+            return None
+        body, fetched_at, ttl = row
+        return json.loads(body), fetched_at, ttl
+
+    def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None, allow_stale: bool = False) -> Optional[Any]:
+        """Return the cached payload if fresh (or if allow_stale), otherwise None"""
+        entry = self.get_entry(endpoint, params)
+        if entry is None:
+            return None
+        payload, fetched_at, ttl = entry
+        if allow_stale or time.time() - fetched_at <= ttl:
+            return payload
+        return None
+
+    def put(self, endpoint: str, params: Optional[Dict[str, Any]], payload: Any, ttl: float):
+        """Store a payload under its request key; the body is deduplicated by content hash"""
+        if not self.enabled:
+            return
+        body = json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()
+        key = self.make_key(endpoint, params)
+        canonical = {k: v for k, v in (params or {}).items() if k not in _IGNORED_PARAMS}
+        try:
+            with self._lock:
+                self._conn.execute("BEGIN")
+                self._conn.execute("INSERT OR IGNORE INTO blobs (digest, body) VALUES (?, ?)", (digest, body))
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (cache_key, endpoint, params, digest, fetched_at, ttl) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, endpoint, json.dumps(canonical, sort_keys=True, default=str), digest, time.time(), ttl)
+                )
+                self._conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            print(f"NASA cache write failed: {e}")
+            try:
+                self._conn.execute("ROLLBACK")
+            except sqlite3.Error:
+                pass
+
+    def local_image_digest(self, url: str) -> Optional[str]:
+        """Return the digest of a locally cached image for this URL, if any"""
+        if not self.image_cache_enabled or not url:
+            return None
+        try:
+            with self._lock:
+                row = self._conn.execute("SELECT digest FROM images WHERE url = ?", (url,)).fetchone()
+        except sqlite3.Error:
+            return None
+        return row[0] if row else None
+
+    def image_path(self, digest: str) -> Optional[Tuple[Path, str]]:
+        """Resolve a cached image digest to (file path, content type)"""
+        if not self.image_cache_enabled or not digest.isalnum():
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content_type FROM images WHERE digest = ? LIMIT 1", (digest,)
+            ).fetchone()
+        path = self.images_dir / digest[:2] / digest
+        if not row or not path.exists():
+            return None
+        return path, row[0]
+
+    async def cache_image(self, url: str) -> Optional[str]:
+        """Download a rover image (thumbnailed when Pillow is available) and return its digest"""
+        if not self.image_cache_enabled or not url:
+            return None
+        existing = self.local_image_digest(url)
+        if existing:
+            return existing
+
+        try:
+            async with httpx.AsyncClient(timeout=15.0, follow_redirects=True) as client:
+                response = await client.get(url)
+                response.raise_for_status()
+                data = response.content
+                content_type = response.headers.get("content-type", "image/jpeg").split(";")[0]
+        except Exception as e:
+            print(f"Error caching image {url}: {e}")
+            return None
+
+        if Image is not None:
+            try:
+                image = Image.open(io.BytesIO(data))
+                image.thumbnail((self.thumbnail_size, self.thumbnail_size))
+                out = io.BytesIO()
+                image.convert("RGB").save(out, format="JPEG", quality=80)
+                data = out.getvalue()
+                content_type = "image/jpeg"
+            except Exception as e:
+                print(f"Could not thumbnail {url}, storing original: {e}")
+
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.images_dir / digest[:2] / digest
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if not path.exists():
+                tmp_path = path.with_suffix(".tmp")
+                tmp_path.write_bytes(data)
+                tmp_path.replace(path)
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO images (url, digest, content_type, fetched_at) VALUES (?, ?, ?, ?)",
+                    (url, digest, content_type, time.time())
+                )
+        except (OSError, sqlite3.Error) as e:
+            print(f"Error storing cached image {url}: {e}")
+            return None
+        return digest
+
+    def clear(self):
+        """Drop all cached responses (image files are left for reuse)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.execute("DELETE FROM blobs")
@@ -5,22 +5,34 @@ from datetime import datetime, timedelta
 import json
 import random
 
+from app.services.nasa_cache import NASAAssetCache
+from app.services.json_stream import iter_json_array_items
+from app.services.photo_pool import PhotoPool, project_photo
+
+PHOTO_POOL_CACHE_KEY = "photo_pool"
+
 class NASAClient:
     def __init__(self):
         self.api_key = os.getenv("NASA_API_KEY", "DEMO_KEY")
-        self.base_url = "https://api.nasa.gov"
+        # Point at the local stand-in (python -m nasa_standin) for offline runs and load tests
+        self.base_url = os.getenv("NASA_API_BASE_URL", "https://api.nasa.gov").rstrip("/")
         self.rover_photos_cache: Dict[str, Any] = {}
         self.weather_cache: Optional[Dict[str, Any]] = None
         self.apod_cache: Optional[Dict[str, Any]] = None
         self.apod_cache_date: Optional[str] = None
-        self.cached_photos_pool: List[Dict[str, Any]] = []
-        self.pool_index = 0  # Track position in pool for rotation
+        self.photo_pool = PhotoPool()  # Deduplicated pool with per-mission rotation cursors
         self.cache_ttl = 3600  # 1 hour in seconds
+        # Historical sols never change, so photo pages and the pool can live much longer on disk
+        self.photo_cache_ttl = int(os.getenv("NASA_PHOTO_CACHE_TTL", 7 * 24 * 3600))
+        self.disk_cache = NASAAssetCache()
         self._initialize_photo_pool_async()  # Build pool on init
 
     def _initialize_photo_pool_async(self):
         """Initialize photo pool with real NASA data"""
         import asyncio
+        # Warm restart: reuse the pool persisted by a previous run
+        if self.load_photo_pool_from_cache():
+            return
         try:
             asyncio.create_task(self._build_photo_pool())
         except:
@@ -71,14 +83,16 @@ class NASAClient:
         if camera:
             params["camera"] = camera
 
+        disk_key_params = {"rover": rover, **params}
+        cached = self.disk_cache.get("mars-photos", disk_key_params)
+        if cached:
+            self.rover_photos_cache[cache_key] = cached
+            return cached
+
         try:
             async with httpx.AsyncClient(timeout=15.0) as client:
                 print(f"Fetching rover photos: rover={rover}, sol={sol}, camera={camera}, api_key={self.api_key[:20]}...")
-                response = await client.get(url, params=params)
-                response.raise_for_status()
-                data = response.json()
-
-                photos = data.get("photos", [])
+                photos = await self._stream_photos(client, url, params, limit=10)
                 print(f"Received {len(photos)} photos from NASA API")
                 
                 if len(photos) == 0:
@@ -86,22 +100,24 @@ class NASAClient:
                     if camera:
                         print(f"No photos with camera {camera}, trying without camera filter...")
                         params_no_camera = {k: v for k, v in params.items() if k != "camera"}
-                        response = await client.get(url, params=params_no_camera)
-                        response.raise_for_status()
-                        data = response.json()
-                        photos = data.get("photos", [])
+                        photos = await self._stream_photos(client, url, params_no_camera, limit=10)
                         print(f"Received {len(photos)} photos without camera filter")
                 
                 # Cache the results
                 if photos:
-                    self.rover_photos_cache[cache_key] = photos[:10]  # Cache more photos
-                    return photos[:10]
+                    self.rover_photos_cache[cache_key] = photos
+                    self.disk_cache.put("mars-photos", disk_key_params, photos, ttl=self.photo_cache_ttl)
+                    return photos
                 else:
                     print(f"No photos found for sol {sol}, using fallback")
                     return self._get_mock_rover_photos()
         except httpx.HTTPError as e:
             print(f"Error fetching rover photos: {e}")
             print(f"Response: {e.response.text if hasattr(e, 'response') else 'No response'}")
+            # Prefer a stale disk copy (e.g. while rate-limited) over mock data
+            stale = self.disk_cache.get("mars-photos", disk_key_params, allow_stale=True)
+            if stale:
+                return stale
             # Return mock data with variety
             return self._get_mock_rover_photos()
         except Exception as e:
@@ -110,6 +126,28 @@ class NASAClient:
             traceback.print_exc()
             return self._get_mock_rover_photos()
 
+    async def _stream_photos(self, client: httpx.AsyncClient, url: str, params: Dict[str, Any], limit: int) -> List[Dict[str, Any]]:
+        """
+        Stream-parse a mars-photos page, stopping after `limit` photos with an img_src.
+        Only a compact projection of each photo is kept and the rest of the body is never read.
+        """
+        async with client.stream("GET", url, params=params) as response:
+            if response.is_error:
+                await response.aread()  # Error bodies are small; keep them for logging
+            response.raise_for_status()
+
+            photos = []
+            items = iter_json_array_items(response.aiter_text(), "photos")
+            try:
+                async for photo in items:
+                    if isinstance(photo, dict) and photo.get("img_src"):
+                        photos.append(project_photo(photo))
+                        if len(photos) >= limit:
+                            break
+            finally:
+                await items.aclose()
+            return photos
+
     async def get_mars_weather(self) -> Dict[str, Any]:
         """
         Fetch InSight Mars Weather API data
@@ -120,13 +158,18 @@ class NASAClient:
             return self.weather_cache
 
         # InSight Weather API endpoint
-        url = "https://api.nasa.gov/insight_weather/"
+        url = f"{self.base_url}/insight_weather/"
         params = {
             "api_key": self.api_key,
             "feedtype": "json",
             "ver": "1.0"
         }
 
+        cached = self.disk_cache.get("insight_weather", params)
+        if cached:
+            self.weather_cache = cached
+            return cached
+
         try:
             async with httpx.AsyncClient(timeout=10.0) as client:
                 response = await client.get(url, params=params)
@@ -135,10 +178,14 @@ class NASAClient:
                 
                 # Cache the results
                 self.weather_cache = data
+                self.disk_cache.put("insight_weather", params, data, ttl=self.cache_ttl)
                 
                 return data
         except httpx.HTTPError as e:
             print(f"Error fetching Mars weather: {e}")
+            stale = self.disk_cache.get("insight_weather", params, allow_stale=True)
+            if stale:
+                return stale
             return self._get_mock_weather()
         except Exception as e:
             print(f"Unexpected error fetching Mars weather: {e}")
@@ -170,6 +217,15 @@ class NASAClient:
             "date": target_date
         }
 
+        # Past APODs never change; today's entry is refreshed daily
+        apod_ttl = 24 * 3600 if days_back == 0 else self.photo_cache_ttl
+        cached = self.disk_cache.get("apod", params)
+        if cached:
+            if days_back == 0:
+                self.apod_cache = cached
+                self.apod_cache_date = today
+            return cached
+
         try:
             async with httpx.AsyncClient(timeout=15.0) as client:
                 print(f"Fetching APOD for {target_date} with key: {self.api_key[:20]}...")
@@ -182,10 +238,14 @@ class NASAClient:
                 if days_back == 0:
                     self.apod_cache = data
                     self.apod_cache_date = today
+                self.disk_cache.put("apod", params, data, ttl=apod_ttl)
 
                 return data
         except Exception as e:
             print(f"Error fetching APOD: {e}")
+            stale = self.disk_cache.get("apod", params, allow_stale=True)
+            if stale:
+                return stale
             print("Using mock APOD data")
             return self._get_mock_apod()
 
@@ -195,15 +255,12 @@ class NASAClient:
         Args:
             count: Number of photos to return (default 3)
         """
-        if len(self.cached_photos_pool) == 0:
+        if not self.photo_pool:
             # Initialize pool if empty
             self._initialize_photo_pool()
 
-        # Return random selection
-        if len(self.cached_photos_pool) >= count:
-            return random.sample(self.cached_photos_pool, count)
-        else:
-            return self.cached_photos_pool
+        # Return random selection of distinct photos
+        return self.photo_pool.sample(count)
 
     def _initialize_photo_pool(self):
         """Initialize photo pool with pre-cached photos"""
@@ -213,9 +270,9 @@ class NASAClient:
         cameras = ["FHAZ", "RHAZ", "MAST", "CHEMCAM", "HAZCAM"]
 
         for i, sol in enumerate(sols):
-            for camera in cameras[:2]:  # 2 cameras per sol
-                self.cached_photos_pool.append({
-                    "id": i * 2,
+            for j, camera in enumerate(cameras[:2]):  # 2 cameras per sol
+                self.photo_pool.add({
+                    "id": i * 2 + j,
                     "sol": sol,
                     "img_src": f"https://mars.nasa.gov/msl-raw-images/proj/msl/redops/ods/surface/sol/{sol:05d}/opgs/edr/fcam/photo_{i}_{camera}.JPG",
                     "earth_date": datetime(2015, 5, 30).strftime("%Y-%m-%d"),
@@ -223,10 +280,6 @@ class NASAClient:
                     "camera": {"name": camera, "full_name": f"Camera {camera}"}
                 })
 
-        # Ensure we have at least 50 unique photos
-        while len(self.cached_photos_pool) < 50:
-            self.cached_photos_pool.append(self.cached_photos_pool[len(self.cached_photos_pool) % 10].copy())
-
     def _get_mock_rover_photos(self) -> List[Dict[str, Any]]:
         """Return diverse mock rover photos when API fails"""
         # Generate different photos each time based on random selection
@@ -296,6 +349,35 @@ class NASAClient:
         """Clear cached data"""
         self.rover_photos_cache.clear()
         self.weather_cache = None
+        self.disk_cache.clear()
+
+    def load_photo_pool_from_cache(self) -> bool:
+        """Load a fresh photo pool persisted by a previous run; returns True on success"""
+        pool = self.disk_cache.get(PHOTO_POOL_CACHE_KEY)
+        if not pool:
+            return False
+        self.photo_pool.clear()
+        self.photo_pool.extend(pool)
+        print(f"Loaded {len(self.photo_pool)} photos from disk cache")
+        return True
+
+    def _save_photo_pool_to_cache(self):
+        """Persist the API-built photo pool so warm restarts skip the rebuild"""
+        self.disk_cache.put(PHOTO_POOL_CACHE_KEY, None, self.photo_pool.to_list(), ttl=self.photo_cache_ttl)
+
+    def get_local_image_url(self, img_src: str) -> Optional[str]:
+        """Return the local URL of a cached copy of img_src, if the image cache has one"""
+        digest = self.disk_cache.local_image_digest(img_src)
+        return f"/api/nasa/images/{digest}" if digest else None
+
+    def schedule_image_caching(self, urls: List[str]):
+        """Download images into the local cache in the background (no-op if disabled)"""
+        if not self.disk_cache.image_cache_enabled:
+            return
+        import asyncio
+        for url in urls:
+            if url and not self.disk_cache.local_image_digest(url):
+                asyncio.create_task(self.disk_cache.cache_image(url))
 
     async def _build_photo_pool(self):
         """Build photo pool from NASA API - multiple sols and cameras"""
@@ -315,28 +397,26 @@ class NASAClient:
                 }
 
                 async with httpx.AsyncClient(timeout=15.0) as client:
-                    response = await client.get(url, params=params)
-                    if response.status_code == 200:
-                        data = response.json()
-                        photos = data.get("photos", [])
-                        # Add first 3 photos from each sol
-                        for photo in photos[:3]:
-                            if photo.get("img_src"):
-                                self.cached_photos_pool.append(photo)
-                                if len(self.cached_photos_pool) >= 50:  # Limit pool size
-                                    break
-                        if len(self.cached_photos_pool) >= 50:
+                    # Only the first 3 usable photos of each sol are parsed and kept
+                    photos = await self._stream_photos(client, url, params, limit=3)
+                    if photos:
+                        for photo in photos:
+                            self.photo_pool.add(photo)
+                            if len(self.photo_pool) >= 50:  # Limit pool size
+                                break
+                        if len(self.photo_pool) >= 50:
                             break
             except Exception as e:
                 print(f"Error fetching photos for sol {sol}: {e}")
                 continue  # Continue to next sol
 
         # If pool is empty, build fallback
-        if len(self.cached_photos_pool) == 0:
+        if not self.photo_pool:
             print("No photos fetched from API, building fallback pool...")
             self._build_fallback_pool()
         else:
-            print(f"Photo pool built with {len(self.cached_photos_pool)} images from NASA API")
+            print(f"Photo pool built with {len(self.photo_pool)} images from NASA API")
+            self._save_photo_pool_to_cache()
 
     def _build_fallback_pool(self):
         """Build fallback photo pool with REAL working NASA image URLs"""
@@ -427,69 +507,51 @@ class NASAClient:
             }
         ]
 
-        # Add real images to pool - ensure we have at least 20 unique photos
-        for img in real_nasa_images:
-            # Add each image multiple times with different IDs for variety
-            for i in range(3):
-                photo_copy = img.copy()
-                photo_copy["id"] = img["id"] * 1000 + i
-                self.cached_photos_pool.append(photo_copy)
+        # Add each real image once - the pool deduplicates, and per-mission cursors
+        # give variety without re-adding the same picture under new IDs
+        self.photo_pool.extend(real_nasa_images)
 
-        print(f"Fallback pool built with {len(self.cached_photos_pool)} real NASA images")
+        print(f"Fallback pool built with {len(self.photo_pool)} real NASA images")
 
-    def get_next_photo_from_pool(self) -> Dict[str, Any]:
-        """Get next photo from pool with rotation"""
-        if not self.cached_photos_pool:
+    def get_next_photo_from_pool(self, mission_id: Optional[str] = None, camera: Optional[str] = None) -> Dict[str, Any]:
+        """Get next photo for a mission - no repeats until the mission has seen the whole pool"""
+        if not self.photo_pool:
             self._build_fallback_pool()
 
-        if self.cached_photos_pool:
-            photo = self.cached_photos_pool[self.pool_index % len(self.cached_photos_pool)]
-            self.pool_index += 1
+        photo = self.photo_pool.draw(mission_id=mission_id, camera=camera)
+        if photo is None and camera is not None:
+            # No photos from that camera - fall back to the whole pool
+            photo = self.photo_pool.draw(mission_id=mission_id)
+        if photo:
             return photo
 
         return self._get_mock_rover_photos()[0]
 
-    def get_random_photos_from_pool(self, count: int = 3) -> List[Dict[str, Any]]:
+    def get_random_photos_from_pool(self, count: int = 3, camera: Optional[str] = None, sol: Optional[int] = None) -> List[Dict[str, Any]]:
         """Get random photos from pool - always returns requested count"""
-        if not self.cached_photos_pool:
+        if not self.photo_pool:
             self._build_fallback_pool()
 
-        if not self.cached_photos_pool:
+        if not self.photo_pool:
             # If still empty, create fallback photos
             return [self._get_mock_rover_photos()[0] for _ in range(count)]
 
-        # Ensure we have enough photos
-        if len(self.cached_photos_pool) >= count:
-            # Get unique random photos
-            selected = random.sample(self.cached_photos_pool, count)
-            # Ensure each photo has required fields
-            result = []
-            for photo in selected:
-                if photo.get("img_src") or photo.get("url"):
-                    result.append(photo)
-                if len(result) >= count:
-                    break
-            
-            # If we don't have enough valid photos, fill with duplicates
-            while len(result) < count:
-                photo = random.choice(self.cached_photos_pool)
-                if photo.get("img_src") or photo.get("url"):
-                    # Create a copy with new ID to avoid duplicates
-                    photo_copy = photo.copy()
-                    photo_copy["id"] = photo.get("id", 0) * 1000 + len(result)
-                    result.append(photo_copy)
-            
-            return result[:count]
-        else:
-            # Not enough photos in pool, return what we have and fill with duplicates
-            result = list(self.cached_photos_pool)
-            while len(result) < count:
-                photo = random.choice(self.cached_photos_pool) if self.cached_photos_pool else self._get_mock_rover_photos()[0]
-                photo_copy = photo.copy() if isinstance(photo, dict) else photo
-                if isinstance(photo_copy, dict):
-                    photo_copy["id"] = (photo_copy.get("id", 0) * 1000) + len(result)
-                result.append(photo_copy)
-            return result[:count]
+        # Distinct photos first (filters narrow the candidates via the pool indexes)
+        result = self.photo_pool.sample(count, camera=camera, sol=sol)
+        if len(result) < count and (camera is not None or sol is not None):
+            seen = {id(photo) for photo in result}
+            result += [p for p in self.photo_pool.sample(count) if id(p) not in seen][:count - len(result)]
+
+        # Pool smaller than requested - fill with copies under new IDs
+        while len(result) < count:
+            photo_copy = self.photo_pool.draw().copy()
+            photo_copy["id"] = (photo_copy.get("id", 0) * 1000) + len(result)
+            result.append(photo_copy)
+        return result
+
+    def release_mission(self, mission_id: str):
+        """Drop per-mission photo rotation state once a mission is finished"""
+        self.photo_pool.release(mission_id)
 
 # Global instance
 nasa_client = NASAClient()
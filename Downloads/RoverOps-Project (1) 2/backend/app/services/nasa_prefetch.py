@@ -0,0 +1,87 @@
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from app.models.schemas import AgentType, MissionLog, MissionStep
+from app.services.mission_state import mission_state_manager
+from app.services.nasa_client import NASAClient, nasa_client
+
+
+class MissionPrefetcher:
+    """Fetches the NASA data a mission needs concurrently, right after planning.
+
+    Once the planner has produced steps we know everything the mission will
+    ask NASA for: weather for the safety agent, the APOD for the report and a
+    photo for each step. All of it is fetched in one background task and
+    attached to the mission, so graph nodes only ever read what is already
+    there and never wait on NASA I/O.
+    """
+
+    def __init__(self, client: NASAClient):
+        self.client = client
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._step_photos: Dict[str, Dict[int, Dict[str, Any]]] = {}
+
+    def start(self, mission_id: str, steps: List[MissionStep]) -> asyncio.Task:
+        """Launch prefetching for a mission (idempotent while a prefetch is running)"""
+        task = self._tasks.get(mission_id)
+        if task and not task.done():
+            return task
+        task = asyncio.create_task(self._prefetch(mission_id, list(steps)))
+        self._tasks[mission_id] = task
+        return task
+
+    async def _prefetch(self, mission_id: str, steps: List[MissionStep]):
+        weather, apod, photos = await asyncio.gather(
+            self.client.get_mars_weather(),
+            self.client.get_apod(),
+            asyncio.gather(*(self._lookup_step_photo(mission_id) for _ in steps)),
+            return_exceptions=True
+        )
+
+        if isinstance(weather, dict):
+            mission_state_manager.set_weather_data(mission_id, weather)
+            mission_state_manager.add_log(mission_id, MissionLog(
+                mission_id=mission_id,
+                agent_type=AgentType.SUPERVISOR,
+                message="Fetched Mars weather data from NASA API",
+                level="info"
+            ))
+        else:
+            mission_state_manager.add_log(mission_id, MissionLog(
+                mission_id=mission_id,
+                agent_type=AgentType.SUPERVISOR,
+                message=f"Failed to fetch NASA data: {str(weather)}",
+                level="warning"
+            ))
+
+        if isinstance(apod, dict):
+            mission_state_manager.set_apod_data(mission_id, apod)
+
+        if isinstance(photos, list):
+            self._step_photos[mission_id] = {
+                step.step_number: photo for step, photo in zip(steps, photos) if photo
+            }
+            self.client.schedule_image_caching([photo.get("img_src") for photo in photos if photo])
+
+    async def _lookup_step_photo(self, mission_id: str) -> Optional[Dict[str, Any]]:
+        """Pick a step photo from the mission's pool rotation, hitting the API only if the pool is empty"""
+        photo = self.client.photo_pool.draw(mission_id=mission_id)
+        if photo:
+            return photo
+        photos = await self.client.get_rover_photos()
+        return photos[0] if photos else None
+
+    def take_step_photo(self, mission_id: str, step_number: int) -> Optional[Dict[str, Any]]:
+        """Return (once) the prefetched photo for a step, or None if not ready - never blocks"""
+        return self._step_photos.get(mission_id, {}).pop(step_number, None)
+
+    def release(self, mission_id: str):
+        """Cancel any in-flight prefetch and drop cached results for a mission"""
+        task = self._tasks.pop(mission_id, None)
+        if task and not task.done():
+            task.cancel()
+        self._step_photos.pop(mission_id, None)
+
+
+# Global instance
+nasa_prefetcher = MissionPrefetcher(nasa_client)
@@ -0,0 +1,412 @@
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+from dotenv import load_dotenv
+
+from app.models.schemas import TERMINAL_STATUSES, MissionLog, MissionState, MissionStatus, MissionStep
+
+load_dotenv()
+
+# SQLite translation of backend/database_schema.sql (MySQL deployments apply that file directly)
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS mission_reports (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    mission_id VARCHAR(255) UNIQUE NOT NULL,
+    goal TEXT NOT NULL,
+    status VARCHAR(50) NOT NULL DEFAULT 'complete',
+    start_time DATETIME NOT NULL,
+    end_time DATETIME,
+    duration_seconds FLOAT,
+    steps_completed INT DEFAULT 0,
+    total_steps INT DEFAULT 0,
+    rover_final_position_x INT DEFAULT 0,
+    rover_final_position_y INT DEFAULT 0,
+    outcome TEXT,
+    summary TEXT,
+    collected_data JSON,
+    mission_photos JSON,
+    apod_data JSON,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_reports_status ON mission_reports (status);
+CREATE INDEX IF NOT EXISTS idx_reports_created_at ON mission_reports (created_at);
+
+CREATE TABLE IF NOT EXISTS mission_logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    mission_id VARCHAR(255) NOT NULL REFERENCES mission_reports(mission_id) ON DELETE CASCADE,
+    timestamp DATETIME NOT NULL,
+    agent_type VARCHAR(50) NOT NULL,
+    message TEXT NOT NULL,
+    level VARCHAR(20) DEFAULT 'info',
+    data JSON,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_logs_mission_id ON mission_logs (mission_id);
+CREATE INDEX IF NOT EXISTS idx_logs_timestamp ON mission_logs (timestamp);
+
+CREATE TABLE IF NOT EXISTS mission_status (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    mission_id VARCHAR(255) NOT NULL REFERENCES mission_reports(mission_id) ON DELETE CASCADE,
+    status VARCHAR(50) NOT NULL,
+    previous_status VARCHAR(50),
+    changed_at DATETIME NOT NULL,
+    changed_by VARCHAR(50) DEFAULT 'system',
+    notes TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_status_mission_id ON mission_status (mission_id);
+
+CREATE TABLE IF NOT EXISTS mission_steps (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    mission_id VARCHAR(255) NOT NULL REFERENCES mission_reports(mission_id) ON DELETE CASCADE,
+    step_number INT NOT NULL,
+    action VARCHAR(100) NOT NULL,
+    target_position_x INT,
+    target_position_y INT,
+    description TEXT,
+    completed BOOLEAN DEFAULT FALSE,
+    nasa_image_url VARCHAR(500),
+    completed_at DATETIME,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_steps_mission_id ON mission_steps (mission_id, step_number);
+
+CREATE TABLE IF NOT EXISTS mission_statistics (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    total_missions INT DEFAULT 0,
+    completed_missions INT DEFAULT 0,
+    aborted_missions INT DEFAULT 0,
+    error_missions INT DEFAULT 0,
+    total_steps_executed INT DEFAULT 0,
+    total_duration_seconds FLOAT DEFAULT 0,
+    average_duration_seconds FLOAT DEFAULT 0,
+    last_mission_id VARCHAR(255),
+    last_mission_at DATETIME,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+REPORT_COLUMNS = (
+    "mission_id", "goal", "status", "start_time", "end_time", "duration_seconds",
+    "steps_completed", "total_steps", "rover_final_position_x", "rover_final_position_y",
+    "collected_data", "apod_data"
+)
+LOG_COLUMNS = ("mission_id", "timestamp", "agent_type", "message", "level", "data")
+STATUS_COLUMNS = ("mission_id", "status", "previous_status", "changed_at", "notes")
+STATISTICS_COLUMNS = (
+    "id", "total_missions", "completed_missions", "aborted_missions", "error_missions", "total_steps_executed",
+    "total_duration_seconds", "average_duration_seconds", "last_mission_id", "last_mission_at"
+)
+STEP_COLUMNS = (
+    "mission_id", "step_number", "action", "target_position_x", "target_position_y",
+    "description", "completed", "nasa_image_url", "completed_at"
+)
+
+# Stay under SQLite's default host-parameter limit (999) in multi-row statements
+MAX_PARAMS_PER_STATEMENT = 900
+
+
+def _ts(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat(sep=" ") if value else None
+
+
+def _json(value: Any) -> Optional[str]:
+    return json.dumps(value, default=str) if value is not None else None
+
+
+class MissionPersistence:
+    """Write-behind persistence of mission data into the database_schema.sql tables.
+
+    `record_*` calls only build a row tuple and drop it on a queue, so they are
+    safe to call from the graph loop. A writer thread drains the queue and
+    flushes batched multi-row statements once `batch_size` rows are pending or
+    `flush_interval` seconds have passed. Any DB-API 2 driver works; the
+    connection URL picks it (sqlite:///path, mysql://..., postgresql://...).
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        max_queue: int = 100_000
+    ):
+        self.url = url if url is not None else os.getenv("MISSION_DB_URL", "")
+        self.enabled = bool(self.url)
+        self.batch_size = batch_size or int(os.getenv("MISSION_DB_BATCH_SIZE", 200))
+        self.flush_interval = flush_interval or float(os.getenv("MISSION_DB_FLUSH_INTERVAL", 1.0))
+        self._queue: "queue.Queue[Tuple[str, Any]]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._connect: Optional[Callable[[], Any]] = None
+        self._dialect = "sqlite"
+        self._placeholder = "?"
+        self.dropped_rows = 0
+        self.written_rows = 0
+        self.flushes = 0
+
+    # ------------------------------------------------------------------
+    # Producer side (event loop) - never blocks
+    # ------------------------------------------------------------------
+
+    def _enqueue(self, table: str, row: Any):
+        if not self.enabled:
+            return
+        if self._thread is None:
+            self.start()
+        try:
+            self._queue.put_nowait((table, row))
+        except queue.Full:
+            self.dropped_rows += 1
+            if self.dropped_rows % 1000 == 1:
+                print(f"⚠️  Persistence queue full, dropped {self.dropped_rows} rows so far")
+
+    def record_mission(self, mission: MissionState):
+        """Upsert the mission_reports row from the current mission snapshot"""
+        if not self.enabled:
+            return
+        end_time = mission.updated_at if mission.status in TERMINAL_STATUSES else None
+        duration = (end_time - mission.created_at).total_seconds() if end_time else None
+        self._enqueue("mission_reports", (
+            mission.mission_id,
+            mission.goal,
+            mission.status.value,
+            _ts(mission.created_at),
+            _ts(end_time),
+            duration,
+            sum(1 for step in mission.steps if step.completed),
+            len(mission.steps),
+            mission.rover_position.x,
+            mission.rover_position.y,
+            _json(mission.collected_data),
+            _json(mission.apod_data)
+        ))
+
+    def record_status(self, mission_id: str, status: MissionStatus, previous_status: Optional[MissionStatus], notes: Optional[str] = None):
+        """Append a mission_status transition row"""
+        if not self.enabled:
+            return
+        self._enqueue("mission_status", (
+            mission_id,
+            status.value,
+            previous_status.value if previous_status else None,
+            _ts(datetime.now()),
+            notes
+        ))
+
+    def record_log(self, log: MissionLog):
+        """Append a mission_logs row"""
+        if not self.enabled:
+            return
+        self._enqueue("mission_logs", (
+            log.mission_id,
+            _ts(log.timestamp),
+            log.agent_type.value,
+            log.message,
+            log.level,
+            _json(log.data)
+        ))
+
+    def record_step(self, mission_id: str, step: MissionStep):
+        """Upsert a mission_steps row (the latest state of a step wins within a batch)"""
+        if not self.enabled:
+            return
+        target = step.target_position
+        self._enqueue("mission_steps", (
+            mission_id,
+            step.step_number,
+            step.action,
+            target.x if target else None,
+            target.y if target else None,
+            step.description,
+            bool(step.completed),
+            step.nasa_image_url,
+            _ts(datetime.now()) if step.completed else None
+        ))
+
+    def record_statistics(
+        self, total: int, completed: int, aborted: int, errors: int, steps: int,
+        total_duration: float, average_duration: float, last_mission_id: Optional[str], last_mission_at: Optional[datetime]
+    ):
+        """Upsert the single mission_statistics row"""
+        if not self.enabled:
+            return
+        self._enqueue("mission_statistics", (
+            1, total, completed, aborted, errors, steps, total_duration, average_duration, last_mission_id, _ts(last_mission_at)
+        ))
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Start the writer thread (called lazily on the first record)"""
+        with self._start_lock:
+            if self._thread is not None or not self.enabled:
+                return
+            try:
+                self._configure()
+            except Exception as e:
+                print(f"Mission persistence disabled: {e}")
+                self.enabled = False
+                return
+            self._thread = threading.Thread(target=self._run, name="mission-persistence", daemon=True)
+            self._thread.start()
+
+    def _configure(self):
+        """Resolve the DB-API driver, dialect and paramstyle from the connection URL"""
+        parsed = urlparse(self.url)
+        scheme = parsed.scheme.split("+")[0]
+        if scheme == "sqlite":
+            import sqlite3
+            # sqlite:///relative.db or sqlite:////absolute/path.db
+            path = self.url.split("sqlite:///", 1)[1] if "sqlite:///" in self.url else ":memory:"
+            self._connect = lambda: sqlite3.connect(path, check_same_thread=False)
+            self._dialect, module = "sqlite", sqlite3
+        elif scheme == "mysql":
+            import pymysql  # Optional dependency, only needed for MySQL deployments
+            self._connect = lambda: pymysql.connect(
+                host=parsed.hostname, port=parsed.port or 3306,
+                user=unquote(parsed.username or ""), password=unquote(parsed.password or ""),
+                database=parsed.path.lstrip("/"), charset="utf8mb4", autocommit=False
+            )
+            self._dialect, module = "mysql", pymysql
+        elif scheme in ("postgres", "postgresql"):
+            import psycopg2  # Optional dependency, only needed for PostgreSQL deployments
+            self._connect = lambda: psycopg2.connect(self.url.replace(parsed.scheme, "postgresql", 1))
+            self._dialect, module = "postgresql", psycopg2
+        else:
+            raise ValueError(f"Unsupported MISSION_DB_URL scheme: {parsed.scheme}")
+        self._placeholder = "?" if module.paramstyle == "qmark" else "%s"
+
+    def _run(self):
+        conn = self._connect()
+        if self._dialect == "sqlite":
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SQLITE_SCHEMA)
+
+        pending: Dict[str, List[Any]] = {}
+        pending_count = 0
+        last_flush = time.monotonic()
+        stop = False
+        while not stop:
+            timeout = max(self.flush_interval - (time.monotonic() - last_flush), 0.01)
+            try:
+                table, row = self._queue.get(timeout=timeout)
+                if table == "__flush__":
+                    if pending_count == 0:
+                        row.set()
+                    else:
+                        pending.setdefault(table, []).append(row)
+                elif table == "__stop__":
+                    stop = True
+                else:
+                    pending.setdefault(table, []).append(row)
+                    pending_count += 1
+            except queue.Empty:
+                pass
+
+            due = time.monotonic() - last_flush >= self.flush_interval
+            if pending and (pending_count >= self.batch_size or due or stop or "__flush__" in pending):
+                waiters = pending.pop("__flush__", [])
+                try:
+                    self._flush(conn, pending)
+                    self.written_rows += pending_count
+                    self.flushes += 1
+                except Exception as e:
+                    print(f"Error flushing {pending_count} mission rows: {e}")
+                    try:
+                        conn.rollback()
+                    except Exception:
+                        pass
+                pending, pending_count = {}, 0
+                for waiter in waiters:
+                    waiter.set()
+            if due or not pending:
+                last_flush = time.monotonic()
+        conn.close()
+
+    def _flush(self, conn, pending: Dict[str, List[Any]]):
+        """Write one batch in a single transaction: parents first, then child rows"""
+        cursor = conn.cursor()
+        if "mission_reports" in pending:
+            # Only the latest snapshot per mission matters
+            latest = {row[0]: row for row in pending["mission_reports"]}
+            self._upsert_reports(cursor, list(latest.values()))
+        if "mission_status" in pending:
+            self._insert_many(cursor, "mission_status", STATUS_COLUMNS, pending["mission_status"])
+        if "mission_steps" in pending:
+            latest = {(row[0], row[1]): row for row in pending["mission_steps"]}
+            keys = list(latest.keys())
+            for chunk in self._chunks(keys, 2):
+                where = " OR ".join(f"(mission_id = {self._placeholder} AND step_number = {self._placeholder})" for _ in chunk)
+                cursor.execute(f"DELETE FROM mission_steps WHERE {where}", [v for key in chunk for v in key])
+            self._insert_many(cursor, "mission_steps", STEP_COLUMNS, list(latest.values()))
+        if "mission_logs" in pending:
+            self._insert_many(cursor, "mission_logs", LOG_COLUMNS, pending["mission_logs"])
+        if "mission_statistics" in pending:
+            # Only the latest snapshot matters
+            self._upsert(cursor, "mission_statistics", STATISTICS_COLUMNS, [pending["mission_statistics"][-1]], "id", ("id",))
+        conn.commit()
+
+    def _chunks(self, rows: List[Any], width: int):
+        size = max(MAX_PARAMS_PER_STATEMENT // width, 1)
+        for i in range(0, len(rows), size):
+            yield rows[i:i + size]
+
+    def _insert_many(self, cursor, table: str, columns: Tuple[str, ...], rows: List[Tuple], suffix: str = ""):
+        """Multi-row INSERT ... VALUES (...), (...) in as few statements as the driver allows"""
+        row_sql = "(" + ", ".join([self._placeholder] * len(columns)) + ")"
+        for chunk in self._chunks(rows, len(columns)):
+            sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES {', '.join([row_sql] * len(chunk))}{suffix}"
+            cursor.execute(sql, [value for row in chunk for value in row])
+
+    def _upsert_reports(self, cursor, rows: List[Tuple]):
+        self._upsert(cursor, "mission_reports", REPORT_COLUMNS, rows, "mission_id", ("mission_id", "start_time"))
+
+    def _upsert(self, cursor, table: str, columns: Tuple[str, ...], rows: List[Tuple], key: str, keep: Tuple[str, ...]):
+        """Multi-row insert that updates every column but `keep` when `key` already exists"""
+        updates = [c for c in columns if c not in keep]
+        if self._dialect == "mysql":
+            suffix = " ON DUPLICATE KEY UPDATE " + ", ".join(f"{c} = VALUES({c})" for c in updates)
+        else:
+            suffix = f" ON CONFLICT ({key}) DO UPDATE SET " + ", ".join(f"{c} = excluded.{c}" for c in updates)
+            suffix += ", updated_at = CURRENT_TIMESTAMP"
+        self._insert_many(cursor, table, columns, rows, suffix=suffix)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until everything queued so far is written (for shutdown and tests)"""
+        if not self.enabled or self._thread is None:
+            return True
+        done = threading.Event()
+        self._queue.put(("__flush__", done))
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 5.0):
+        """Flush pending rows and stop the writer thread"""
+        if self._thread is None:
+            return
+        self._queue.put(("__stop__", None))
+        self._thread.join(timeout)
+        self._thread = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "queued_rows": self._queue.qsize(),
+            "written_rows": self.written_rows,
+            "dropped_rows": self.dropped_rows,
+            "flushes": self.flushes
+        }
+
+
+# Global instance
+mission_persistence = MissionPersistence()
@@ -0,0 +1,155 @@
+import random
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+
+
+def photo_camera_name(photo: Dict[str, Any]) -> Optional[str]:
+    """Camera name of a photo, whether `camera` is a nested dict or a plain string"""
+    camera = photo.get("camera")
+    if isinstance(camera, dict):
+        return camera.get("name")
+    return camera
+
+
+def project_photo(photo: Dict[str, Any]) -> Dict[str, Any]:
+    """Compact projection of a mars-photos entry - drops the nested rover/camera metadata"""
+    return {
+        "id": photo.get("id"),
+        "img_src": photo.get("img_src"),
+        "camera": photo_camera_name(photo),
+        "sol": photo.get("sol"),
+        "earth_date": photo.get("earth_date")
+    }
+
+
+class ShuffledCursor:
+    """Lazy Fisher-Yates shuffle over range(size).
+
+    Each draw is O(1) time and only touches the swapped slots, so creating a
+    cursor is free and no index repeats until the permutation is exhausted,
+    after which a fresh permutation starts.
+    """
+
+    __slots__ = ("size", "position", "swaps")
+
+    def __init__(self, size: int):
+        self.size = size
+        self.position = 0
+        self.swaps: Dict[int, int] = {}
+
+    def next(self) -> int:
+        if self.position >= self.size:
+            self.position = 0
+            self.swaps.clear()
+        j = random.randrange(self.position, self.size)
+        picked = self.swaps.get(j, j)
+        self.swaps[j] = self.swaps.pop(self.position, self.position)
+        self.position += 1
+        return picked
+
+
+class PhotoPool:
+    """Deduplicated Mars photo pool with per-mission no-repeat cursors.
+
+    Photos are stored once (deduplicated by id, then img_src) and indexed by
+    camera name and sol so filtered draws don't scan the pool. Each
+    (mission, camera, sol) combination gets its own shuffled cursor, so
+    concurrent missions rotate independently instead of sharing one index.
+    """
+
+    def __init__(self):
+        self.photos: List[Dict[str, Any]] = []
+        self._seen: Dict[Hashable, int] = {}
+        self._by_camera: Dict[str, List[int]] = {}
+        self._by_sol: Dict[Any, List[int]] = {}
+        self._cursors: Dict[Tuple[Any, Optional[str], Any], Tuple[int, ShuffledCursor]] = {}
+        self.version = 0  # Bumped on every mutation so stale cursors get rebuilt
+
+    def __len__(self) -> int:
+        return len(self.photos)
+
+    def __bool__(self) -> bool:
+        return bool(self.photos)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.photos)
+
+    def add(self, photo: Dict[str, Any]) -> bool:
+        """Add a photo unless it has no img_src or an equal id/img_src is already pooled"""
+        img_src = photo.get("img_src")
+        photo_id = photo.get("id")
+        if not img_src:
+            return False
+        if (photo_id is not None and ("id", photo_id) in self._seen) or ("src", img_src) in self._seen:
+            return False
+
+        index = len(self.photos)
+        self.photos.append(photo)
+        if photo_id is not None:
+            self._seen[("id", photo_id)] = index
+        self._seen[("src", img_src)] = index
+        camera = photo_camera_name(photo)
+        if camera:
+            self._by_camera.setdefault(camera, []).append(index)
+        if photo.get("sol") is not None:
+            self._by_sol.setdefault(photo.get("sol"), []).append(index)
+        self.version += 1
+        return True
+
+    def extend(self, photos: List[Dict[str, Any]]) -> int:
+        """Add several photos; returns how many were new"""
+        return sum(1 for photo in photos if self.add(photo))
+
+    def clear(self):
+        """Remove all photos and cursors"""
+        self.photos = []
+        self._seen.clear()
+        self._by_camera.clear()
+        self._by_sol.clear()
+        self._cursors.clear()
+        self.version += 1
+
+    def _candidates(self, camera: Optional[str], sol: Any) -> Optional[List[int]]:
+        """Pool indexes matching the filters; None means the whole pool"""
+        if camera is None and sol is None:
+            return None
+        by_camera = self._by_camera.get(camera, []) if camera is not None else None
+        by_sol = self._by_sol.get(sol, []) if sol is not None else None
+        if by_camera is None:
+            return by_sol
+        if by_sol is None:
+            return by_camera
+        sol_set = set(by_sol)
+        return [i for i in by_camera if i in sol_set]
+
+    def draw(self, mission_id: Optional[str] = None, camera: Optional[str] = None, sol: Any = None) -> Optional[Dict[str, Any]]:
+        """Draw the next photo for a mission without repeats until its pool is exhausted"""
+        candidates = self._candidates(camera, sol)
+        size = len(self.photos) if candidates is None else len(candidates)
+        if size == 0:
+            return None
+
+        key = (mission_id, camera, sol)
+        entry = self._cursors.get(key)
+        if entry is None or entry[0] != self.version:
+            entry = (self.version, ShuffledCursor(size))
+            self._cursors[key] = entry
+        index = entry[1].next()
+        return self.photos[index if candidates is None else candidates[index]]
+
+    def sample(self, count: int, camera: Optional[str] = None, sol: Any = None) -> List[Dict[str, Any]]:
+        """Up to `count` distinct photos, chosen uniformly at random"""
+        candidates = self._candidates(camera, sol)
+        size = len(self.photos) if candidates is None else len(candidates)
+        cursor = ShuffledCursor(size)
+        picked = [cursor.next() for _ in range(min(count, size))]
+        if candidates is None:
+            return [self.photos[i] for i in picked]
+        return [self.photos[candidates[i]] for i in picked]
+
+    def release(self, mission_id: str):
+        """Forget all cursors belonging to a mission"""
+        for key in [k for k in self._cursors if k[0] == mission_id]:
+            del self._cursors[key]
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return list(self.photos)
@@ -0,0 +1,131 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def collapse_stack(frame) -> str:
+    """A frame's stack in collapsed form (root first, `;`-separated) as flamegraph tools expect"""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class LoopProfiler:
+    """Opt-in diagnostics for the event loop: slow-callback detection and sampling profiles.
+
+    A watchdog thread posts a no-op onto the loop every `check_interval`
+    seconds. If that no-op has not run after `slow_ms`, whatever holds the
+    loop is a slow callback: the watchdog records the loop thread's stack at
+    that moment and, once the loop frees up, how long the stall lasted.
+    `profile()` samples the loop thread's stack (or every thread) at `hz`
+    for a fixed time and returns the counts as a collapsed-stack file.
+    """
+
+    def __init__(self, enabled: Optional[bool] = None, slow_ms: Optional[float] = None, check_interval: float = 0.05, history: int = 50):
+        if enabled is None:
+            enabled = os.getenv("PROFILING_ENABLED", "false").lower() in ("1", "true", "yes")
+        self.enabled = enabled
+        self.slow_ms = slow_ms if slow_ms is not None else float(os.getenv("SLOW_CALLBACK_MS", 100))
+        self.check_interval = check_interval
+        self.slow_callbacks: Deque[Dict[str, Any]] = deque(maxlen=history)
+        self.slow_total = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+        self._profile_lock = threading.Lock()
+
+    def start(self):
+        """Start the watchdog for the running loop (call from the loop thread)"""
+        if not self.enabled or self._watchdog is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._stop.clear()
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    def stop(self):
+        self._stop.set()
+        self._watchdog = None
+
+    def _watch(self):
+        while not self._stop.is_set():
+            ran = threading.Event()
+            posted = time.perf_counter()
+            try:
+                self._loop.call_soon_threadsafe(ran.set)
+            except RuntimeError:
+                return  # Loop closed
+            if not ran.wait(self.slow_ms / 1000):
+                frame = sys._current_frames().get(self._loop_thread_id)
+                stack = traceback.format_stack(frame) if frame is not None else []
+                collapsed = collapse_stack(frame) if frame is not None else ""
+                while not ran.wait(0.1):
+                    if self._stop.is_set():
+                        return
+                duration_ms = (time.perf_counter() - posted) * 1000
+                self.slow_total += 1
+                self.slow_callbacks.append({
+                    "detected_at": datetime.now().isoformat(),
+                    "duration_ms": round(duration_ms, 1),
+                    "stack": stack,
+                    "collapsed": collapsed
+                })
+                print(f"⚠️  Slow callback blocked the event loop for {duration_ms:.0f} ms at {collapsed.rsplit(';', 1)[-1]}")
+            self._stop.wait(self.check_interval)
+
+    def profile(self, seconds: float, hz: float = 100.0, all_threads: bool = False) -> str:
+        """Sample stacks for `seconds` (blocking - run it off the loop) and return collapsed stacks.
+
+        Raises RuntimeError if another profile is already running.
+        """
+        if not self._profile_lock.acquire(blocking=False):
+            raise RuntimeError("A profile is already running")
+        try:
+            counts: Counter = Counter()
+            me = threading.get_ident()
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            interval = 1.0 / hz
+            deadline = time.perf_counter() + seconds
+            while time.perf_counter() < deadline:
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id == me or (not all_threads and thread_id != self._loop_thread_id):
+                        continue
+                    stack = collapse_stack(frame)
+                    if all_threads:
+                        stack = f"{names.get(thread_id, thread_id)};{stack}"
+                    counts[stack] += 1
+                time.sleep(interval)
+            return "".join(f"{stack} {count}\n" for stack, count in counts.most_common())
+        finally:
+            self._profile_lock.release()
+
+    def get_slow_callbacks(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recent slow callbacks, newest first"""
+        return list(self.slow_callbacks)[::-1][:limit]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "watchdog_running": self._watchdog is not None,
+            "slow_ms": self.slow_ms,
+            "slow_callbacks": self.slow_total
+        }
+
+
+# Global instance
+loop_profiler = LoopProfiler()
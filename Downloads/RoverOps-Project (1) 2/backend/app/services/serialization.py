@@ -0,0 +1,106 @@
+import json
+import os
+import re
+import uuid
+from datetime import date, datetime, time
+from enum import Enum
+from typing import Any, List
+
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+from app.models.log_buffer import LogBuffer
+
+try:
+    import orjson  # Optional: much faster encoder, same output for our payloads
+except ImportError:
+    orjson = None
+
+# JSON_BACKEND=auto (orjson when installed), orjson or stdlib
+_requested = os.getenv("JSON_BACKEND", "auto").lower()
+if _requested == "orjson" and orjson is None:
+    print("JSON_BACKEND=orjson but orjson is not installed, using the stdlib encoder")
+BACKEND = "orjson" if orjson is not None and _requested in ("auto", "orjson") else "stdlib"
+
+# Stand-in string for RawJSON in the stdlib encoder; NUL bytes make it impossible to collide with real text
+_RAW_MARK = f"\x00raw-{uuid.uuid4().hex}:"
+_RAW_PATTERN = re.compile(re.escape(json.dumps(_RAW_MARK)[:-1]).encode("ascii") + rb'(\d+)"')
+
+
+class RawJSON:
+    """Already-serialized JSON, embedded verbatim wherever it appears in a payload"""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+
+def _default(obj: Any) -> Any:
+    """Types neither encoder handles natively (unknown objects fall back to str, as before)"""
+    if isinstance(obj, BaseModel):
+        if isinstance(getattr(obj, "logs", None), LogBuffer):
+            return RawJSON(encode_mission(obj))
+        return RawJSON(obj.model_dump_json().encode("utf-8"))
+    if isinstance(obj, LogBuffer):
+        return RawJSON(b"[" + b",".join(obj.iter_json()) + b"]")
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    return str(obj)
+
+
+def _orjson_default(obj: Any) -> Any:
+    if isinstance(obj, RawJSON):
+        return orjson.Fragment(obj.data)
+    return _default(obj)
+
+
+def dumps_orjson(obj: Any) -> bytes:
+    return orjson.dumps(obj, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def dumps_stdlib(obj: Any) -> bytes:
+    raw: List[bytes] = []
+
+    def default(value: Any) -> Any:
+        if isinstance(value, RawJSON):
+            raw.append(value.data)
+            return f"{_RAW_MARK}{len(raw) - 1}"
+        return _default(value)
+
+    data = json.dumps(obj, default=default, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    if raw:
+        data = _RAW_PATTERN.sub(lambda match: raw[int(match.group(1))], data)
+    return data
+
+
+dumps = dumps_orjson if BACKEND == "orjson" else dumps_stdlib
+
+
+def dumps_text(obj: Any) -> str:
+    """dumps() as str, for WebSocket text frames"""
+    return dumps(obj).decode("utf-8")
+
+
+def encode_mission(mission: BaseModel) -> bytes:
+    """A mission's full JSON, reusing each log's cached bytes instead of re-encoding history.
+
+    Reads spilled logs from disk - run it off the loop for long missions.
+    """
+    return encode_mission_parts(mission.model_dump_json(exclude={"logs"}).encode("utf-8"), mission.logs)
+
+
+def encode_mission_parts(head: bytes, logs: LogBuffer) -> bytes:
+    """encode_mission from a snapshot taken on the loop: the mission's JSON without logs, and a frozen LogBuffer"""
+    return head[:-1] + b',"logs":[' + b",".join(logs.iter_json()) + b"]}"
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with the fast encoder (RawJSON pieces are spliced in as-is)"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,448 @@
+import asyncio
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from dotenv import load_dotenv
+
+from app.services.serialization import dumps_text
+
+load_dotenv()
+
+EventHandler = Callable[[Dict[str, Any], str], Awaitable[None]]
+
+SQLITE_SHARED_SCHEMA = """
+CREATE TABLE IF NOT EXISTS shared_missions (
+    mission_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS shared_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    channel TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS shared_claims (
+    claim_key TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    claimed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS shared_leases (
+    lease_key TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+# Compare-and-set scripts: only the worker holding a lease may extend or drop it
+REDIS_RENEW_LEASE = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('pexpire', KEYS[1], ARGV[2]) else return 0 end"
+REDIS_RELEASE_LEASE = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) else return 0 end"
+
+
+def mission_lease(mission_id: str) -> str:
+    """Lease held by the worker running a mission"""
+    return f"mission:{mission_id}"
+
+
+class SharedStateBackend:
+    """State shared between uvicorn workers: mission snapshots, fan-out events and claims.
+
+    This base class is the in-process backend used with a single worker:
+    nothing leaves the process, `shared` is False and callers keep using
+    their local structures. Shared backends set `shared` and deliver every
+    published event to `listen()` in every worker, the publisher included.
+    """
+
+    shared = False
+    name = "local"
+
+    def __init__(self):
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.lease_ttl = float(os.getenv("SHARED_STATE_LEASE_TTL", 30))
+
+    def put_mission(self, mission_id: str, status: str, payload: str):
+        """Store the latest JSON snapshot of a mission (never blocks the caller)"""
+
+    def get_mission(self, mission_id: str) -> Optional[Tuple[float, str]]:
+        """(updated_at, JSON snapshot) of a mission stored by any worker, or None"""
+        return None
+
+    def publish(self, channel: str, message: Dict[str, Any]):
+        """Send an event to every worker listening (never blocks the caller)"""
+
+    async def listen(self, handler: EventHandler):
+        """Call handler(message, channel) for every published event until cancelled"""
+
+    def claim(self, key: str) -> bool:
+        """Atomically claim a one-off job; True for exactly one worker"""
+        return True
+
+    def acquire_lease(self, key: str) -> bool:
+        """Take (or keep) ownership of `key`; False while another worker's lease on it is live.
+
+        Held leases are renewed by `keep_leases()` every lease_ttl / 3 seconds,
+        so a lease only lapses when its worker died or stopped renewing.
+        """
+        return True
+
+    def release_lease(self, key: str):
+        pass
+
+    def release_leases(self):
+        """Drop every lease this worker holds (at shutdown, after checkpoints are flushed)"""
+
+    async def keep_leases(self, on_lost: Optional[Callable[[str], None]] = None):
+        """Renew this worker's leases until cancelled; `on_lost` is called with each lease another worker took over"""
+
+    def close(self):
+        pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"backend": self.name, "shared": self.shared, "worker_id": self.worker_id}
+
+
+class _WriteBehindBackend(SharedStateBackend):
+    """Shared backend whose writes are coalesced and applied by a writer thread.
+
+    Snapshots of the same mission collapse to the latest one, so a busy
+    mission costs one write per flush no matter how often it is published.
+    Subclasses implement `_connect()`, `_apply()` and the read side.
+    """
+
+    shared = True
+
+    def __init__(self, url: str, flush_interval: Optional[float] = None):
+        super().__init__()
+        self.url = url
+        self.flush_interval = flush_interval if flush_interval is not None else float(os.getenv("SHARED_STATE_FLUSH_INTERVAL", 0.02))
+        self._missions: Dict[str, Tuple[str, float, str]] = {}
+        self._events: List[Tuple[str, str]] = []
+        self._wakeup = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._leases: set = set()
+        self.published = 0
+        self.delivered = 0
+        self.snapshots_written = 0
+        self.errors = 0
+
+    def _ensure_writer(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=f"shared-state-{self.name}", daemon=True)
+            self._thread.start()
+
+    def put_mission(self, mission_id: str, status: str, payload: str):
+        with self._wakeup:
+            self._missions[mission_id] = (status, time.time(), payload)
+            self._ensure_writer()
+            self._wakeup.notify()
+
+    def publish(self, channel: str, message: Dict[str, Any]):
+        payload = dumps_text(message)
+        with self._wakeup:
+            self._events.append((channel, payload))
+            self.published += 1
+            self._ensure_writer()
+            self._wakeup.notify()
+
+    def _run(self):
+        conn = self._connect()
+        while True:
+            with self._wakeup:
+                while not self._missions and not self._events and not self._stopping:
+                    self._wakeup.wait()
+                if self._stopping and not self._missions and not self._events:
+                    break
+            time.sleep(self.flush_interval)  # Let a burst of updates coalesce
+            with self._wakeup:
+                missions, self._missions = self._missions, {}
+                events, self._events = self._events, []
+            try:
+                self._apply(conn, missions, events)
+                self.snapshots_written += len(missions)
+            except Exception as e:
+                self.errors += 1
+                print(f"Error writing shared state ({len(missions)} missions, {len(events)} events): {e}")
+        self._disconnect(conn)
+
+    def _disconnect(self, conn: Any):
+        pass
+
+    def acquire_lease(self, key: str) -> bool:
+        if not self._acquire(key):
+            return False
+        self._leases.add(key)
+        return True
+
+    def release_lease(self, key: str):
+        self._leases.discard(key)
+        try:
+            self._release(key)
+        except Exception as e:
+            print(f"Error releasing lease {key}: {e}")
+
+    def release_leases(self):
+        for key in list(self._leases):
+            self.release_lease(key)
+
+    async def keep_leases(self, on_lost: Optional[Callable[[str], None]] = None):
+        while True:
+            await asyncio.sleep(self.lease_ttl / 3)
+            held = list(self._leases)
+            if not held:
+                continue
+            try:
+                lost = await asyncio.to_thread(self._renew, held)
+            except Exception as e:
+                print(f"Error renewing leases: {e}")
+                continue
+            for key in lost:
+                print(f"Lease {key} was lost to another worker")
+                self._leases.discard(key)
+                if on_lost:
+                    on_lost(key)
+
+    def close(self, timeout: float = 5.0):
+        with self._wakeup:
+            self._stopping = True
+            self._wakeup.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        stats.update({
+            "leases": len(self._leases),
+            "published": self.published,
+            "delivered": self.delivered,
+            "snapshots_written": self.snapshots_written,
+            "errors": self.errors
+        })
+        return stats
+
+
+class SQLiteSharedState(_WriteBehindBackend):
+    """Shared state in one SQLite file (WAL) for workers on the same host.
+
+    Events go to an append-only table that every worker polls; rows older
+    than `event_ttl` seconds are pruned. Leases are rows with an expiry
+    time. Put the file on a tmpfs such as /dev/shm to keep it in shared
+    memory.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, url: str, poll_interval: Optional[float] = None, event_ttl: Optional[float] = None):
+        super().__init__(url)
+        self.path = url.split("sqlite:///", 1)[1] if "sqlite:///" in url else url
+        self.poll_interval = poll_interval if poll_interval is not None else float(os.getenv("SHARED_STATE_POLL_INTERVAL", 0.05))
+        self.event_ttl = event_ttl if event_ttl is not None else float(os.getenv("SHARED_STATE_EVENT_TTL", 60))
+        self._last_prune = 0.0
+        self._readers = threading.local()
+        conn = self._connect()  # Create the schema up front so readers never see missing tables
+        conn.close()
+
+    def _connect(self):
+        import sqlite3
+        conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SQLITE_SHARED_SCHEMA)
+        return conn
+
+    def _disconnect(self, conn: Any):
+        conn.close()
+
+    def _apply(self, conn: Any, missions: Dict[str, Tuple[str, float, str]], events: List[Tuple[str, str]]):
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if missions:
+                conn.executemany(
+                    "INSERT INTO shared_missions (mission_id, status, updated_at, payload) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(mission_id) DO UPDATE SET status = excluded.status, updated_at = excluded.updated_at, payload = excluded.payload",
+                    [(mission_id, status, at, payload) for mission_id, (status, at, payload) in missions.items()]
+                )
+            if events:
+                conn.executemany(
+                    "INSERT INTO shared_events (channel, payload, created_at) VALUES (?, ?, ?)",
+                    [(channel, payload, now) for channel, payload in events]
+                )
+            if now - self._last_prune >= self.event_ttl:
+                conn.execute("DELETE FROM shared_events WHERE created_at < ?", (now - self.event_ttl,))
+                self._last_prune = now
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _reader(self):
+        """Per-thread read connection (reads run in the to_thread pool)"""
+        conn = getattr(self._readers, "conn", None)
+        if conn is None:
+            import sqlite3
+            conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False, isolation_level=None)
+            self._readers.conn = conn
+        return conn
+
+    def get_mission(self, mission_id: str) -> Optional[Tuple[float, str]]:
+        row = self._reader().execute("SELECT updated_at, payload FROM shared_missions WHERE mission_id = ?", (mission_id,)).fetchone()
+        return (row[0], row[1]) if row else None
+
+    async def listen(self, handler: EventHandler):
+        conn = await asyncio.to_thread(self._connect)
+        try:
+            row = await asyncio.to_thread(lambda: conn.execute("SELECT COALESCE(MAX(id), 0) FROM shared_events").fetchone())
+            last_id = row[0]
+            while True:
+                rows = await asyncio.to_thread(
+                    lambda: conn.execute(
+                        "SELECT id, channel, payload FROM shared_events WHERE id > ? ORDER BY id LIMIT 1000", (last_id,)
+                    ).fetchall()
+                )
+                for event_id, channel, payload in rows:
+                    last_id = event_id
+                    self.delivered += 1
+                    try:
+                        await handler(json.loads(payload), channel)
+                    except Exception as e:
+                        print(f"Error delivering shared event on {channel}: {e}")
+                if len(rows) < 1000:
+                    await asyncio.sleep(self.poll_interval)
+        finally:
+            conn.close()
+
+    def claim(self, key: str) -> bool:
+        cursor = self._reader().execute(
+            "INSERT OR IGNORE INTO shared_claims (claim_key, owner, claimed_at) VALUES (?, ?, ?)",
+            (key, self.worker_id, time.time())
+        )
+        return cursor.rowcount == 1
+
+    def _acquire(self, key: str) -> bool:
+        now = time.time()
+        cursor = self._reader().execute(
+            "INSERT INTO shared_leases (lease_key, owner, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(lease_key) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+            "WHERE shared_leases.owner = excluded.owner OR shared_leases.expires_at < ?",
+            (key, self.worker_id, now + self.lease_ttl, now)
+        )
+        return cursor.rowcount == 1
+
+    def _renew(self, keys: List[str]) -> List[str]:
+        conn = self._reader()
+        expires_at = time.time() + self.lease_ttl
+        return [
+            key for key in keys
+            if conn.execute(
+                "UPDATE shared_leases SET expires_at = ? WHERE lease_key = ? AND owner = ?", (expires_at, key, self.worker_id)
+            ).rowcount == 0
+        ]
+
+    def _release(self, key: str):
+        self._reader().execute("DELETE FROM shared_leases WHERE lease_key = ? AND owner = ?", (key, self.worker_id))
+
+
+class RedisSharedState(_WriteBehindBackend):
+    """Shared state in Redis for workers spread over several hosts.
+
+    Snapshots are plain keys (expiring after `snapshot_ttl` seconds), events
+    use Redis pub/sub, claims use SET NX and leases are keys with a PX
+    expiry. Needs the optional `redis` package.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str, prefix: Optional[str] = None, snapshot_ttl: Optional[int] = None):
+        import redis  # Optional dependency, only needed for multi-host deployments
+        super().__init__(url)
+        self._redis = redis
+        self.prefix = prefix or os.getenv("SHARED_STATE_PREFIX", "roverops")
+        self.snapshot_ttl = snapshot_ttl if snapshot_ttl is not None else int(os.getenv("SHARED_STATE_SNAPSHOT_TTL", 86400))
+        self._client = redis.Redis.from_url(url)
+        self._renew_script = self._client.register_script(REDIS_RENEW_LEASE)
+        self._release_script = self._client.register_script(REDIS_RELEASE_LEASE)
+
+    def _key(self, *parts: str) -> str:
+        return ":".join((self.prefix,) + parts)
+
+    def _connect(self):
+        return self._client
+
+    def _apply(self, conn: Any, missions: Dict[str, Tuple[str, float, str]], events: List[Tuple[str, str]]):
+        pipe = conn.pipeline(transaction=False)
+        for mission_id, (status, at, payload) in missions.items():
+            pipe.set(self._key("mission", mission_id), json.dumps([at, payload]), ex=self.snapshot_ttl)
+        for channel, payload in events:
+            pipe.publish(self._key("events", channel), payload)
+        pipe.execute()
+
+    def get_mission(self, mission_id: str) -> Optional[Tuple[float, str]]:
+        raw = self._client.get(self._key("mission", mission_id))
+        if raw is None:
+            return None
+        at, payload = json.loads(raw)
+        return at, payload
+
+    async def listen(self, handler: EventHandler):
+        from redis import asyncio as redis_asyncio
+        client = redis_asyncio.Redis.from_url(self.url)
+        pubsub = client.pubsub()
+        events_prefix = self._key("events", "")
+        await pubsub.psubscribe(events_prefix + "*")
+        try:
+            async for item in pubsub.listen():
+                if item.get("type") != "pmessage":
+                    continue
+                channel = item["channel"].decode() if isinstance(item["channel"], bytes) else item["channel"]
+                self.delivered += 1
+                try:
+                    await handler(json.loads(item["data"]), channel[len(events_prefix):])
+                except Exception as e:
+                    print(f"Error delivering shared event on {channel}: {e}")
+        finally:
+            await pubsub.close()
+            await client.close()
+
+    def claim(self, key: str) -> bool:
+        return bool(self._client.set(self._key("claim", key), self.worker_id, nx=True, ex=self.snapshot_ttl))
+
+    def _acquire(self, key: str) -> bool:
+        ttl_ms = int(self.lease_ttl * 1000)
+        if self._client.set(self._key("lease", key), self.worker_id, nx=True, px=ttl_ms):
+            return True
+        return bool(self._renew_script(keys=[self._key("lease", key)], args=[self.worker_id, ttl_ms]))
+
+    def _renew(self, keys: List[str]) -> List[str]:
+        ttl_ms = int(self.lease_ttl * 1000)
+        return [key for key in keys if not self._renew_script(keys=[self._key("lease", key)], args=[self.worker_id, ttl_ms])]
+
+    def _release(self, key: str):
+        self._release_script(keys=[self._key("lease", key)], args=[self.worker_id])
+
+
+def create_shared_state(url: Optional[str] = None) -> SharedStateBackend:
+    """Backend for SHARED_STATE_URL: unset = in-process, sqlite:///path or redis://host:port/db"""
+    url = url if url is not None else os.getenv("SHARED_STATE_URL", "")
+    if not url:
+        return SharedStateBackend()
+    scheme = urlparse(url).scheme
+    try:
+        if scheme == "sqlite":
+            return SQLiteSharedState(url)
+        if scheme in ("redis", "rediss"):
+            return RedisSharedState(url)
+        raise ValueError(f"Unsupported SHARED_STATE_URL scheme: {scheme}")
+    except Exception as e:
+        print(f"Shared state disabled, running single-worker: {e}")
+        return SharedStateBackend()
+
+
+# Global instance
+shared_state = create_shared_state()
@@ -0,0 +1,77 @@
+import struct
+from typing import Any, Dict, List, Optional, Union
+
+from app.models.schemas import AgentStatus, AgentType, MissionStatus
+from app.services.serialization import dumps_text
+from app.services.update_coalescer import log_key
+
+# Sec-WebSocket-Protocol a client offers on /ws/mission/{id} to get update frames in binary
+TELEMETRY_SUBPROTOCOL = "rover-telemetry.v1"
+
+# Enum codes are the members' positions, so new members must only ever be appended
+MISSION_STATUS_CODES = [status.value for status in MissionStatus]
+AGENT_STATUS_CODES = [status.value for status in AgentStatus]
+AGENT_ORDER = [agent.value for agent in AgentType]
+NO_AGENT_STATE = 0xFF
+
+TELEMETRY_FRAME = 1
+# frame type, mission status, x, y, current step, total steps, then one agent status byte per AGENT_ORDER entry
+_FRAME = struct.Struct(f"<BBhhHH{len(AGENT_ORDER)}s")
+
+
+def encode_telemetry(data: Dict[str, Any]) -> bytes:
+    """Binary telemetry frame (16 bytes) for the `data` of an update frame"""
+    position = data.get("rover_position") or {}
+    agent_states = data.get("agent_states") or {}
+    agents = bytes(
+        AGENT_STATUS_CODES.index(agent_states[agent]) if agent in agent_states else NO_AGENT_STATE
+        for agent in AGENT_ORDER
+    )
+    return _FRAME.pack(
+        TELEMETRY_FRAME,
+        MISSION_STATUS_CODES.index(data["status"]),
+        position.get("x", 0),
+        position.get("y", 0),
+        data.get("current_step", 0),
+        data.get("total_steps", 0),
+        agents
+    )
+
+
+def decode_telemetry(frame: bytes) -> Dict[str, Any]:
+    """The update `data` (without logs) a telemetry frame stands for"""
+    kind, status, x, y, current_step, total_steps, agents = _FRAME.unpack(frame)
+    if kind != TELEMETRY_FRAME:
+        raise ValueError(f"Unknown telemetry frame type {kind}")
+    return {
+        "rover_position": {"x": x, "y": y},
+        "current_step": current_step,
+        "total_steps": total_steps,
+        "status": MISSION_STATUS_CODES[status],
+        "agent_states": {agent: AGENT_STATUS_CODES[code] for agent, code in zip(AGENT_ORDER, agents) if code != NO_AGENT_STATE}
+    }
+
+
+class TelemetryStream:
+    """Turns a connection's update frames into binary telemetry plus a JSON `log` frame for new logs only.
+
+    Update frames repeat the last logs every time; the stream remembers the
+    last log it sent so each log goes to the client once.
+    """
+
+    __slots__ = ("_last_log",)
+
+    def __init__(self):
+        self._last_log: Optional[Any] = None
+
+    def frames(self, message: Dict[str, Any]) -> List[Union[bytes, str]]:
+        data = message.get("data") or {}
+        frames: List[Union[bytes, str]] = [encode_telemetry(data)]
+        logs = data.get("logs") or []
+        keys = [log_key(log) for log in logs]
+        if self._last_log in keys:
+            logs = logs[keys.index(self._last_log) + 1:]
+        if logs:
+            self._last_log = keys[-1]
+            frames.append(dumps_text({"type": "log", "mission_id": message.get("mission_id"), "data": {"logs": logs}}))
+        return frames
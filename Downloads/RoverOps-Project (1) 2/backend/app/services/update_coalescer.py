@@ -0,0 +1,84 @@
+import asyncio
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.services.serialization import RawJSON
+
+# Window in which a mission's node transitions are merged into one update frame (0 = a frame per node)
+UPDATE_TICK_MS = float(os.getenv("MISSION_UPDATE_TICK_MS", 50))
+MAX_UPDATE_LOGS = 100
+
+
+def log_key(log: Any) -> Any:
+    if isinstance(log, RawJSON):
+        return log.data
+    return (log.get("timestamp"), log.get("message")) if isinstance(log, dict) else log
+
+
+def merge_updates(older: Dict[str, Any], newer: Dict[str, Any]) -> Dict[str, Any]:
+    """One update frame standing for two: the newer state, with the logs of both"""
+    newer_logs = newer.get("data", {}).get("logs") or []
+    seen = {log_key(log) for log in newer_logs}
+    older_logs = [log for log in older.get("data", {}).get("logs") or [] if log_key(log) not in seen]
+    if not older_logs:
+        return newer
+    return {**newer, "data": {**newer["data"], "logs": (older_logs + newer_logs)[-MAX_UPDATE_LOGS:]}}
+
+
+class Coalescer:
+    """Emits at most once per tick, always the latest value submitted.
+
+    A value arriving after a quiet tick goes out at once; values arriving
+    within the tick replace each other (or are combined with `merge`) and the
+    result is emitted when the tick ends. `flush()` emits whatever is held
+    right away - call it before anything that must not overtake the held
+    value (terminal events).
+    """
+
+    __slots__ = ("tick", "_emit", "_merge", "_value", "_held", "_last", "_timer")
+
+    def __init__(self, tick_ms: float, emit: Callable[[Any], Awaitable[None]], merge: Optional[Callable[[Any, Any], Any]] = None):
+        self.tick = tick_ms / 1000
+        self._emit = emit
+        self._merge = merge
+        self._value: Any = None
+        self._held = False
+        self._last = float("-inf")
+        self._timer: Optional[asyncio.Task] = None
+
+    async def submit(self, value: Any = None):
+        if self._held and self._merge:
+            value = self._merge(self._value, value)
+        self._value, self._held = value, True
+        if self._timer is None:
+            wait = self._last + self.tick - time.monotonic()
+            if wait <= 0:
+                await self.flush()
+            else:
+                self._timer = asyncio.create_task(self._emit_after(wait))
+
+    async def _emit_after(self, wait: float):
+        await asyncio.sleep(wait)
+        self._timer = None
+        try:
+            await self.flush()
+        except Exception as e:
+            print(f"Error emitting coalesced update: {e}")
+
+    async def flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._held:
+            return
+        value, self._value, self._held = self._value, None, False
+        self._last = time.monotonic()
+        await self._emit(value)
+
+    def close(self):
+        """Drop the held value without emitting it"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._value, self._held = None, False
@@ -0,0 +1,141 @@
+import asyncio
+import os
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from fastapi import WebSocket
+
+from app.services.campaigns import campaign_manager
+from app.services.serialization import RawJSON, dumps, dumps_text
+from app.services.update_coalescer import merge_updates
+
+ALL_MISSIONS = "all"
+CAMPAIGN_PREFIX = "campaign:"
+
+
+class MultiplexClient:
+    """One multiplexed connection: its subscriptions and the frames waiting for the next tick"""
+
+    __slots__ = ("websocket", "tick", "subscriptions", "pending", "updates", "wake", "task")
+
+    def __init__(self, websocket: WebSocket, tick: float):
+        self.websocket = websocket
+        self.tick = tick  # Seconds between batches
+        self.subscriptions: Set[str] = set()  # Mission ids, "all" and campaign channels
+        self.pending: List[RawJSON] = []
+        self.updates: Dict[str, Tuple[int, Dict[str, Any]]] = {}  # mission_id -> (pending index, message) of its update frame
+        self.wake = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+
+class MultiplexHub:
+    """Many missions over one WebSocket, sent as one combined frame per tick.
+
+    A client subscribes to mission ids, to "all" (every mission) or to a
+    campaign ("campaign:<id>": its progress and lifecycle frames, plus the
+    update frames of its missions known to this worker). Every frame routed
+    here is encoded once, however many clients get it; each client collects
+    its frames and a per-client task sends them as a single
+    {"type": "batch", "frames": [...]} frame every tick. Within a batch a
+    mission's update frames are merged into one (newest state, logs of all),
+    unless another frame of that mission came between them.
+    """
+
+    def __init__(self, tick_ms: Optional[float] = None, min_tick_ms: Optional[float] = None, max_tick_ms: Optional[float] = None):
+        self.tick_ms = tick_ms or float(os.getenv("WS_MULTIPLEX_TICK_MS", 100))
+        self.min_tick_ms = min_tick_ms or float(os.getenv("WS_MULTIPLEX_MIN_TICK_MS", 20))
+        self.max_tick_ms = max_tick_ms or float(os.getenv("WS_MULTIPLEX_MAX_TICK_MS", 5000))
+        self._subscribers: Dict[str, Set[MultiplexClient]] = {}  # subscription -> clients
+        self.clients: Set[MultiplexClient] = set()
+
+    def _tick(self, tick_ms: Optional[float]) -> float:
+        return min(max(tick_ms or self.tick_ms, self.min_tick_ms), self.max_tick_ms) / 1000
+
+    async def connect(self, websocket: WebSocket, tick_ms: Optional[float] = None) -> MultiplexClient:
+        await websocket.accept()
+        client = MultiplexClient(websocket, self._tick(tick_ms))
+        client.task = asyncio.create_task(self._send_batches(client))
+        self.clients.add(client)
+        return client
+
+    def disconnect(self, client: MultiplexClient):
+        self.unsubscribe(client, list(client.subscriptions))
+        self.clients.discard(client)
+        if client.task and client.task is not asyncio.current_task():
+            client.task.cancel()
+
+    def subscribe(self, client: MultiplexClient, targets: Iterable[str], tick_ms: Optional[float] = None) -> List[str]:
+        """Add subscriptions (and change the client's tick if given); returns the ones that are new"""
+        if tick_ms:
+            client.tick = self._tick(tick_ms)
+        added = []
+        for target in targets:
+            if target not in client.subscriptions:
+                client.subscriptions.add(target)
+                self._subscribers.setdefault(target, set()).add(client)
+                added.append(target)
+        return added
+
+    def unsubscribe(self, client: MultiplexClient, targets: Iterable[str]):
+        for target in targets:
+            client.subscriptions.discard(target)
+            clients = self._subscribers.get(target)
+            if clients is not None:
+                clients.discard(client)
+                if not clients:
+                    del self._subscribers[target]
+
+    def send(self, client: MultiplexClient, message: Dict[str, Any]):
+        """Queue a frame for one client (replies go out with the next batch too)"""
+        self._push(client, RawJSON(dumps(message)))
+
+    def route(self, message: Dict[str, Any], channel: str):
+        """Queue a broadcast frame for every client subscribed to it (called for each channel it is sent on)"""
+        if not self._subscribers:
+            return
+        if channel.startswith(CAMPAIGN_PREFIX):
+            clients = self._subscribers.get(channel, set())
+        else:
+            clients = self._subscribers.get(channel, set()) | self._subscribers.get(ALL_MISSIONS, set())
+            # Lifecycle frames reach campaign subscribers on the campaign channel; updates only here
+            campaign = campaign_manager.channel_of(channel) if message.get("type") == "update" else None
+            if campaign:
+                clients = clients | self._subscribers.get(campaign, set())
+        if not clients:
+            return
+        frame = RawJSON(dumps(message))  # Encode once for every client
+        mission_id = message.get("mission_id")
+        for client in clients:
+            if message.get("type") == "update" and mission_id in client.updates:
+                index, held = client.updates[mission_id]
+                merged = merge_updates(held, message)
+                client.pending[index] = frame if merged is message else RawJSON(dumps(merged))
+                client.updates[mission_id] = (index, merged)
+                continue
+            if message.get("type") == "update":
+                client.updates[mission_id] = (len(client.pending), message)
+            elif mission_id:
+                client.updates.pop(mission_id, None)  # Later updates must not move ahead of this frame
+            self._push(client, frame)
+
+    @staticmethod
+    def _push(client: MultiplexClient, frame: RawJSON):
+        client.pending.append(frame)
+        client.wake.set()
+
+    async def _send_batches(self, client: MultiplexClient):
+        try:
+            while True:
+                await client.wake.wait()
+                await asyncio.sleep(client.tick)  # Collect whatever else arrives within the tick
+                client.wake.clear()
+                frames, client.pending, client.updates = client.pending, [], {}
+                await client.websocket.send_text(dumps_text({"type": "batch", "frames": frames}))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Error sending multiplexed batch: {e}")
+            self.disconnect(client)
+
+
+# Global instance
+multiplex_hub = MultiplexHub()
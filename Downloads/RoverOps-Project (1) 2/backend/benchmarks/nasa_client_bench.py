@@ -0,0 +1,83 @@
+"""Benchmark NASAClient against the local NASA stand-in (no network needed).
+
+Measures cold (stand-in hit) vs warm (disk/memory cache) fetch latency and reports how
+many requests actually reached the stand-in, under the injected latency/fault settings.
+
+    python -m benchmarks.nasa_client_bench --latency-ms 80 --rate-limit-rate 0.1
+"""
+import argparse
+import asyncio
+import os
+import socket
+import tempfile
+import threading
+import time
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_standin(faults, port: int):
+    import uvicorn
+    from nasa_standin import create_app
+
+    server = uvicorn.Server(uvicorn.Config(create_app(faults), host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
+
+
+async def _timed(label: str, calls):
+    start = time.perf_counter()
+    results = await asyncio.gather(*calls)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"{label:<34} {len(results):>4} calls  {elapsed:8.1f} ms total")
+    return results
+
+
+async def run(args):
+    from app.services.nasa_client import NASAClient
+
+    sols = list(range(1000, 1000 + args.sols))
+    for attempt in ("cold", "warm (disk cache)"):
+        client = NASAClient()  # Fresh client: empty memory cache, shared disk cache
+        await _timed(f"rover photos, {attempt}", [client.get_rover_photos(sol=sol, camera="NAVCAM") for sol in sols])
+        await _timed(f"apod, {attempt}", [client.get_apod(days_back=d) for d in range(args.sols)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sols", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    from nasa_standin import FaultConfig
+
+    port = _free_port()
+    server = _start_standin(FaultConfig(
+        latency_ms=args.latency_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        seed=args.seed
+    ), port)
+    os.environ["NASA_API_BASE_URL"] = f"http://127.0.0.1:{port}"
+    os.environ["NASA_CACHE_DIR"] = tempfile.mkdtemp(prefix="nasa-bench-")
+
+    try:
+        asyncio.run(run(args))
+        import httpx
+        print("stand-in request counts:", httpx.get(f"http://127.0.0.1:{port}/_standin/stats").json()["requests"])
+    finally:
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Benchmark mission payload serialization: the legacy FastAPI/stdlib path vs the serialization layer.
+
+Builds one large mission (many logs, part of them spilled to disk) and measures:
+  * full status response - legacy: response_model validation + jsonable_encoder + json.dumps;
+    new: dumps() with each log's cached bytes spliced in (stdlib and, if installed, orjson)
+  * WebSocket update frame fan-out - legacy: send_json re-encodes the frame for every client;
+    new: the frame is encoded once, its logs taken from their cached bytes
+
+    python -m benchmarks.serialization_bench --logs 5000 --clients 20
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+
+def measure(label: str, fn, repeat: int, payload_bytes: int) -> float:
+    fn()  # Warm up (and fill the per-log caches)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    per_call = (time.perf_counter() - start) / repeat
+    print(f"{label:<44} {per_call * 1000:8.3f} ms/call  {payload_bytes / per_call / 1e6:8.1f} MB/s")
+    return per_call
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logs", type=int, default=5000)
+    parser.add_argument("--steps", type=int, default=50)
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    os.environ.setdefault("MISSION_LOG_DIR", tempfile.mkdtemp(prefix="serialization-bench-"))
+    from fastapi.encoders import jsonable_encoder
+
+    from app.models.schemas import AgentType, MissionLog, MissionState, MissionStatusResponse, MissionStep, RoverPosition
+    from app.services import serialization
+    from app.services.serialization import RawJSON, dumps_stdlib
+
+    agents = list(AgentType)
+    mission = MissionState(mission_id="bench", goal="Survey the crater rim and return to base")
+    mission.steps = [
+        MissionStep(step_number=i + 1, action="move", target_position=RoverPosition(x=i % 10, y=i // 10), description=f"Step {i + 1}")
+        for i in range(args.steps)
+    ]
+    for i in range(args.logs):
+        mission.logs.append(MissionLog(
+            mission_id="bench",
+            agent_type=agents[i % len(agents)],
+            message=f"Rover moved to ({i % 10}, {i // 10}) - terrain nominal, battery {100 - i % 100}%",
+            level="info",
+            data={"step": i % args.steps, "position": {"x": i % 10, "y": i // 10}} if i % 3 == 0 else None
+        ))
+    print(f"mission: {len(mission.logs)} logs ({mission.logs.resident_count} in memory), {len(mission.steps)} steps")
+
+    def legacy_status():
+        response = MissionStatusResponse(mission_id=mission.mission_id, status=mission.status, state=mission)
+        return json.dumps(jsonable_encoder(response), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    status = {"mission_id": mission.mission_id, "status": mission.status, "state": mission}
+    size = len(legacy_status())
+    print(f"\nfull status response ({size / 1e6:.2f} MB)")
+    legacy = measure("legacy (response_model + jsonable_encoder)", legacy_status, args.repeat, size)
+    encoders = [("stdlib", dumps_stdlib)]
+    if serialization.orjson is not None:
+        encoders.append(("orjson", serialization.dumps_orjson))
+    for name, encode in encoders:
+        elapsed = measure(f"serialization layer, {name}", lambda: encode(status), args.repeat, size)
+        print(f"{'':<44} {legacy / elapsed:8.1f}x")
+
+    tail = mission.logs.tail(10)
+    legacy_frame = {"type": "update", "mission_id": "bench", "data": {
+        "rover_position": {"x": 3, "y": 4}, "current_step": 3, "total_steps": args.steps, "status": "executing",
+        "logs": [{"mission_id": log.mission_id, "timestamp": log.timestamp.isoformat(), "agent_type": log.agent_type.value,
+                  "message": log.message, "level": log.level} for log in tail]
+    }}
+    frame = {**legacy_frame, "data": {**legacy_frame["data"], "logs": [RawJSON(log.json_bytes()) for log in tail]}}
+    frame_size = len(json.dumps(legacy_frame)) * args.clients
+    print(f"\nupdate frame to {args.clients} clients")
+    legacy = measure("legacy (send_json per client)", lambda: [json.dumps(legacy_frame, separators=(",", ":"), ensure_ascii=False) for _ in range(args.clients)], args.repeat * 50, frame_size)
+    for name, encode in encoders:
+        elapsed = measure(f"encoded once, {name}", lambda: encode(frame).decode("utf-8"), args.repeat * 50, frame_size)
+        print(f"{'':<44} {legacy / elapsed:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+"""Local stand-in for the NASA APIs used by RoverOps (mars-photos, insight_weather, planetary/apod).
+
+Serves realistic responses from fixtures with injectable latency, errors and 429s so
+cache, coalescing and retry behaviour can be exercised without network access:
+
+    python -m nasa_standin --port 8001 --latency-ms 80 --rate-limit-rate 0.05
+    NASA_API_BASE_URL=http://localhost:8001 python -m uvicorn app.main:app
+"""
+
+from nasa_standin.server import FaultConfig, create_app
+
+__all__ = ["FaultConfig", "create_app"]
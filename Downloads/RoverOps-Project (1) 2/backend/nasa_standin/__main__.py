@@ -0,0 +1,33 @@
+import argparse
+
+import uvicorn
+
+from nasa_standin.server import FaultConfig, create_app
+
+
+def main():
+    defaults = FaultConfig.from_env()
+    parser = argparse.ArgumentParser(description="Run the local NASA API stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms, help="Fixed delay added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=defaults.jitter_ms, help="Extra random delay, uniform in [0, jitter]")
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate, help="Fraction of requests failing with HTTP 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=defaults.rate_limit_rate, help="Fraction of requests failing with HTTP 429")
+    parser.add_argument("--hourly-limit", type=int, default=defaults.hourly_limit, help="Requests allowed per hour before 429s (0 = unlimited)")
+    parser.add_argument("--seed", type=int, default=defaults.seed, help="Seed for jitter/fault randomness")
+    args = parser.parse_args()
+
+    faults = FaultConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        hourly_limit=args.hourly_limit,
+        seed=args.seed
+    )
+    uvicorn.run(create_app(faults), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+CONTROL_PREFIX = "/_standin"
+
+
+def _load_fixture(name: str) -> Any:
+    with open(FIXTURES_DIR / name) as f:
+        return json.load(f)
+
+
+def _stable_int(*parts: Any) -> int:
+    """Deterministic integer from request parameters, so the same query always returns the same photos"""
+    digest = hashlib.sha256("|".join(str(p) for p in parts).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+class FaultConfig:
+    """Injectable latency and failures for the stand-in NASA API"""
+
+    FIELDS = ("latency_ms", "jitter_ms", "error_rate", "rate_limit_rate", "hourly_limit", "seed")
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        hourly_limit: int = 0,
+        seed: Optional[int] = None
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate  # Fraction of requests answered with HTTP 500
+        self.rate_limit_rate = rate_limit_rate  # Fraction of requests answered with HTTP 429
+        self.hourly_limit = hourly_limit  # Like api.nasa.gov's per-key quota; 0 disables it
+        self.seed = seed
+
+    @classmethod
+    def from_env(cls) -> "FaultConfig":
+        seed = os.getenv("NASA_STANDIN_SEED")
+        return cls(
+            latency_ms=float(os.getenv("NASA_STANDIN_LATENCY_MS", 0)),
+            jitter_ms=float(os.getenv("NASA_STANDIN_JITTER_MS", 0)),
+            error_rate=float(os.getenv("NASA_STANDIN_ERROR_RATE", 0)),
+            rate_limit_rate=float(os.getenv("NASA_STANDIN_RATE_LIMIT_RATE", 0)),
+            hourly_limit=int(os.getenv("NASA_STANDIN_HOURLY_LIMIT", 0)),
+            seed=int(seed) if seed else None
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def update(self, values: Dict[str, Any]):
+        for field in self.FIELDS:
+            if field in values:
+                setattr(self, field, values[field])
+
+
+class StandinState:
+    """Fault config, RNG and request counters shared by the stand-in endpoints"""
+
+    def __init__(self, faults: FaultConfig):
+        self.faults = faults
+        self.reset()
+
+    def reset(self):
+        self.rng = random.Random(self.faults.seed)
+        self.window_start = time.monotonic()
+        self.window_requests = 0
+        self.counters: Dict[str, Dict[str, int]] = {}
+
+    def count(self, endpoint: str, outcome: str):
+        bucket = self.counters.setdefault(endpoint, {})
+        bucket[outcome] = bucket.get(outcome, 0) + 1
+
+    def quota_remaining(self) -> Optional[int]:
+        if not self.faults.hourly_limit:
+            return None
+        if time.monotonic() - self.window_start >= 3600:
+            self.window_start = time.monotonic()
+            self.window_requests = 0
+        return max(self.faults.hourly_limit - self.window_requests, 0)
+
+
+def _endpoint_name(path: str) -> str:
+    if path.startswith("/mars-photos"):
+        return "mars-photos"
+    if path.startswith("/insight_weather"):
+        return "insight_weather"
+    if path.startswith("/planetary/apod"):
+        return "apod"
+    return path
+
+
+def _rate_limited(limit: int) -> JSONResponse:
+    return JSONResponse(
+        status_code=429,
+        content={"error": {"code": "OVER_RATE_LIMIT", "message": "You have exceeded your rate limit. Try again later."}},
+        headers={"X-RateLimit-Limit": str(limit), "X-RateLimit-Remaining": "0", "Retry-After": "3600"}
+    )
+
+
+def _build_photos(rover_name: str, rover: Dict[str, Any], sol: int, camera: Optional[str]) -> List[Dict[str, Any]]:
+    """Expand the rover manifest into the full, deterministic photo list for a sol"""
+    cameras = rover["cameras"]
+    rover_info = {k: rover[k] for k in ("id", "name", "landing_date", "launch_date", "status", "max_sol", "max_date", "total_photos")}
+    rover_info["cameras"] = [{"name": c["name"], "full_name": c["full_name"]} for c in cameras]
+    earth_date = (date.fromisoformat(rover["landing_earth_date"]) + timedelta(days=int(sol * 1.0275))).isoformat()
+
+    photos = []
+    for cam in cameras:
+        if camera and cam["name"] != camera.upper():
+            continue
+        count = _stable_int(rover_name, sol, cam["name"]) % (cam["max_per_sol"] + 1)
+        for n in range(count):
+            sclk = 400000000 + sol * 88775 + n * 37
+            photos.append({
+                "id": _stable_int(rover_name, sol, cam["name"], n) % 10_000_000,
+                "sol": sol,
+                "camera": {"id": cam["id"], "name": cam["name"], "rover_id": rover["id"], "full_name": cam["full_name"]},
+                "img_src": rover["img_src_template"].format(
+                    sol=sol, camera=cam["name"], camera_dir=cam["dir"], prefix=cam["prefix"], sclk=sclk
+                ),
+                "earth_date": earth_date,
+                "rover": rover_info
+            })
+    return photos
+
+
+def create_app(faults: Optional[FaultConfig] = None) -> FastAPI:
+    """Build the stand-in app serving mars-photos, insight_weather and planetary/apod from fixtures"""
+    app = FastAPI(title="NASA API stand-in", version="1.0.0")
+    state = StandinState(faults or FaultConfig.from_env())
+    app.state.standin = state
+
+    mars_photos = _load_fixture("mars_photos.json")
+    weather = _load_fixture("insight_weather.json")
+    apods = _load_fixture("apod.json")
+
+    @app.middleware("http")
+    async def inject_faults(request: Request, call_next):
+        if request.url.path.startswith(CONTROL_PREFIX):
+            return await call_next(request)
+
+        endpoint = _endpoint_name(request.url.path)
+        cfg = state.faults
+        # Per-request override for deterministic tests: X-Standin-Fault: 429 | 500 | timeout
+        forced = request.headers.get("x-standin-fault")
+
+        delay = cfg.latency_ms + (state.rng.uniform(0, cfg.jitter_ms) if cfg.jitter_ms else 0)
+        if forced == "timeout":
+            delay = max(delay, 60_000)
+        if delay:
+            await asyncio.sleep(delay / 1000)
+
+        remaining = state.quota_remaining()
+        if forced == "429" or remaining == 0 or (cfg.rate_limit_rate and state.rng.random() < cfg.rate_limit_rate):
+            state.count(endpoint, "429")
+            return _rate_limited(cfg.hourly_limit or 1000)
+        if forced == "500" or (cfg.error_rate and state.rng.random() < cfg.error_rate):
+            state.count(endpoint, "500")
+            return JSONResponse(status_code=500, content={"error": {"code": "INTERNAL_ERROR", "message": "Injected stand-in failure"}})
+
+        state.window_requests += 1
+        response = await call_next(request)
+        state.count(endpoint, str(response.status_code))
+        if remaining is not None:
+            response.headers["X-RateLimit-Limit"] = str(cfg.hourly_limit)
+            response.headers["X-RateLimit-Remaining"] = str(remaining - 1)
+        return response
+
+    @app.get("/mars-photos/api/v1/rovers/{rover}/photos")
+    async def rover_photos(rover: str, sol: Optional[int] = None, earth_date: Optional[str] = None,
+                           camera: Optional[str] = None, page: Optional[int] = None):
+        rover_data = mars_photos["rovers"].get(rover.lower())
+        if rover_data is None:
+            return JSONResponse(status_code=400, content={"errors": "Invalid Rover Name"})
+        if sol is None:
+            if earth_date is None:
+                return {"photos": []}
+            days = (date.fromisoformat(earth_date) - date.fromisoformat(rover_data["landing_earth_date"])).days
+            sol = max(int(days / 1.0275), 0)
+        if sol > rover_data["max_sol"]:
+            return {"photos": []}
+
+        photos = _build_photos(rover.lower(), rover_data, sol, camera)
+        if page is not None:
+            size = mars_photos["page_size"]
+            photos = photos[(page - 1) * size:page * size]
+        return {"photos": photos}
+
+    @app.get("/insight_weather/")
+    async def insight_weather(feedtype: str = "json", ver: str = "1.0"):
+        return weather
+
+    @app.get("/planetary/apod")
+    async def apod(date: Optional[str] = None):
+        target = date or datetime.now().strftime("%Y-%m-%d")
+        entry = dict(apods[_stable_int(target) % len(apods)])
+        entry["date"] = target
+        return entry
+
+    @app.get(f"{CONTROL_PREFIX}/stats")
+    async def stats():
+        """Per-endpoint response counters, e.g. to check how many calls a cache saved"""
+        return {"faults": state.faults.to_dict(), "requests": state.counters, "quota_remaining": state.quota_remaining()}
+
+    @app.post(f"{CONTROL_PREFIX}/faults")
+    async def set_faults(request: Request):
+        """Change latency/error injection at runtime; unknown keys are ignored"""
+        state.faults.update(await request.json())
+        return state.faults.to_dict()
+
+    @app.post(f"{CONTROL_PREFIX}/reset")
+    async def reset():
+        """Reset counters, quota window and RNG (re-seeded) between benchmark runs"""
+        state.reset()
+        return {"status": "reset"}
+
+    return app
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Test that a mission restored from a checkpoint keeps a consistent log history.
+
+The process that took the checkpoint keeps spilling logs to the same segment
+file afterwards; the restored mission must read exactly the checkpointed
+history and then its own appends, never the lines written after the
+checkpoint.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.models.log_buffer import LogBuffer
+from app.models.schemas import AgentType, MissionLog, MissionState
+from app.services.checkpoints import MissionCheckpointer
+from app.services.mission_state import mission_state_manager
+
+
+def _log(mission_id: str, message: str) -> MissionLog:
+    return MissionLog(mission_id=mission_id, agent_type=AgentType.ROVER, message=message)
+
+
+def test_restore_ignores_appends_after_checkpoint():
+    with tempfile.TemporaryDirectory() as tmp:
+        mission = MissionState(mission_id="restore-test", goal="Move to (3, 2)")
+        mission.logs = LogBuffer(item_type=MissionLog, capacity=8, spill_batch=4, spill_dir=os.path.join(tmp, "logs"))
+        for i in range(30):
+            mission.logs.append(_log(mission.mission_id, f"before {i}"))
+        assert mission.logs.resident_count < 30  # Part of the history is in the segment
+
+        checkpointer = MissionCheckpointer(checkpoint_dir=os.path.join(tmp, "checkpoints"), interval=0)
+        asyncio.run(checkpointer.save(mission.mission_id, "rover", {"mission_id": mission.mission_id}, mission, force=True))
+
+        # The original process keeps running (and spilling) after the checkpoint
+        for i in range(20):
+            mission.logs.append(_log(mission.mission_id, f"lost {i}"))
+
+        restored = checkpointer.load(mission.mission_id)["mission"]
+        mission_state_manager.restore_mission(restored)
+        for i in range(20):
+            restored.logs.append(_log(restored.mission_id, f"resumed {i}"))
+
+        messages = [log.message for log in restored.logs]
+        assert messages == [f"before {i}" for i in range(30)] + [f"resumed {i}" for i in range(20)]
+        assert [log.message for log in restored.logs[30:35]] == [f"resumed {i}" for i in range(5)]
+        assert [log.message for log in restored.logs.iter_page(0, 5)] == [f"before {i}" for i in range(5)]
+        # The original buffer's segment is untouched
+        assert [log.message for log in mission.logs][30:] == [f"lost {i}" for i in range(20)]
+
+
+if __name__ == "__main__":
+    test_restore_ignores_appends_after_checkpoint()
+    print("✅ Restored mission reads the checkpointed history and its own appends")
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Test the materialized mission reports: the same bytes and ETag while the
+mission is unchanged, a new ETag once it changes, and If-None-Match matching.
+"""
+import asyncio
+import json
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.models.schemas import AgentType, MissionLog
+from app.services.mission_state import mission_state_manager
+from app.services.report_cache import MissionReportCache, etag_matches
+
+
+def _mission():
+    mission_id = mission_state_manager.create_mission("Move to (2, 2)", obstacles=[])
+    # Media chosen up front, so the report needs no NASA requests
+    mission_state_manager.set_report_photos(mission_id, [{"id": 1, "img_src": "https://example.invalid/1.jpg"}])
+    mission_state_manager.set_apod_data(mission_id, {"title": "Test APOD", "url": "https://example.invalid/apod.jpg"})
+    for i in range(5):
+        mission_state_manager.add_log(mission_id, MissionLog(mission_id=mission_id, agent_type=AgentType.ROVER, message=str(i)))
+    return mission_id
+
+
+async def _report_etags():
+    cache = MissionReportCache(max_entries=8)
+    mission_id = _mission()
+    mission = mission_state_manager.get_mission(mission_id)
+
+    etag, body = await cache.get(mission)
+    again, same = await cache.get(mission)
+    assert (again, same) == (etag, body)
+    assert cache.builds == 1 and cache.hits == 1
+    report = json.loads(body)
+    assert report["logs_total"] == 5
+    assert [log["message"] for log in report["logs"]] == ["0", "1", "2", "3", "4"]
+
+    page_etag, page = await cache.get(mission, log_offset=3, log_limit=1)
+    assert page_etag != etag
+    assert [log["message"] for log in json.loads(page)["logs"]] == ["3"]
+
+    mission_state_manager.add_log(mission_id, MissionLog(mission_id=mission_id, agent_type=AgentType.ROVER, message="5"))
+    changed, body = await cache.get(mission)
+    assert changed != etag
+    assert json.loads(body)["logs_total"] == 6
+    return changed
+
+
+def test_report_etag_follows_mission():
+    asyncio.run(_report_etags())
+
+
+def test_etag_matches():
+    etag = '"abc"'
+    assert etag_matches('"abc"', etag)
+    assert etag_matches('W/"abc"', etag)
+    assert etag_matches('"xyz", W/"abc"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"xyz"', etag)
+    assert not etag_matches(None, etag)
+
+
+if __name__ == "__main__":
+    test_report_etag_follows_mission()
+    test_etag_matches()
+    print("✅ Reports keep their ETag until the mission changes")
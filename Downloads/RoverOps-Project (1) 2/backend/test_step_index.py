@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Test the per-mission StepIndex: rebuilding it from a stored step list and
+keeping it in sync as the state manager adds steps.
+"""
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.models.internal import StepIndex
+from app.models.schemas import MissionStep
+from app.services.mission_state import mission_state_manager
+
+
+def _step(number: int, action: str = "move", completed: bool = False) -> MissionStep:
+    return MissionStep(step_number=number, action=action, description=f"Step {number}", completed=completed)
+
+
+def test_rebuild_from_existing_steps():
+    # What an archived or shared mission looks like once reloaded: steps, no index
+    steps = [_step(1, completed=True), _step(2, "return"), _step(3), _step(4, "return")]
+    index = StepIndex(steps)
+    assert index.positions == {1: 0, 2: 1, 3: 2, 4: 3}
+    assert index.return_positions == [1, 3]
+    assert index.first_incomplete == 1
+
+
+def test_add_steps_after_clear():
+    mission_id = mission_state_manager.create_mission("Move to (2, 2)", obstacles=[])
+    mission_state_manager.add_step(mission_id, _step(1, "return"))
+    assert mission_state_manager.return_step_positions(mission_id) == [0]
+
+    # A new plan replaces the old one; the index is rebuilt on the next step
+    mission_state_manager.clear_steps(mission_id)
+    for number, action in [(1, "return"), (2, "move"), (3, "return")]:
+        mission_state_manager.add_step(mission_id, _step(number, action))
+    assert mission_state_manager.return_step_positions(mission_id) == [0, 2]
+    assert mission_state_manager.step_position(mission_id, 2) == 1
+
+    mission_state_manager.update_step(mission_id, 1)
+    assert mission_state_manager.get_step(mission_id, 1).completed
+    assert not mission_state_manager.get_step(mission_id, 3).completed
+    assert mission_state_manager.first_incomplete_step(mission_id) == 1
+
+
+if __name__ == "__main__":
+    test_rebuild_from_existing_steps()
+    test_add_steps_after_clear()
+    print("✅ StepIndex rebuilds positions and stays in sync as steps are added")
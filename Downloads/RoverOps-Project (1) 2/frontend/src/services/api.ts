@@ -19,7 +19,7 @@ export async function startMission(goal: string): Promise<StartMissionResponse>
 }
 
 export async function getMissionStatus(missionId: string): Promise<MissionState> {
-  const response = await fetch(`${API_URL}/api/mission/${missionId}`);
+  const response = await fetch(`${API_URL}/api/mission/${missionId}?view=full`);
   
   if (!response.ok) {
     throw new Error(`Failed to get mission status: ${response.statusText}`);